@@ -1,16 +1,31 @@
+from asgiref.sync import sync_to_async
 from fastapi import APIRouter, HTTPException, status, Depends
-from api.schemas import LoginRequest, TokenResponse, UserResponse, UserCreate
+from apps.core.hashing import PasswordHasherBusy
+from api.schemas import LoginRequest, TokenResponse, UserCreate
 from api.dependencies import get_user_service, UserService
+from api.db import DjangoRoute
+from api.rendering import render_response
 
-router = APIRouter(prefix="/auth", tags=["Authentication"])
+router = APIRouter(prefix="/auth", tags=["Authentication"], route_class=DjangoRoute)
+
+
+def _hasher_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many authentication requests, please retry shortly",
+        headers={"Retry-After": "1"}
+    )
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(credentials: LoginRequest, user_service: UserService = Depends(get_user_service)):
+async def login(credentials: LoginRequest, user_service: UserService = Depends(get_user_service)):
     """Authenticate user and return JWT tokens."""
     from rest_framework_simplejwt.tokens import RefreshToken
     
-    user = user_service.authenticate(credentials.username, credentials.password)
+    try:
+        user = await user_service.aauthenticate(credentials.username, credentials.password)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
     
     if not user:
         raise HTTPException(
@@ -21,28 +36,28 @@ def login(credentials: LoginRequest, user_service: UserService = Depends(get_use
     # Generate JWT tokens
     refresh = RefreshToken.for_user(user)
     
-    return TokenResponse(
-        access=str(refresh.access_token),
-        refresh=str(refresh),
-        user=UserResponse.model_validate(user)
-    )
+    return render_response(TokenResponse, {
+        'access': str(refresh.access_token),
+        'refresh': str(refresh),
+        'user': user
+    })
 
 
 @router.post("/register", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
-def register(user_data: UserCreate, user_service: UserService = Depends(get_user_service)):
+async def register(user_data: UserCreate, user_service: UserService = Depends(get_user_service)):
     """Register a new user and return JWT tokens."""
     from rest_framework_simplejwt.tokens import RefreshToken
     from api.schemas import UserCreate
     from api.dependencies import get_candidate_service, get_company_service
     
     # Check if user already exists
-    if user_service.get_by_username(user_data.username):
+    if await user_service.aget_by_username(user_data.username):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already exists"
         )
     
-    if user_service.get_by_email(user_data.email):
+    if await user_service.aget_by_email(user_data.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already exists"
@@ -56,27 +71,32 @@ def register(user_data: UserCreate, user_service: UserService = Depends(get_user
         )
     
     # Create new user
-    user = user_service.create_user(
-        username=user_data.username,
-        email=user_data.email,
-        password=user_data.password,
-        role=user_data.role,
-        phone=user_data.phone
-    )
+    try:
+        user = await user_service.acreate_user(
+            username=user_data.username,
+            email=user_data.email,
+            password=user_data.password,
+            role=user_data.role,
+            phone=user_data.phone
+        )
+    except PasswordHasherBusy:
+        raise _hasher_busy()
     
     # Create corresponding profile based on role
     if user_data.role == 'candidate':
         from apps.core.models import Candidate
-        Candidate.objects.create(
+        from apps.core.services import MatchService
+        candidate = await Candidate.objects.acreate(
             user=user,
             full_name=user_data.username,
             skills=[],
             experience_years=0,
             education='',
         )
+        await sync_to_async(MatchService.schedule_candidate_refresh)(candidate.id)
     elif user_data.role == 'company':
         from apps.core.models import Company
-        Company.objects.create(
+        await Company.objects.acreate(
             user=user,
             company_name=user_data.username,
             industry='',
@@ -87,11 +107,11 @@ def register(user_data: UserCreate, user_service: UserService = Depends(get_user
     # Generate JWT tokens
     refresh = RefreshToken.for_user(user)
     
-    return TokenResponse(
-        access=str(refresh.access_token),
-        refresh=str(refresh),
-        user=UserResponse.model_validate(user)
-    )
+    return render_response(TokenResponse, {
+        'access': str(refresh.access_token),
+        'refresh': str(refresh),
+        'user': user
+    }, status_code=status.HTTP_201_CREATED)
 
 
 @router.post("/refresh")
@@ -1,22 +1,25 @@
-from fastapi import APIRouter, HTTPException, status, Depends, BackgroundTasks
-from typing import List
+from fastapi import APIRouter, HTTPException, status, Depends
+from typing import List, Union
 from api.schemas import (
     InterviewCreate, InterviewResponse, InterviewDetailResponse,
     QuestionResponse, AnswerCreate, AnswerResponse,
-    QuestionsUploadRequest, QuestionWithAnswerResponse
+    AnswersBatchRequest, AnswersBatchResponse,
+    QuestionsUploadRequest, InterviewDetailWithAnswersResponse
 )
 from api.dependencies import (
     get_interview_service, get_current_user, get_current_candidate,
-    InterviewService
+    InterviewService, Pagination
 )
+from api.db import DjangoRoute
+from api.rendering import render_response
+from apps.core.task_queue import task_queue
 
-router = APIRouter(prefix="/interviews", tags=["Interviews"])
+router = APIRouter(prefix="/interviews", tags=["Interviews"], route_class=DjangoRoute)
 
 
 @router.post("", response_model=InterviewResponse, status_code=status.HTTP_201_CREATED)
 def create_interview(
     data: InterviewCreate,
-    background_tasks: BackgroundTasks,
     candidate = Depends(get_current_candidate),
     interview_service: InterviewService = Depends(get_interview_service)
 ):
@@ -35,42 +38,41 @@ def create_interview(
     
     # Schedule async question generation
     from apps.core.tasks import generate_interview_questions
-    background_tasks.add_task(generate_interview_questions.delay, interview.id)
+    task_queue.enqueue(
+        generate_interview_questions, interview.id,
+        key=f"generate_interview_questions:{interview.id}"
+    )
     
-    return InterviewResponse.model_validate(interview)
+    return render_response(InterviewResponse, interview, status_code=status.HTTP_201_CREATED)
 
 
 @router.get("", response_model=List[InterviewResponse])
-def list_interviews(
+async def list_interviews(
+    pagination: Pagination = Depends(),
     user = Depends(get_current_user),
     interview_service: InterviewService = Depends(get_interview_service)
 ):
-    """List interviews based on user role."""
+    """List interviews based on user role, newest first, one page at a time."""
     if user.role == 'candidate':
-        from api.dependencies import CandidateService
-        candidate = CandidateService.get_by_user_id(user.id)
-        interviews = interview_service.get_interviews_by_candidate(candidate.id)
+        interviews = interview_service.get_interviews_by_candidate(user.candidate_profile.id)
     elif user.role == 'company':
-        from api.dependencies import CompanyService, JobService
-        company = CompanyService.get_by_user_id(user.id)
-        jobs = JobService.get_jobs_by_company(company.id)
-        interviews = []
-        for job in jobs:
-            interviews.extend(interview_service.get_interviews_by_job(job.id))
+        interviews = interview_service.get_interviews_by_company(user.company_profile.id)
     else:
         interviews = interview_service.get_all()
     
-    return [InterviewResponse.model_validate(i) for i in interviews]
+    return await pagination.render(interview_service, interviews, InterviewResponse)
 
 
-@router.get("/{interview_id}", response_model=InterviewDetailResponse)
+@router.get("/{interview_id}", response_model=Union[InterviewDetailWithAnswersResponse, InterviewDetailResponse])
 def get_interview(
     interview_id: int,
     user = Depends(get_current_user),
     interview_service: InterviewService = Depends(get_interview_service)
 ):
     """Get interview details with questions and answers."""
-    interview = interview_service.get_by_id(interview_id)
+    interview = interview_service.get_interview_detail(
+        interview_id, with_answers=user.role == 'company'
+    )
     
     if not interview:
         raise HTTPException(
@@ -90,29 +92,11 @@ def get_interview(
             detail="You don't have permission to view this interview"
         )
     
-    questions = list(interview.questions.all())
-    
     # For companies, include answers with questions
     if user.role == 'company':
-        questions_with_answers = []
-        for q in questions:
-            q_dict = QuestionResponse.model_validate(q).model_dump()
-            try:
-                answer = q.answer
-                q_dict['answer'] = AnswerResponse.model_validate(answer).model_dump()
-            except:
-                q_dict['answer'] = None
-            questions_with_answers.append(q_dict)
-        
-        return InterviewDetailResponse(
-            **InterviewResponse.model_validate(interview).model_dump(),
-            questions=questions_with_answers
-        )
+        return render_response(InterviewDetailWithAnswersResponse, interview)
     
-    return InterviewDetailResponse(
-        **InterviewResponse.model_validate(interview).model_dump(),
-        questions=[QuestionResponse.model_validate(q) for q in questions]
-    )
+    return render_response(InterviewDetailResponse, interview)
 
 
 @router.post("/{interview_id}/start", response_model=InterviewResponse)
@@ -122,7 +106,7 @@ def start_interview(
     interview_service: InterviewService = Depends(get_interview_service)
 ):
     """Start an interview session (Candidate only)."""
-    interview = interview_service.get_by_id(interview_id)
+    interview = interview_service.get_for_write(interview_id)
     
     if not interview or interview.candidate.user_id != candidate.user_id:
         raise HTTPException(
@@ -138,7 +122,7 @@ def start_interview(
             detail="Failed to start interview"
         )
     
-    return InterviewResponse.model_validate(interview)
+    return render_response(InterviewResponse, interview)
 
 
 @router.post("/answers", response_model=AnswerResponse, status_code=status.HTTP_201_CREATED)
@@ -159,7 +143,51 @@ def submit_answer(
             detail="Failed to submit answer"
         )
     
-    return AnswerResponse.model_validate(answer)
+    return render_response(AnswerResponse, answer, status_code=status.HTTP_201_CREATED)
+
+
+@router.post("/{interview_id}/answers:batch", response_model=AnswersBatchResponse, status_code=status.HTTP_201_CREATED)
+def submit_answers(
+    interview_id: int,
+    data: AnswersBatchRequest,
+    candidate = Depends(get_current_candidate),
+    interview_service: InterviewService = Depends(get_interview_service)
+):
+    """
+    Submit all answers to an interview in one request (Candidate only).
+    Questions that were already answered keep their answer, so the batch
+    can be retried safely; the interview completes once every question is answered.
+    """
+    if not data.answers:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Answers array cannot be empty"
+        )
+    
+    try:
+        result = interview_service.submit_answers(
+            interview_id=interview_id,
+            candidate_id=candidate.id,
+            answers_data=[answer.model_dump() for answer in data.answers]
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    
+    if not result:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have permission to answer this interview"
+        )
+    
+    interview, answers = result
+    return render_response(
+        AnswersBatchResponse,
+        {'interview': interview, 'answers': answers},
+        status_code=status.HTTP_201_CREATED
+    )
 
 
 @router.post("/{interview_id}/questions", response_model=List[QuestionResponse], status_code=status.HTTP_201_CREATED)
@@ -170,7 +198,7 @@ def upload_questions(
     interview_service: InterviewService = Depends(get_interview_service)
 ):
     """Upload interview questions from mobile app (Candidate only)."""
-    interview = interview_service.get_by_id(interview_id)
+    interview = interview_service.get_for_write(interview_id)
     
     if not interview:
         raise HTTPException(
@@ -203,7 +231,7 @@ def upload_questions(
                 detail="Failed to upload questions"
             )
         
-        return [QuestionResponse.model_validate(q) for q in questions]
+        return render_response(QuestionResponse, questions, many=True, status_code=status.HTTP_201_CREATED)
     
     except ValueError as e:
         raise HTTPException(
@@ -215,12 +243,11 @@ def upload_questions(
 @router.post("/{interview_id}/complete", response_model=InterviewResponse)
 def complete_interview(
     interview_id: int,
-    background_tasks: BackgroundTasks,
     candidate = Depends(get_current_candidate),
     interview_service: InterviewService = Depends(get_interview_service)
 ):
     """Complete an interview and calculate final score (Candidate only)."""
-    interview = interview_service.get_by_id(interview_id)
+    interview = interview_service.get_for_write(interview_id)
     
     if not interview or interview.candidate.user_id != candidate.user_id:
         raise HTTPException(
@@ -228,8 +255,8 @@ def complete_interview(
             detail="You don't have permission to complete this interview"
         )
     
-    # Schedule async score calculation
+    # Schedule async score calculation; repeated clicks while it is pending are no-ops
     from apps.core.tasks import calculate_final_score
-    background_tasks.add_task(calculate_final_score.delay, interview_id)
+    task_queue.enqueue(calculate_final_score, interview_id, key=f"calculate_final_score:{interview_id}")
     
-    return InterviewResponse.model_validate(interview)
+    return render_response(InterviewResponse, interview)
@@ -1,12 +1,15 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request
 from typing import List
-from api.schemas import JobCreate, JobUpdate, JobResponse
+from api.schemas import JobCreate, JobUpdate, JobResponse, CandidateMatchResponse
 from api.dependencies import (
-    get_job_service, get_current_company, get_current_user,
-    JobService
+    get_job_service, get_match_service, get_current_company, get_current_user,
+    JobService, MatchService, Pagination, NEXT_CURSOR_HEADER
 )
+from api.db import DjangoRoute
+from api.rendering import render, render_response
+from api.response_cache import job_responses
 
-router = APIRouter(prefix="/jobs", tags=["Jobs"])
+router = APIRouter(prefix="/jobs", tags=["Jobs"], route_class=DjangoRoute)
 
 
 @router.post("", response_model=JobResponse, status_code=status.HTTP_201_CREATED)
@@ -32,48 +35,135 @@ def create_job(
             detail="Failed to create job posting"
         )
     
-    return JobResponse.model_validate(job)
+    return render_response(JobResponse, job, status_code=status.HTTP_201_CREATED)
 
 
 @router.get("", response_model=List[JobResponse])
-def list_jobs(
+async def list_jobs(
+    request: Request,
     status_filter: str = None,
+    pagination: Pagination = Depends(),
     job_service: JobService = Depends(get_job_service)
 ):
-    """List all job postings with optional status filter."""
-    if status_filter:
-        jobs = job_service.get_all(filters={'status': status_filter})
-    else:
-        jobs = job_service.get_active_jobs()
+    """List job postings with optional status filter, newest first, one page at a time."""
+    key, entry = await job_responses.lookup(
+        'list', status_filter or 'active', pagination.limit, pagination.cursor or ''
+    )
+    
+    if entry is None:
+        if status_filter:
+            queryset = job_service.get_all(filters={'status': status_filter})
+        else:
+            queryset = job_service.get_active_jobs()
+        
+        jobs, next_cursor = await pagination.fetch(job_service, queryset)
+        entry = await job_responses.store(
+            key,
+            render(JobResponse, jobs, many=True),
+            headers={NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+        )
     
-    return [JobResponse.model_validate(job) for job in jobs]
+    return job_responses.respond(request, entry)
 
 
 @router.get("/my-jobs", response_model=List[JobResponse])
-def list_my_jobs(
+async def list_my_jobs(
+    pagination: Pagination = Depends(),
     company = Depends(get_current_company),
     job_service: JobService = Depends(get_job_service)
 ):
-    """List all job postings for the current company."""
-    jobs = job_service.get_jobs_by_company(company.id)
-    return [JobResponse.model_validate(job) for job in jobs]
+    """List job postings for the current company, newest first, one page at a time."""
+    queryset = job_service.get_jobs_by_company(company.id)
+    return await pagination.render(job_service, queryset, JobResponse)
+
+
+@router.get("/search", response_model=List[JobResponse])
+def search_jobs(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    job_service: JobService = Depends(get_job_service)
+):
+    """Ranked full-text search over active job postings."""
+    jobs = job_service.search(q, limit=limit)
+    return render_response(JobResponse, jobs, many=True)
 
 
 @router.get("/{job_id}", response_model=JobResponse)
-def get_job(
+async def get_job(
+    request: Request,
     job_id: int,
     job_service: JobService = Depends(get_job_service)
 ):
     """Get a specific job posting by ID."""
+    key, entry = await job_responses.lookup('detail', job_id)
+    
+    if entry is None:
+        job = await job_service.aget_by_id(job_id)
+        
+        if not job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Job posting not found"
+            )
+        
+        entry = await job_responses.store(key, render(JobResponse, job))
+    
+    return job_responses.respond(request, entry)
+
+
+@router.get("/{job_id}/matches", response_model=List[CandidateMatchResponse])
+def get_job_matches(
+    job_id: int,
+    limit: int = Query(20, ge=1, le=200),
+    company = Depends(get_current_company),
+    job_service: JobService = Depends(get_job_service),
+    match_service: MatchService = Depends(get_match_service)
+):
+    """
+    Rank candidates by skill match against a job posting (Company owner only).
+    Active jobs are served from the precomputed match table; drafts and
+    closed jobs are ranked on the fly.
+    """
     job = job_service.get_by_id(job_id)
     
-    if not job:
+    if not job or job.company_id != company.id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Job posting not found"
         )
     
-    return JobResponse.model_validate(job)
+    if job.status == 'active':
+        return render_response(CandidateMatchResponse, [
+            {
+                'candidate_id': match.candidate_id,
+                'full_name': match.candidate.full_name,
+                'experience_years': match.candidate.experience_years,
+                'skill_match_score': match.score,
+                'matched_skills': match.matched_skills,
+                'experience_delta': match.experience_delta
+            }
+            for match in match_service.stored_candidates_for_job(job.id, limit=limit)
+        ], many=True)
+    
+    matches = match_service.top_candidates_for_job(job, limit=limit)
+    
+    from api.dependencies import CandidateService
+    candidates = CandidateService.get_all(
+        filters={'id__in': [candidate_id for candidate_id, _ in matches]}
+    ).only('id', 'full_name', 'experience_years').in_bulk()
+    
+    return render_response(CandidateMatchResponse, [
+        {
+            'candidate_id': candidate_id,
+            'full_name': candidates[candidate_id].full_name,
+            'experience_years': candidates[candidate_id].experience_years,
+            'skill_match_score': score,
+            'matched_skills': [],
+            'experience_delta': candidates[candidate_id].experience_years - job.experience_required
+        }
+        for candidate_id, score in matches
+        if candidate_id in candidates
+    ], many=True)
 
 
 @router.put("/{job_id}", response_model=JobResponse)
@@ -99,7 +189,7 @@ def update_job(
             detail="Job posting not found"
         )
     
-    return JobResponse.model_validate(job)
+    return render_response(JobResponse, job)
 
 
 @router.delete("/{job_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -1,16 +1,24 @@
-from fastapi import APIRouter, HTTPException, status, Depends
-from typing import List
+import threading
+from fastapi import APIRouter, HTTPException, status, Depends, File, Query, UploadFile
+from typing import List, Optional
+from django.conf import settings
 from api.schemas import (
     UserCreate, UserResponse, 
     CompanyCreate, CompanyResponse,
-    CandidateCreate, CandidateUpdate, CandidateResponse
+    CandidateCreate, CandidateUpdate, CandidateResponse,
+    CandidateImportResponse
 )
 from api.dependencies import (
     get_user_service, get_company_service, get_candidate_service,
     get_current_user, UserService, CompanyService, CandidateService
 )
+from api.db import DjangoRoute
+from api.rendering import render_response
 
-router = APIRouter(prefix="/users", tags=["Users"])
+router = APIRouter(prefix="/users", tags=["Users"], route_class=DjangoRoute)
+
+# Imports hash every password on the shared hasher pool; bound how many run at once
+_import_slots = threading.BoundedSemaphore(settings.CANDIDATE_IMPORT_MAX_CONCURRENT)
 
 
 @router.post("/register/company", response_model=CompanyResponse, status_code=status.HTTP_201_CREATED)
@@ -30,7 +38,7 @@ def register_company(
             description=data.description,
             website=str(data.website) if data.website else None
         )
-        return CompanyResponse.model_validate(company)
+        return render_response(CompanyResponse, company, status_code=status.HTTP_201_CREATED)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -55,7 +63,7 @@ def register_candidate(
             education=data.education,
             linkedin_url=str(data.linkedin_url) if data.linkedin_url else None
         )
-        return CandidateResponse.model_validate(candidate)
+        return render_response(CandidateResponse, candidate, status_code=status.HTTP_201_CREATED)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -63,10 +71,52 @@ def register_candidate(
         )
 
 
+@router.post("/import/candidates", response_model=CandidateImportResponse)
+def import_candidates(
+    file: UploadFile = File(...),
+    file_format: Optional[str] = Query(None, alias="format", pattern="^(csv|ndjson)$"),
+    user = Depends(get_current_user),
+    candidate_service: CandidateService = Depends(get_candidate_service)
+):
+    """
+    Bulk-create candidates from an uploaded CSV or NDJSON file (staff only).
+    Invalid rows are reported in `errors` and do not stop the import. Beyond
+    CANDIDATE_IMPORT_MAX_CONCURRENT imports in progress, the request gets a 429.
+    """
+    if not user.is_staff:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only staff users can import candidates"
+        )
+    
+    if not _import_slots.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Another candidate import is in progress, please retry later",
+            headers={"Retry-After": "30"}
+        )
+    
+    try:
+        result = candidate_service.bulk_import(
+            file.file,
+            fmt=file_format,
+            filename=file.filename or ''
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to import candidates: {str(e)}"
+        )
+    finally:
+        _import_slots.release()
+    
+    return render_response(CandidateImportResponse, result)
+
+
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(user = Depends(get_current_user)):
+async def get_current_user_info(user = Depends(get_current_user)):
     """Get current authenticated user information."""
-    return UserResponse.model_validate(user)
+    return render_response(UserResponse, user)
 
 
 @router.put("/me", response_model=UserResponse)
@@ -97,7 +147,7 @@ def update_current_user(
                 detail="User not found"
             )
         
-        return UserResponse.model_validate(updated_user)
+        return render_response(UserResponse, updated_user)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -121,18 +171,44 @@ def delete_current_user(
 
 
 @router.get("/me/profile", response_model=CandidateResponse)
-def get_candidate_profile(
+async def get_candidate_profile(user = Depends(get_current_user)):
+    """Get candidate profile for current user."""
+    if user.role != 'candidate':
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only candidates can access this endpoint"
+        )
+    
+    # The principal only carries the profile's ID
+    candidate = await CandidateService.aget_by_user_id(user.id)
+    
+    if not candidate:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Candidate profile not found"
+        )
+    
+    return render_response(CandidateResponse, candidate)
+
+
+@router.post("/me/cv", response_model=CandidateResponse, status_code=status.HTTP_202_ACCEPTED)
+def upload_cv(
+    file: UploadFile = File(...),
     user = Depends(get_current_user),
     candidate_service: CandidateService = Depends(get_candidate_service)
 ):
-    """Get candidate profile for current user."""
+    """
+    Upload the current candidate's CV (PDF, DOCX or plain text). The file is
+    stored right away and parsed in the background; the parsed skills,
+    experience and education appear on the profile once that is done.
+    """
     if user.role != 'candidate':
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only candidates can access this endpoint"
         )
     
-    candidate = candidate_service.get_by_user_id(user.id)
+    candidate = getattr(user, 'candidate_profile', None)
     
     if not candidate:
         raise HTTPException(
@@ -140,7 +216,8 @@ def get_candidate_profile(
             detail="Candidate profile not found"
         )
     
-    return CandidateResponse.model_validate(candidate)
+    updated_candidate = candidate_service.update_cv(candidate.id, file.file, filename=file.filename or '')
+    return render_response(CandidateResponse, updated_candidate, status_code=status.HTTP_202_ACCEPTED)
 
 
 @router.put("/me/profile", response_model=CandidateResponse)
@@ -156,7 +233,7 @@ def update_candidate_profile(
             detail="Only candidates can access this endpoint"
         )
     
-    candidate = candidate_service.get_by_user_id(user.id)
+    candidate = getattr(user, 'candidate_profile', None)
     
     if not candidate:
         raise HTTPException(
@@ -186,7 +263,7 @@ def update_candidate_profile(
                 detail="Failed to update candidate profile"
             )
         
-        return CandidateResponse.model_validate(updated_candidate)
+        return render_response(CandidateResponse, updated_candidate)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
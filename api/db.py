@@ -0,0 +1,159 @@
+"""
+Database connection management for the FastAPI process.
+
+Django keeps one connection per thread, so the number of database
+connections the API opens is the number of threads that touch the ORM:
+
+- Async ORM calls (aget, acreate, ...) run on a small, fixed set of
+  long-lived "database threads" (DatabaseThreadPool). Each request is bound
+  to the least busy one, which keeps its connection open between requests
+  (CONN_MAX_AGE) instead of opening one per request on a throwaway thread.
+- Sync endpoints run on AnyIO's worker threads; DjangoRoute wraps them so
+  each worker thread reuses, health-checks and recycles its own connection
+  the way Django's request_started/request_finished signals would.
+
+Old or broken connections are replaced according to the CONN_MAX_AGE and
+CONN_HEALTH_CHECKS database settings.
+"""
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from asgiref.sync import SyncToAsync, ThreadSensitiveContext
+from django.conf import settings
+from django.db import close_old_connections, connections
+from fastapi.routing import APIRoute
+
+from api.profiling import profiled_call, profiled_endpoint
+
+
+class DatabaseThreadPool:
+    """
+    Fixed set of single-thread executors for the async ORM, one Django
+    connection each. Requests share them, so at most `size` connections are
+    opened however many requests are in flight. The size defaults to the
+    DB_THREAD_POOL_SIZE setting.
+    """
+
+    def __init__(self, size: Optional[int] = None):
+        self._size = size
+        self._executors: List[ThreadPoolExecutor] = []
+        self._in_flight: List[int] = []
+        self._lock = threading.Lock()
+        self._served = 0
+
+    @property
+    def size(self) -> int:
+        return self._size or settings.DB_THREAD_POOL_SIZE
+
+    def _start(self) -> None:
+        if not self._executors:
+            self._executors = [
+                ThreadPoolExecutor(max_workers=1, thread_name_prefix=f'db-{index}')
+                for index in range(self.size)
+            ]
+            self._in_flight = [0] * self.size
+
+    def acquire(self) -> int:
+        """Index of the least busy database thread, now counted as in use."""
+        with self._lock:
+            self._start()
+            index = min(range(len(self._in_flight)), key=self._in_flight.__getitem__)
+            self._in_flight[index] += 1
+            self._served += 1
+            return index
+
+    def release(self, index: int) -> None:
+        with self._lock:
+            self._in_flight[index] -= 1
+
+    def executor(self, index: int) -> ThreadPoolExecutor:
+        return self._executors[index]
+
+    def context(self) -> 'DatabaseThreadContext':
+        """Context binding the current request to a database thread."""
+        return DatabaseThreadContext(self)
+
+    def stats(self) -> dict:
+        """Number of database threads, requests bound to each, and requests served."""
+        with self._lock:
+            return {
+                'size': self.size,
+                'in_flight': list(self._in_flight),
+                'served': self._served,
+            }
+
+    def shutdown(self) -> None:
+        """Close every database thread's connection and stop the threads."""
+        with self._lock:
+            executors, self._executors, self._in_flight = self._executors, [], []
+        for executor in executors:
+            executor.submit(connections.close_all).result()
+            executor.shutdown(wait=True)
+
+
+class DatabaseThreadContext(ThreadSensitiveContext):
+    """
+    ThreadSensitiveContext that runs thread-sensitive sync_to_async calls
+    (including the async ORM) on a pooled database thread rather than on a
+    new thread created for the request and discarded afterwards.
+    """
+
+    def __init__(self, pool: DatabaseThreadPool):
+        super().__init__()
+        self.pool = pool
+        self.index: Optional[int] = None
+
+    async def __aenter__(self):
+        await super().__aenter__()
+        if self.token:
+            self.index = self.pool.acquire()
+            SyncToAsync.context_to_thread_executor[self] = self.pool.executor(self.index)
+        return self
+
+    async def __aexit__(self, exc, value, tb):
+        if not self.token:
+            return
+        # Unbind without shutting the executor down: the thread is reused
+        SyncToAsync.context_to_thread_executor.pop(self, None)
+        SyncToAsync.thread_sensitive_context.reset(self.token)
+        self.pool.release(self.index)
+
+
+db_threads = DatabaseThreadPool()
+
+
+def _with_connection_cleanup(endpoint):
+    @functools.wraps(endpoint)
+    def run(*args, **kwargs):
+        close_old_connections()
+        try:
+            return profiled_call(endpoint, *args, **kwargs)
+        finally:
+            close_old_connections()
+    run.closes_connections = True
+    return run
+
+
+class DjangoRoute(APIRoute):
+    """
+    Route class for endpoints using the Django ORM. Sync endpoints run on
+    AnyIO's worker threads, outside DjangoContextMiddleware's database
+    thread; each call is bracketed with close_old_connections so the
+    worker thread's connection is health-checked before use and closed once
+    older than CONN_MAX_AGE or after an error.
+
+    Endpoints also run under cProfile when the request asked for a trace
+    (see api.profiling).
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        # include_router() re-creates routes from already wrapped endpoints
+        if asyncio.iscoroutinefunction(endpoint):
+            if not getattr(endpoint, 'profiled', False):
+                endpoint = profiled_endpoint(endpoint)
+        elif not getattr(endpoint, 'closes_connections', False):
+            endpoint = _with_connection_cleanup(endpoint)
+        super().__init__(path, endpoint, **kwargs)
@@ -1,41 +1,46 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import Optional
+from typing import Optional, Tuple
 
 from apps.core.services import (
     UserService, CompanyService, CandidateService, 
-    JobService, InterviewService
+    JobService, InterviewService, MatchService
 )
+from api.rendering import render_response
+from api.token_verifier import token_verifier, TokenVerificationError
 
 # JWT Security
 security = HTTPBearer()
 
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Dependency to get current authenticated user from JWT token."""
-    from rest_framework_simplejwt.tokens import AccessToken
-    from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
-    
     try:
-        token = AccessToken(credentials.credentials)
-        user_id = token['user_id']
-        user = UserService.get_by_id(user_id)
-        
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found"
-            )
-        
-        return user
-    except (InvalidToken, TokenError) as e:
+        user_id = token_verifier.get_user_id(credentials.credentials)
+    except TokenVerificationError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token"
         )
+    
+    user = await UserService.aget_principal(user_id)
+    
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+    
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User is inactive"
+        )
+    
+    return user
 
 
-def get_current_company(user = Depends(get_current_user)):
+async def get_current_company(user = Depends(get_current_user)):
     """Dependency to ensure current user is a company."""
     if user.role != 'company':
         raise HTTPException(
@@ -43,7 +48,8 @@ def get_current_company(user = Depends(get_current_user)):
             detail="Only companies can access this resource"
         )
     
-    company = CompanyService.get_by_user_id(user.id)
+    # Attached to the user by UserService.get_principal, with only id and user_id loaded
+    company = getattr(user, 'company_profile', None)
     if not company:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -53,7 +59,7 @@ def get_current_company(user = Depends(get_current_user)):
     return company
 
 
-def get_current_candidate(user = Depends(get_current_user)):
+async def get_current_candidate(user = Depends(get_current_user)):
     """Dependency to ensure current user is a candidate."""
     if user.role != 'candidate':
         raise HTTPException(
@@ -61,7 +67,8 @@ def get_current_candidate(user = Depends(get_current_user)):
             detail="Only candidates can access this resource"
         )
     
-    candidate = CandidateService.get_by_user_id(user.id)
+    # Attached to the user by UserService.get_principal, with only id and user_id loaded
+    candidate = getattr(user, 'candidate_profile', None)
     if not candidate:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -71,6 +78,36 @@ def get_current_candidate(user = Depends(get_current_user)):
     return candidate
 
 
+# Pagination
+NEXT_CURSOR_HEADER = 'X-Next-Cursor'
+
+
+class Pagination:
+    """Keyset pagination parameters shared by list endpoints."""
+    
+    def __init__(self, cursor: Optional[str] = None, limit: int = Query(50, ge=1, le=200)):
+        self.cursor = cursor
+        self.limit = limit
+    
+    async def fetch(self, service, queryset) -> Tuple[list, Optional[str]]:
+        """Fetch one page of `queryset` and the cursor of the next page."""
+        try:
+            return await service.apaginate(queryset, self.cursor, self.limit)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+    
+    async def render(self, service, queryset, schema) -> Response:
+        """Render one page of `queryset` with `schema`, exposing the next cursor as a response header."""
+        objs, next_cursor = await self.fetch(service, queryset)
+        return render_response(
+            schema, objs, many=True,
+            headers={NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+        )
+
+
 # Service dependencies
 def get_user_service() -> UserService:
     return UserService
@@ -90,3 +127,7 @@ def get_job_service() -> JobService:
 
 def get_interview_service() -> InterviewService:
     return InterviewService
+
+
+def get_match_service() -> MatchService:
+    return MatchService
@@ -1,7 +1,9 @@
 import os
 import sys
+import anyio
 import django
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 # Bootstrap Django
@@ -20,11 +22,20 @@ if os.getenv('WEBSITE_INSTANCE_ID'):  # Azure App Service environment variable
         print(f"Migration error: {e}")
 
 from api.agent.api import api_router
+from api.db import db_threads
+from api.middleware import DjangoContextMiddleware, MetricsMiddleware
+from api.profiling import QueryProfilerMiddleware
+from api.rendering import ORJSONResponse
+from apps.core.hashing import password_hasher
+from apps.core.metrics import REGISTRY, render, stats_collector, worker_exporter
+from apps.core.task_queue import task_queue
+from django.conf import settings
 
 app = FastAPI(
     title="Intelligent Recruiting Agent API",
     description="Backend API for intelligent interviewing agent for SMEs",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # CORS configuration
@@ -34,8 +45,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
+# Per-request Django context for the async ORM
+app.add_middleware(DjangoContextMiddleware)
+
+# Opt-in SQL profiling, and logging of requests over their query/time budgets
+app.add_middleware(QueryProfilerMiddleware)
+
+# Request metrics; outermost, so latency covers the other middleware
+app.add_middleware(MetricsMiddleware)
+
 # Include API routes
 app.include_router(api_router, prefix="/api/agent")
 
@@ -50,7 +71,49 @@ def root():
     }
 
 
+@app.on_event("startup")
+async def limit_sync_threads():
+    """Bound the worker threads (and so DB connections) used by sync endpoints."""
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.API_SYNC_THREADS
+
+
+@app.on_event("shutdown")
+def stop_password_hasher():
+    """Stop the password hashing worker processes."""
+    password_hasher.shutdown()
+
+
+@app.on_event("shutdown")
+def stop_task_queue():
+    """Let tasks running in this process finish."""
+    task_queue.shutdown()
+
+
+@app.on_event("shutdown")
+def close_db_threads():
+    """Close the database threads' connections."""
+    db_threads.shutdown()
+
+
+# /metrics also reports the pools behind /health, and the Celery workers
+REGISTRY.add_collector(stats_collector('password_hasher', 'Password hashing pool', password_hasher.stats))
+REGISTRY.add_collector(stats_collector('db_threads', 'Database threads', db_threads.stats))
+REGISTRY.add_collector(stats_collector('task_queue', 'Task queue', task_queue.stats))
+REGISTRY.add_collector(worker_exporter.collect)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus metrics of this process and of the Celery workers."""
+    return PlainTextResponse(render(REGISTRY.collect()), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/health")
 def health_check():
-    """Health check endpoint."""
-    return {"status": "healthy"}
+    """Health check endpoint, with password hasher and database thread statistics."""
+    return {
+        "status": "healthy",
+        "password_hasher": password_hasher.stats(),
+        "db_threads": db_threads.stats(),
+        "task_queue": task_queue.stats(),
+    }
@@ -0,0 +1,91 @@
+import time
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+from api.db import db_threads
+from apps.core.db_router import routing_scope
+from apps.core.metrics import (
+    http_request_db_duration,
+    http_request_db_queries,
+    http_request_duration,
+    http_requests,
+    http_requests_in_flight,
+    track_db_usage,
+)
+
+
+class DjangoContextMiddleware:
+    """
+    ASGI middleware that gives each request a Django execution context.
+
+    Django's async ORM methods (aget, acreate, async iteration, ...) run the
+    query through sync_to_async(thread_sensitive=True). Outside of Django's own
+    ASGI handler there is no per-request context, so every async query in the
+    process would be funnelled through one shared thread. Each request is
+    bound to one of a fixed set of database threads instead (see api.db),
+    whose connections stay open across requests. Once the response has been
+    sent, close_old_connections drops the thread's connection if it is older
+    than CONN_MAX_AGE or unusable, and re-arms the CONN_HEALTH_CHECKS check
+    for the next request, as Django's request_finished signal would.
+
+    Requests also get their own read-replica routing state (see
+    apps.core.db_router), so that once a request writes, its later reads
+    go to the primary.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        async with db_threads.context():
+            try:
+                with routing_scope():
+                    await self.app(scope, receive, send)
+            finally:
+                await sync_to_async(close_old_connections)()
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request metrics (see apps.core.metrics):
+    latency, status codes and requests in flight, and the database queries
+    and time each request caused. Routes are labelled with their path
+    template, e.g. /api/agent/jobs/{job_id}; requests that match no route
+    share the "unmatched" label, so the number of series stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+            await send(message)
+
+        http_requests_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            with track_db_usage() as usage:
+                await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_flight.dec()
+            # Set by the router once a route matched
+            route = scope['route'].path if 'route' in scope else 'unmatched'
+            http_requests.inc(scope['method'], route, str(status_code))
+            http_request_duration.observe(elapsed, scope['method'], route)
+            http_request_db_queries.observe(usage.queries, route)
+            http_request_db_duration.observe(usage.seconds, route)
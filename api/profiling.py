@@ -0,0 +1,253 @@
+"""
+Per-request query profiling.
+
+Django's debug toolbar and connection.queries only see Django's own
+request cycle. Under FastAPI the ORM runs on AnyIO worker threads and on
+the database threads (api.db), so QueryProfilerMiddleware captures a
+request's SQL through the context-bound query tracking of
+apps.core.metrics instead, wherever the queries run.
+
+Captured statements are grouped by fingerprint: the SQL with literals,
+placeholders and IN-list or VALUES lengths normalized away. A fingerprint
+seen QUERY_PROFILE_DUPLICATES times or more in one request is flagged as a
+likely N+1, together with the code that issued it.
+
+Profiling is off unless QUERY_PROFILER_MODE says otherwise. In 'header'
+mode, a request from an authenticated staff user opts in with the
+X-Profile header; in 'always' mode every request is profiled.
+`X-Profile: cprofile` (or QUERY_PROFILE_CPROFILE in 'always' mode) also
+dumps a cProfile trace of the endpoint into QUERY_PROFILE_DIR, readable
+with pstats or snakeviz.
+
+Independently of profiling, every request is checked against the
+QUERY_BUDGET_COUNT, QUERY_BUDGET_MS and REQUEST_BUDGET_MS budgets, and
+logged as a warning when over budget. Profiles are logged at INFO on the
+api.profiling logger (see LOGGING in the settings).
+"""
+import cProfile
+import functools
+import logging
+import os
+import pstats
+import re
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+from apps.core.metrics import track_db_usage
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b'x-profile'
+AUTHORIZATION_HEADER = b'authorization'
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_SPACE = re.compile(r'\s+')
+_IN_LIST = re.compile(r'\bIN \((?:\?, )*\?\)', re.IGNORECASE)
+_VALUES = re.compile(r'\bVALUES (\([^()]*\))(?:, \([^()]*\))+', re.IGNORECASE)
+# Not across parentheses: the FROM of a subquery in the select list is not the outer one
+_SELECT_LIST = re.compile(r'^SELECT (DISTINCT )?[^()]+? FROM ', re.IGNORECASE)
+_UNSAFE_PATH = re.compile(r'[^A-Za-z0-9_.-]+')
+
+
+def fingerprint(sql: str) -> str:
+    """
+    SQL with literals and parameter lists normalized, and the outer select
+    list elided unless it has parentheses (functions, subqueries), for
+    grouping repeated queries.
+    """
+    sql = _NUMBER.sub('?', _STRING.sub('?', sql)).replace('%s', '?')
+    sql = _SPACE.sub(' ', sql).strip()
+    sql = _SELECT_LIST.sub(r'SELECT \1... FROM ', sql)
+    return _VALUES.sub(r'VALUES \1, ...', _IN_LIST.sub('IN (...)', sql))
+
+
+def group_statements(statements: List[Tuple[str, float, str]]) -> List[dict]:
+    """
+    Statements grouped by fingerprint, most repeated first: count, total
+    time (ms), the callers that issued them, and whether they look like N+1.
+    """
+    groups: Dict[str, dict] = {}
+    for sql, seconds, caller in statements:
+        group = groups.setdefault(fingerprint(sql), {'count': 0, 'ms': 0.0, 'callers': {}})
+        group['count'] += 1
+        group['ms'] += seconds * 1000
+        group['callers'][caller] = group['callers'].get(caller, 0) + 1
+    return [
+        {
+            'fingerprint': sql,
+            'count': group['count'],
+            'ms': round(group['ms'], 3),
+            'callers': sorted(group['callers'], key=group['callers'].get, reverse=True),
+            'n_plus_one': group['count'] >= settings.QUERY_PROFILE_DUPLICATES,
+        }
+        for sql, group in sorted(groups.items(), key=lambda item: (-item[1]['count'], -item[1]['ms']))
+    ]
+
+
+class Trace:
+    """cProfile trace of one request's endpoint (see profiled_call)."""
+
+    # cProfile cannot run in two threads at once from Python 3.12 on, so
+    # concurrent profiled requests take turns; the others go untraced
+    _active = threading.Lock()
+
+    def __init__(self):
+        self.profile: Optional[cProfile.Profile] = None
+
+    def run(self, func, *args, **kwargs):
+        if not self._active.acquire(blocking=False):
+            return func(*args, **kwargs)
+        self.profile = cProfile.Profile()
+        try:
+            return self.profile.runcall(func, *args, **kwargs)
+        finally:
+            self._active.release()
+
+    async def run_async(self, func, *args, **kwargs):
+        if not self._active.acquire(blocking=False):
+            return await func(*args, **kwargs)
+        self.profile = cProfile.Profile()
+        # Covers the event loop thread, including other requests it serves meanwhile
+        self.profile.enable()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            self.profile.disable()
+            self._active.release()
+
+    def dump(self, method: str, path: str) -> Optional[str]:
+        """Write the trace to QUERY_PROFILE_DIR; returns the file, or None if untraced."""
+        if self.profile is None:
+            return None
+        os.makedirs(settings.QUERY_PROFILE_DIR, exist_ok=True)
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{method}-{_UNSAFE_PATH.sub('_', path).strip('_')}.prof"
+        filename = os.path.join(settings.QUERY_PROFILE_DIR, name)
+        pstats.Stats(self.profile).dump_stats(filename)
+        return filename
+
+
+_trace: ContextVar[Optional[Trace]] = ContextVar('profile_trace', default=None)
+
+
+def profiled_call(func, *args, **kwargs):
+    """Call a sync endpoint, under cProfile if the request asked for a trace."""
+    trace = _trace.get()
+    if trace is None:
+        return func(*args, **kwargs)
+    return trace.run(func, *args, **kwargs)
+
+
+def profiled_endpoint(endpoint):
+    """Wrap an async endpoint so that it runs under cProfile if the request asked for a trace."""
+    @functools.wraps(endpoint)
+    async def run(*args, **kwargs):
+        trace = _trace.get()
+        if trace is None:
+            return await endpoint(*args, **kwargs)
+        return await trace.run_async(endpoint, *args, **kwargs)
+    run.profiled = True
+    return run
+
+
+class QueryProfilerMiddleware:
+    """
+    ASGI middleware profiling the SQL of opted-in requests, and logging
+    requests over their query or time budgets (see module docstring).
+    Profiled responses carry a Server-Timing header with the query count
+    and database time.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    @classmethod
+    async def profile_mode(cls, scope) -> Optional[str]:
+        """None, 'queries', or 'cprofile' for queries plus a cProfile trace."""
+        if settings.QUERY_PROFILER_MODE == 'always':
+            return 'cprofile' if settings.QUERY_PROFILE_CPROFILE else 'queries'
+        if settings.QUERY_PROFILER_MODE != 'header':
+            return None
+        headers = dict(scope['headers'])
+        value = headers.get(PROFILE_HEADER, b'').strip().lower()
+        if not value or not await cls._is_staff(headers.get(AUTHORIZATION_HEADER, b'')):
+            return None
+        return 'cprofile' if value == b'cprofile' else 'queries'
+
+    @staticmethod
+    async def _is_staff(authorization: bytes) -> bool:
+        """Whether the bearer token belongs to a staff user."""
+        from api.token_verifier import TokenVerificationError, token_verifier
+        from apps.core.services import UserService
+
+        scheme, _, token = authorization.decode('latin-1').partition(' ')
+        if scheme.lower() != 'bearer' or not token.strip():
+            return False
+        try:
+            user_id = token_verifier.get_user_id(token.strip())
+        except TokenVerificationError:
+            return False
+        user = await UserService.aget_principal(user_id)
+        return bool(user and user.is_staff)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        mode = await self.profile_mode(scope)
+        status_code = 500
+        started = time.perf_counter()
+
+        with track_db_usage(capture=mode is not None) as usage:
+            async def send_with_timing(message):
+                nonlocal status_code
+                if message['type'] == 'http.response.start':
+                    status_code = message['status']
+                    if mode is not None:
+                        timing = f'db;desc="{usage.queries} queries";dur={usage.seconds * 1000:.1f}'
+                        message['headers'] = list(message.get('headers', [])) + [
+                            (b'server-timing', timing.encode())
+                        ]
+                await send(message)
+
+            trace = Trace() if mode == 'cprofile' else None
+            token = _trace.set(trace)
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                _trace.reset(token)
+                self._report(scope, status_code, usage, time.perf_counter() - started, trace)
+
+    def _report(self, scope, status_code: int, usage, elapsed: float, trace: Optional[Trace]) -> None:
+        over_budget = (
+            usage.queries > settings.QUERY_BUDGET_COUNT
+            or usage.seconds * 1000 > settings.QUERY_BUDGET_MS
+            or elapsed * 1000 > settings.REQUEST_BUDGET_MS
+        )
+        if usage.statements is None and not over_budget:
+            return
+
+        route = scope['route'].path if 'route' in scope else scope['path']
+        lines = [
+            f"{scope['method']} {scope['path']} ({route}) {status_code}: {usage.queries} queries, "
+            f"{usage.seconds * 1000:.1f}ms in the database, {elapsed * 1000:.1f}ms total"
+        ]
+        if usage.statements is not None:
+            for group in group_statements(usage.statements):
+                flag = ' [likely N+1]' if group['n_plus_one'] else ''
+                lines.append(f"  {group['count']}x {group['ms']:.1f}ms{flag} {group['fingerprint']}")
+                if group['n_plus_one']:
+                    lines.extend(f"      from {caller}" for caller in group['callers'] if caller)
+        if trace is not None:
+            filename = trace.dump(scope['method'], scope['path'])
+            lines.append(f"  cProfile trace: {filename}" if filename else "  cProfile trace skipped: another request was being traced")
+
+        if over_budget:
+            logger.warning("Request over budget: %s", '\n'.join(lines))
+        else:
+            logger.info("Query profile: %s", '\n'.join(lines))
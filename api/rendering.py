@@ -0,0 +1,142 @@
+"""
+Direct ORM-to-JSON rendering.
+
+The response schemas in api.schemas describe the shape of each payload, but
+rows loaded from the database are already valid, so running them through
+model_validate -> model_dump -> JSON (and FastAPI validating the result
+against response_model again) is pure overhead. Serializers here are built
+once per schema: they read the schema's fields straight off model instances
+or `.values()` dicts and the result is encoded with orjson. URL fields are
+the exception: Pydantic normalizes them (a bare host gains a trailing
+slash), so they still go through the field's type.
+
+Endpoints return the rendered ORJSONResponse directly; response_model stays
+on the route for the OpenAPI docs.
+"""
+import typing
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Type
+
+import orjson
+from django.core.exceptions import ObjectDoesNotExist
+from fastapi import Response, status
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pydantic_core import MultiHostUrl, Url
+
+# Match Pydantic's JSON output: UTC datetimes end in "Z"
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+Row = Any
+Serializer = Callable[[Row], Dict[str, Any]]
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode='json')
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class ORJSONResponse(Response):
+    """JSON response encoded with orjson; pre-rendered bytes are sent as-is."""
+
+    media_type = 'application/json'
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+def _nested_schema(annotation: Any):
+    """(schema, many) if a field holds one or a list of response models, else None."""
+    origin = typing.get_origin(annotation)
+    if origin is typing.Union:
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        return _nested_schema(args[0]) if len(args) == 1 else None
+    if origin in (list, typing.List):
+        inner = _nested_schema(typing.get_args(annotation)[0])
+        return (inner[0], True) if inner else None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    return None
+
+
+def _is_url(annotation: Any) -> bool:
+    """Whether a field holds a URL type, possibly optional or constrained (HttpUrl)."""
+    if annotation in (Url, MultiHostUrl):
+        return True
+    return any(_is_url(arg) for arg in typing.get_args(annotation))
+
+
+def _url_converter(annotation: Any) -> Callable[[Any], Any]:
+    adapter = TypeAdapter(annotation)
+
+    def convert(value: Any) -> Any:
+        if value is None:
+            return None
+        try:
+            return adapter.dump_python(adapter.validate_python(value), mode='json')
+        except ValidationError:
+            # Rows saved before the schema checked the URL are rendered as stored
+            return value
+
+    return convert
+
+
+def _read(row: Row, name: str) -> Any:
+    if isinstance(row, dict):
+        return row.get(name)
+    try:
+        return getattr(row, name, None)
+    except ObjectDoesNotExist:
+        # Missing reverse one-to-one, e.g. a question without an answer
+        return None
+
+
+@lru_cache(maxsize=None)
+def serializer(schema: Type[BaseModel]) -> Serializer:
+    """Build a function turning a row into a JSON-ready dict shaped like `schema`."""
+    fields = []
+    for name, field in schema.model_fields.items():
+        nested = _nested_schema(field.annotation)
+        if nested:
+            fields.append((name, serializer(nested[0]), nested[1], None))
+        else:
+            fields.append((name, None, False, _url_converter(field.annotation) if _is_url(field.annotation) else None))
+
+    def serialize(row: Row) -> Dict[str, Any]:
+        data = {}
+        for name, nested, many, convert in fields:
+            value = _read(row, name)
+            if convert is not None:
+                value = convert(value)
+            elif nested is not None and value is not None:
+                if many:
+                    if hasattr(value, 'all'):
+                        value = value.all()
+                    value = [nested(item) for item in value]
+                else:
+                    value = nested(value)
+            data[name] = value
+        return data
+
+    return serialize
+
+
+def dump(schema: Type[BaseModel], row: Row) -> Dict[str, Any]:
+    """One row as a JSON-ready dict shaped like `schema`."""
+    return serializer(schema)(row)
+
+
+def render(schema: Type[BaseModel], rows: Any, many: bool = False) -> bytes:
+    """JSON bytes for one row, or for a list of rows when `many` is set."""
+    serialize = serializer(schema)
+    data = [serialize(row) for row in rows] if many else serialize(rows)
+    return orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+
+
+def render_response(schema: Type[BaseModel], rows: Any, many: bool = False,
+                    status_code: int = status.HTTP_200_OK,
+                    headers: Optional[Dict[str, str]] = None) -> ORJSONResponse:
+    """Render rows straight into a response, skipping Pydantic validation."""
+    return ORJSONResponse(render(schema, rows, many=many), status_code=status_code, headers=headers)
@@ -0,0 +1,96 @@
+"""
+Rendered JSON responses kept in a TieredCache.
+
+Entries are (body, etag, headers) tuples; a hit is written out as-is, with
+no ORM or Pydantic work, and a matching If-None-Match gets a bodiless 304.
+
+Keys embed a CacheVersion token. For DB_REPLICA_MAX_LAG_SECONDS after the
+version is bumped, a miss sends the request's reads to the primary: a
+replica may not have the write behind the bump yet, and a response
+rendered from it would stay cached under the new version.
+
+Without a shared backend for that token, a bump is only seen by its own
+process; such caches can be turned off by a setting, and then every lookup
+misses and nothing is stored.
+"""
+import hashlib
+from typing import Dict, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from fastapi import Request, Response, status
+
+from apps.core.cache import CacheVersion, TieredCache, job_cache, job_cache_version
+from apps.core.db_router import read_from_primary
+
+CachedResponse = Tuple[bytes, str, Dict[str, str]]
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag for a response body."""
+    return '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match header covers `etag`."""
+    header = request.headers.get('if-none-match')
+    if not header:
+        return False
+    tags = {tag.strip().removeprefix('W/') for tag in header.split(',')}
+    return '*' in tags or etag in tags
+
+
+class ResponseCache:
+    """
+    Cache of rendered responses, keyed by `parts` under the current `version`.
+    When `enabled_setting` names a false setting, the cache is bypassed.
+    """
+
+    def __init__(self, cache: TieredCache, version: CacheVersion, enabled_setting: Optional[str] = None):
+        self.cache = cache
+        self.version = version
+        self.enabled_setting = enabled_setting
+
+    @property
+    def enabled(self) -> bool:
+        return self.enabled_setting is None or getattr(settings, self.enabled_setting)
+
+    def _lookup(self, parts: tuple) -> Tuple[str, Optional[CachedResponse]]:
+        token = self.version.get()
+        key = ':'.join([token, *map(str, parts)])
+        entry = self.cache.get(key)
+        if entry is None and self.version.bumped_within(token, settings.DB_REPLICA_MAX_LAG_SECONDS):
+            read_from_primary()
+        return key, entry
+
+    async def lookup(self, *parts) -> Tuple[str, Optional[CachedResponse]]:
+        """Return the cache key for `parts` and the cached response, if any."""
+        if not self.enabled:
+            return '', None
+        if self.cache.shared is None:
+            return self._lookup(parts)
+        # The shared tier does network I/O; keep it off the event loop
+        return await sync_to_async(self._lookup)(parts)
+
+    async def store(self, key: str, body: bytes, headers: Optional[Dict[str, str]] = None) -> CachedResponse:
+        """Cache a rendered JSON body under `key` and return the entry."""
+        entry = (body, make_etag(body), headers or {})
+        if not self.enabled:
+            return entry
+        if self.cache.shared is None:
+            self.cache.set(key, entry)
+        else:
+            await sync_to_async(self.cache.set)(key, entry)
+        return entry
+
+    @staticmethod
+    def respond(request: Request, entry: CachedResponse) -> Response:
+        """Serve a cached entry, or 304 Not Modified if the client already has it."""
+        body, etag, headers = entry
+        headers = {**headers, 'ETag': etag}
+        if etag_matches(request, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=body, media_type='application/json', headers=headers)
+
+
+job_responses = ResponseCache(job_cache, job_cache_version, enabled_setting='JOB_CACHE_ENABLED')
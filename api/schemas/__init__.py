@@ -1,19 +1,27 @@
 from .user import UserCreate, UserResponse, TokenResponse, LoginRequest
 from .company import CompanyCreate, CompanyUpdate, CompanyResponse
-from .candidate import CandidateCreate, CandidateUpdate, CandidateResponse
-from .job import JobCreate, JobUpdate, JobResponse
+from .candidate import (
+    CandidateCreate, CandidateUpdate, CandidateResponse,
+    CandidateImportResponse, ImportRowErrorResponse
+)
+from .job import JobCreate, JobUpdate, JobResponse, CandidateMatchResponse
 from .interview import (
     InterviewCreate, InterviewResponse, InterviewDetailResponse,
     QuestionResponse, AnswerCreate, AnswerResponse,
-    QuestionUpload, QuestionsUploadRequest, QuestionWithAnswerResponse
+    AnswersBatchRequest, AnswersBatchResponse,
+    QuestionUpload, QuestionsUploadRequest, QuestionWithAnswerResponse,
+    InterviewDetailWithAnswersResponse
 )
 
 __all__ = [
     'UserCreate', 'UserResponse', 'TokenResponse', 'LoginRequest',
     'CompanyCreate', 'CompanyUpdate', 'CompanyResponse',
     'CandidateCreate', 'CandidateUpdate', 'CandidateResponse',
-    'JobCreate', 'JobUpdate', 'JobResponse',
+    'CandidateImportResponse', 'ImportRowErrorResponse',
+    'JobCreate', 'JobUpdate', 'JobResponse', 'CandidateMatchResponse',
     'InterviewCreate', 'InterviewResponse', 'InterviewDetailResponse',
     'QuestionResponse', 'AnswerCreate', 'AnswerResponse',
+    'AnswersBatchRequest', 'AnswersBatchResponse',
     'QuestionUpload', 'QuestionsUploadRequest', 'QuestionWithAnswerResponse',
+    'InterviewDetailWithAnswersResponse',
 ]
@@ -33,3 +33,14 @@ class CandidateResponse(CandidateBase):
     
     class Config:
         from_attributes = True
+
+
+class ImportRowErrorResponse(BaseModel):
+    row: int
+    error: str
+
+
+class CandidateImportResponse(BaseModel):
+    created: int
+    failed: int
+    errors: List[ImportRowErrorResponse] = []
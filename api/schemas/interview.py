@@ -29,6 +29,10 @@ class AnswerCreate(BaseModel):
     answer_text: str
 
 
+class AnswersBatchRequest(BaseModel):
+    answers: List[AnswerCreate]
+
+
 class AnswerResponse(BaseModel):
     id: int
     question_id: int
@@ -75,3 +79,12 @@ class QuestionsUploadRequest(BaseModel):
 
 class QuestionWithAnswerResponse(QuestionResponse):
     answer: Optional[AnswerResponse] = None
+
+
+class InterviewDetailWithAnswersResponse(InterviewResponse):
+    questions: List[QuestionWithAnswerResponse] = []
+
+
+class AnswersBatchResponse(BaseModel):
+    interview: InterviewResponse
+    answers: List[AnswerResponse]
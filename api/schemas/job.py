@@ -26,6 +26,15 @@ class JobUpdate(BaseModel):
     status: Optional[str] = None
 
 
+class CandidateMatchResponse(BaseModel):
+    candidate_id: int
+    full_name: str
+    experience_years: int
+    skill_match_score: float
+    matched_skills: List[str] = []
+    experience_delta: Optional[int] = None
+
+
 class JobResponse(JobBase):
     id: int
     company_id: int
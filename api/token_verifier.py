@@ -0,0 +1,77 @@
+import hashlib
+import time
+from typing import Any, Dict
+
+import jwt
+from django.conf import settings
+from rest_framework_simplejwt.settings import api_settings
+
+from apps.core.cache import LocalCache
+from apps.core.metrics import cache_requests
+
+
+class TokenVerificationError(Exception):
+    """Raised when an access token is malformed, forged, expired or of the wrong type."""
+
+
+class TokenVerifier:
+    """
+    Verifies simplejwt access tokens without building an AccessToken per request.
+
+    Signing key, algorithm and claim names are read from SIMPLE_JWT once, at
+    construction. Verified claims are cached by token digest until the token's
+    own `exp`, so a client reusing its access token pays for one signature
+    check per process instead of one per request.
+    """
+
+    def __init__(self, cache_size: int):
+        self.key = api_settings.VERIFYING_KEY or api_settings.SIGNING_KEY
+        self.algorithms = [api_settings.ALGORITHM]
+        self.audience = api_settings.AUDIENCE
+        self.issuer = api_settings.ISSUER
+        self.leeway = api_settings.LEEWAY
+        self.token_type_claim = api_settings.TOKEN_TYPE_CLAIM
+        self.jti_claim = api_settings.JTI_CLAIM
+        self.user_id_claim = api_settings.USER_ID_CLAIM
+        self._claims = LocalCache(maxsize=cache_size, ttl=api_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """Return the verified claims of an access token."""
+        digest = hashlib.sha256(token.encode()).digest()
+        claims = self._claims.get(digest)
+        cache_requests.inc('token_claims', 'miss' if claims is None else 'local_hit')
+        if claims is not None:
+            return claims
+
+        try:
+            claims = jwt.decode(
+                token,
+                self.key,
+                algorithms=self.algorithms,
+                audience=self.audience,
+                issuer=self.issuer,
+                leeway=self.leeway,
+                options={
+                    "verify_aud": self.audience is not None,
+                    "require": ["exp"],
+                },
+            )
+        except jwt.InvalidTokenError as e:
+            raise TokenVerificationError("Token is invalid or expired") from e
+
+        if claims.get(self.token_type_claim) != 'access':
+            raise TokenVerificationError("Token has wrong type")
+        if self.jti_claim not in claims or self.user_id_claim not in claims:
+            raise TokenVerificationError("Token has no id")
+
+        remaining = claims['exp'] - time.time()
+        if remaining > 0:
+            self._claims.set(digest, claims, ttl=remaining)
+        return claims
+
+    def get_user_id(self, token: str) -> Any:
+        """Verify an access token and return the user ID it was issued for."""
+        return self.verify(token)[self.user_id_claim]
+
+
+token_verifier = TokenVerifier(cache_size=settings.JWT_CLAIMS_CACHE_SIZE)
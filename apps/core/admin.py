@@ -1,6 +1,36 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, Company, Candidate, JobPosting, Interview, Question, Answer
+from .models import User, Company, Candidate, JobPosting, Interview, Question, Answer, Skill
+from .services import CandidateService, InterviewService, JobService, MatchService, SkillService, UserService
+
+
+class InterviewCountersMixin:
+    """
+    Rebuilds the counters on Interview (question_count and the answer
+    counters) after admin edits, which bypass InterviewService.
+    `interview_lookup` leads from the admin's model to the interview ID.
+    """
+    interview_lookup = 'interview_id'
+    
+    def _interview_ids(self, queryset) -> list:
+        return list(queryset.values_list(self.interview_lookup, flat=True).distinct())
+    
+    def save_model(self, request, obj, form, change):
+        # Moving a row to another interview changes both interviews' counters
+        interview_ids = self._interview_ids(self.model.objects.filter(pk=obj.pk)) if change else []
+        super().save_model(request, obj, form, change)
+        interview_ids += self._interview_ids(self.model.objects.filter(pk=obj.pk))
+        InterviewService.reconcile_counters(interview_ids)
+    
+    def delete_model(self, request, obj):
+        interview_ids = self._interview_ids(self.model.objects.filter(pk=obj.pk))
+        super().delete_model(request, obj)
+        InterviewService.reconcile_counters(interview_ids)
+    
+    def delete_queryset(self, request, queryset):
+        interview_ids = self._interview_ids(queryset)
+        super().delete_queryset(request, queryset)
+        InterviewService.reconcile_counters(interview_ids)
 
 
 @admin.register(User)
@@ -14,6 +44,22 @@ class UserAdmin(BaseUserAdmin):
     fieldsets = BaseUserAdmin.fieldsets + (
         ('Additional Info', {'fields': ('role', 'phone')}),
     )
+    
+    def save_model(self, request, obj, form, change):
+        # Deactivating a user takes effect on its next API request
+        super().save_model(request, obj, form, change)
+        UserService.invalidate_principal(obj.pk)
+    
+    def delete_model(self, request, obj):
+        user_id = obj.pk
+        super().delete_model(request, obj)
+        UserService.invalidate_principal(user_id)
+    
+    def delete_queryset(self, request, queryset):
+        user_ids = list(queryset.values_list('pk', flat=True))
+        super().delete_queryset(request, queryset)
+        for user_id in user_ids:
+            UserService.invalidate_principal(user_id)
 
 
 @admin.register(Company)
@@ -26,14 +72,33 @@ class CompanyAdmin(admin.ModelAdmin):
     raw_id_fields = ('user',)
 
 
+@admin.register(Skill)
+class SkillAdmin(admin.ModelAdmin):
+    """Admin interface for Skill model."""
+    list_display = ('name', 'created_at')
+    search_fields = ('=name',)
+    ordering = ('name',)
+
+
 @admin.register(Candidate)
 class CandidateAdmin(admin.ModelAdmin):
     """Admin interface for Candidate model."""
     list_display = ('full_name', 'user', 'experience_years', 'created_at')
     list_filter = ('experience_years', 'created_at')
-    search_fields = ('full_name', 'user__username', 'user__email', 'skills')
+    search_fields = ('full_name', 'user__username', 'user__email', '=canonical_skills__name')
     ordering = ('-created_at',)
     raw_id_fields = ('user',)
+    exclude = ('canonical_skills', 'cv_blob')
+    
+    def save_model(self, request, obj, form, change):
+        cv_changed = 'cv_file' in form.changed_data and obj.cv_file
+        if cv_changed:
+            CandidateService.attach_cv(obj, obj.cv_file.file)
+        super().save_model(request, obj, form, change)
+        if cv_changed:
+            CandidateService.schedule_cv_parse(obj)
+        SkillService.sync_candidate_skills(obj)
+        MatchService.schedule_candidate_refresh(obj.id)
 
 
 @admin.register(JobPosting)
@@ -44,15 +109,34 @@ class JobPostingAdmin(admin.ModelAdmin):
     search_fields = ('title', 'description', 'company__company_name')
     ordering = ('-created_at',)
     raw_id_fields = ('company',)
+    exclude = ('canonical_skills',)
+    
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        SkillService.sync_job_skills(obj)
+        JobService.invalidate_cache()
+        MatchService.schedule_job_refresh([obj.id])
+    
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        JobService.invalidate_cache()
+    
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        JobService.invalidate_cache()
     
     actions = ['make_active', 'make_closed']
     
     def make_active(self, request, queryset):
         queryset.update(status='active')
+        JobService.invalidate_cache()
+        MatchService.schedule_job_refresh(queryset.values_list('id', flat=True))
     make_active.short_description = "Mark selected jobs as active"
     
     def make_closed(self, request, queryset):
         queryset.update(status='closed')
+        JobService.invalidate_cache()
+        MatchService.schedule_job_refresh(queryset.values_list('id', flat=True))
     make_closed.short_description = "Mark selected jobs as closed"
 
 
@@ -73,10 +157,15 @@ class InterviewAdmin(admin.ModelAdmin):
     ordering = ('-created_at',)
     raw_id_fields = ('job_posting', 'candidate')
     readonly_fields = ('skill_match_score', 'final_score', 'agent_recommendation', 
-                       'started_at', 'completed_at')
+                       'started_at', 'completed_at', 'created_at', 'updated_at')
     
     inlines = [QuestionInline]
     
+    def save_related(self, request, form, formsets, change):
+        # Questions added or deleted inline bypass InterviewService
+        super().save_related(request, form, formsets, change)
+        InterviewService.reconcile_counters([form.instance.pk])
+    
     fieldsets = (
         ('Basic Info', {
             'fields': ('job_posting', 'candidate', 'status', 'channel')
@@ -95,7 +184,7 @@ class InterviewAdmin(admin.ModelAdmin):
 
 
 @admin.register(Question)
-class QuestionAdmin(admin.ModelAdmin):
+class QuestionAdmin(InterviewCountersMixin, admin.ModelAdmin):
     """Admin interface for Question model."""
     list_display = ('id', 'interview', 'skill_evaluated', 'difficulty', 'order')
     list_filter = ('difficulty', 'created_at')
@@ -105,10 +194,11 @@ class QuestionAdmin(admin.ModelAdmin):
 
 
 @admin.register(Answer)
-class AnswerAdmin(admin.ModelAdmin):
+class AnswerAdmin(InterviewCountersMixin, admin.ModelAdmin):
     """Admin interface for Answer model."""
     list_display = ('id', 'question', 'score', 'created_at')
     list_filter = ('score', 'created_at')
     search_fields = ('answer_text', 'evaluation_notes')
     ordering = ('-created_at',)
     raw_id_fields = ('question',)
+    interview_lookup = 'question__interview_id'
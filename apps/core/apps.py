@@ -1,6 +1,22 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def ensure_search_index(sender, using, **kwargs):
+    """Recreate the job search index if a migration dropped it (see apps.core.search)."""
+    from django.db import connections
+    from .search import install_search_index
+    
+    install_search_index(connections[using])
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.core'
+    
+    def ready(self):
+        from . import metrics, task_queue
+        
+        post_migrate.connect(ensure_search_index, sender=self)
+        metrics.install()
+        task_queue.connect()
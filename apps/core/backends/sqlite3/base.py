@@ -0,0 +1,17 @@
+"""
+SQLite backend for local development that starts transactions with
+BEGIN IMMEDIATE.
+
+Django 4.2 opens atomic blocks with a deferred BEGIN, so a transaction that
+reads before it writes has to upgrade its lock halfway through. When another
+thread (a request, or a task on the local task queue) is writing at that
+moment, SQLite fails the upgrade with "database is locked" straight away
+instead of waiting. Taking the write lock up front makes concurrent
+transactions wait for each other for up to the `timeout` option.
+"""
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def _start_transaction_under_autocommit(self):
+        self.cursor().execute("BEGIN IMMEDIATE")
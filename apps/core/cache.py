@@ -0,0 +1,230 @@
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Protocol, Tuple
+
+from django.conf import settings
+
+from apps.core.metrics import cache_requests
+
+
+class CacheBackend(Protocol):
+    """Minimal byte-oriented key/value protocol shared by every cache tier."""
+
+    def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        ...
+
+    def delete(self, *keys: str) -> None:
+        ...
+
+
+class LocalCache:
+    """
+    Thread-safe in-process cache with per-entry TTL and LRU eviction.
+    Implements CacheBackend, but can hold arbitrary objects as well as bytes.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (ttl if ttl is not None else self.ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, *keys: Any) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class InMemoryBackend:
+    """Unbounded in-memory stand-in for Redis, for tests and single-process setups."""
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[float, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                self._data.pop(key, None)
+                return None
+            return entry[1]
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+
+class RedisBackend:
+    """Shared cache tier backed by Redis."""
+
+    def __init__(self, url: str):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.client.set(key, value, px=int(ttl * 1000))
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self.client.delete(*keys)
+
+
+def get_shared_backend() -> Optional[CacheBackend]:
+    """Return the Redis tier when REDIS_URL is configured, otherwise None."""
+    if settings.REDIS_URL:
+        return RedisBackend(settings.REDIS_URL)
+    return None
+
+
+class TieredCache:
+    """
+    Two-tier object cache: an in-process LocalCache in front of an optional
+    shared backend. Values are pickled once on write, so every reader gets
+    its own copy and cached objects are never shared between requests.
+    """
+
+    def __init__(self, namespace: str, local: LocalCache,
+                 shared: Optional[CacheBackend] = None, ttl: float = 30.0):
+        self.namespace = namespace
+        self.local = local
+        self.shared = shared
+        self.ttl = ttl
+
+    def _key(self, key: Any) -> str:
+        return f"{self.namespace}:{key}"
+
+    def get_local(self, key: Any) -> Optional[Any]:
+        """Look up the in-process tier only. Never does I/O."""
+        raw = self.local.get(self._key(key))
+        cache_requests.inc(self.namespace, 'miss' if raw is None else 'local_hit')
+        return pickle.loads(raw) if raw is not None else None
+
+    def get(self, key: Any) -> Optional[Any]:
+        """Look up the in-process tier, then the shared tier."""
+        full_key = self._key(key)
+        raw = self.local.get(full_key)
+        result = 'local_hit'
+        if raw is None and self.shared is not None:
+            raw = self.shared.get(full_key)
+            result = 'shared_hit'
+            if raw is not None:
+                self.local.set(full_key, raw, self.ttl)
+        cache_requests.inc(self.namespace, 'miss' if raw is None else result)
+        return pickle.loads(raw) if raw is not None else None
+
+    def set(self, key: Any, value: Any) -> None:
+        full_key = self._key(key)
+        raw = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self.local.set(full_key, raw, self.ttl)
+        if self.shared is not None:
+            self.shared.set(full_key, raw, self.ttl)
+
+    def delete(self, *keys: Any) -> None:
+        full_keys = [self._key(key) for key in keys]
+        self.local.delete(*full_keys)
+        if self.shared is not None:
+            self.shared.delete(*full_keys)
+
+
+class CacheVersion:
+    """
+    Version token for a family of cache entries: keys built with it are all
+    orphaned at once by bump(). The token lives in the shared backend when
+    there is one, so a bump in one process is seen by every other process.
+    """
+
+    def __init__(self, key: str, shared: Optional[CacheBackend] = None, ttl: float = 86400.0):
+        self.key = key
+        self.shared = shared
+        self.ttl = ttl
+        self._token = self._new_token()
+
+    @staticmethod
+    def _new_token() -> str:
+        # Tokens carry their bump time, so readers can tell a fresh version
+        return f"{uuid.uuid4().hex}-{time.time():.3f}"
+
+    @staticmethod
+    def bumped_within(token: str, seconds: float) -> bool:
+        """Whether `token` was issued by a bump less than `seconds` ago."""
+        try:
+            return time.time() - float(token.rpartition('-')[2]) < seconds
+        except ValueError:
+            return False
+
+    def get(self) -> str:
+        if self.shared is None:
+            return self._token
+        raw = self.shared.get(self.key)
+        if raw is None:
+            return self.bump()
+        return raw.decode()
+
+    def bump(self) -> str:
+        self._token = self._new_token()
+        if self.shared is not None:
+            self.shared.set(self.key, self._token.encode(), self.ttl)
+        return self._token
+
+
+# Fields of an authenticated user and its profile IDs, keyed by user ID
+# (see UserService.get_principal)
+principal_cache = TieredCache(
+    namespace='principal',
+    local=LocalCache(
+        maxsize=settings.PRINCIPAL_CACHE_SIZE,
+        ttl=settings.PRINCIPAL_CACHE_TTL,
+    ),
+    shared=get_shared_backend() if settings.PRINCIPAL_CACHE_SHARED else None,
+    ttl=settings.PRINCIPAL_CACHE_TTL,
+)
+
+# Rendered public job responses (single postings and list pages); every key
+# embeds job_cache_version, which JobService bumps on any job write
+job_cache = TieredCache(
+    namespace='jobs',
+    local=LocalCache(maxsize=settings.JOB_CACHE_SIZE, ttl=settings.JOB_CACHE_TTL),
+    shared=get_shared_backend(),
+    ttl=settings.JOB_CACHE_TTL,
+)
+job_cache_version = CacheVersion('jobs:version', shared=job_cache.shared)
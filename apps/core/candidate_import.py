@@ -0,0 +1,146 @@
+"""
+Streaming reader for bulk candidate imports.
+
+Records are read one at a time from a CSV or NDJSON file and validated into
+plain field dicts, so an import never holds more than one batch in memory.
+Password hashing (PBKDF2, deliberately slow) is the dominant cost of an
+import and runs on the password hashing pool (see apps.core.hashing), one
+batch at a time.
+"""
+import csv
+import io
+import json
+import re
+from typing import Iterator, List, Optional, Tuple
+
+from django.core.exceptions import ValidationError
+from django.core.validators import URLValidator, validate_email
+
+FORMATS = ('csv', 'ndjson')
+REQUIRED_FIELDS = ('username', 'email', 'password', 'full_name')
+
+_SKILL_SEPARATOR_RE = re.compile(r'[;,|]')
+_validate_url = URLValidator()
+
+
+class ImportRowError(ValueError):
+    """A single import record that cannot be turned into a candidate."""
+
+
+def detect_format(fileobj, filename: str = '') -> str:
+    """Guess 'csv' or 'ndjson' from the file name, falling back to the first byte."""
+    name = filename.lower()
+    if name.endswith('.csv'):
+        return 'csv'
+    if name.endswith(('.ndjson', '.jsonl')):
+        return 'ndjson'
+    head = fileobj.read(64)
+    fileobj.seek(0)
+    return 'ndjson' if head.lstrip(b'\xef\xbb\xbf \t\r\n').startswith(b'{') else 'csv'
+
+
+def _parse_skills(value) -> List[str]:
+    if value is None or value == '':
+        return []
+    if isinstance(value, str):
+        return [skill.strip() for skill in _SKILL_SEPARATOR_RE.split(value) if skill.strip()]
+    if isinstance(value, list) and all(isinstance(skill, str) for skill in value):
+        return [skill.strip() for skill in value if skill.strip()]
+    raise ImportRowError("skills must be a list of strings or a ';'-separated string")
+
+
+def clean_record(record) -> dict:
+    """Validate one raw record and return normalized candidate fields."""
+    if not isinstance(record, dict):
+        raise ImportRowError("record must be an object")
+
+    values = {
+        key: value.strip() if isinstance(value, str) else value
+        for key, value in record.items() if key is not None
+    }
+    missing = [field for field in REQUIRED_FIELDS if not values.get(field)]
+    if missing:
+        raise ImportRowError(f"missing required field(s): {', '.join(missing)}")
+
+    if len(values['username']) > 150:
+        raise ImportRowError("username is longer than 150 characters")
+    try:
+        validate_email(values['email'])
+    except ValidationError:
+        raise ImportRowError(f"invalid email: {values['email']}")
+
+    try:
+        experience_years = int(values.get('experience_years') or 0)
+    except (TypeError, ValueError):
+        raise ImportRowError(f"invalid experience_years: {values.get('experience_years')}")
+    if experience_years < 0:
+        raise ImportRowError("experience_years must not be negative")
+
+    linkedin_url = values.get('linkedin_url') or None
+    if linkedin_url:
+        try:
+            _validate_url(linkedin_url)
+        except ValidationError:
+            raise ImportRowError(f"invalid linkedin_url: {linkedin_url}")
+
+    return {
+        'username': values['username'],
+        'email': values['email'],
+        'password': str(values['password']),
+        'full_name': str(values['full_name'])[:255],
+        'skills': _parse_skills(values.get('skills')),
+        'experience_years': experience_years,
+        'education': values.get('education') or '',
+        'linkedin_url': linkedin_url,
+    }
+
+
+def _iter_raw(fileobj, fmt: str) -> Iterator[Tuple[int, object]]:
+    text = io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline='')
+    try:
+        if fmt == 'csv':
+            reader = csv.DictReader(text)
+            try:
+                reader.fieldnames
+            except csv.Error as e:
+                raise ValueError(f"malformed CSV header: {e}")
+            row = 0
+            while True:
+                row += 1
+                try:
+                    record = next(reader)
+                except StopIteration:
+                    return
+                except csv.Error as e:
+                    # The reader resumes at the next line
+                    record = ImportRowError(f"malformed CSV: {e}")
+                yield row, record
+        row = 0
+        for line in text:
+            if not line.strip():
+                continue
+            row += 1
+            try:
+                yield row, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield row, ImportRowError(f"invalid JSON: {e.msg}")
+    finally:
+        # Leave the caller's file open
+        text.detach()
+
+
+def iter_records(fileobj, fmt: str) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """
+    Yield (row, fields, error) for every record of a binary CSV/NDJSON file.
+    Exactly one of `fields` and `error` is set; rows are numbered from 1.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported import format: {fmt}")
+    for row, record in _iter_raw(fileobj, fmt):
+        try:
+            if isinstance(record, Exception):
+                raise record
+            yield row, clean_record(record), None
+        except ImportRowError as e:
+            yield row, None, str(e)
+
@@ -0,0 +1,229 @@
+"""
+Streaming CV parser.
+
+Text is pulled out of the uploaded file incrementally (PDF page by page,
+DOCX through a streaming XML parse of word/document.xml, plain text in
+fixed-size decoded chunks) and consumed line by line, so memory use is
+bounded by the longest line rather than by the file size. Skills are found
+with a compiled Aho-Corasick automaton over the canonical skill dictionary,
+which scans every line once no matter how many skills are known.
+"""
+import codecs
+import re
+import zipfile
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+from xml.etree import ElementTree
+
+# Bump whenever the output of parse_cv changes for the same input
+PARSER_VERSION = 2
+
+CHUNK_SIZE = 64 * 1024
+MAX_LINE_LENGTH = 10_000
+
+LANGUAGES = (
+    'english', 'spanish', 'french', 'german', 'portuguese', 'italian', 'dutch',
+    'chinese', 'mandarin', 'japanese', 'korean', 'russian', 'arabic', 'hindi',
+)
+
+_WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_EXPERIENCE_RE = re.compile(r'(\d{1,2})\s*\+?\s*(?:years?|yrs?|años)', re.IGNORECASE)
+_EDUCATION_RE = re.compile(
+    r'\b(bachelor|master|ph\.?d|doctorate|b\.?sc|m\.?sc|mba|degree|licenciatura|ingenier[ií]a)\b',
+    re.IGNORECASE
+)
+_CERTIFICATION_RE = re.compile(r'\bcertifi(?:ed|cate|cation)\b', re.IGNORECASE)
+
+
+class SkillMatcher:
+    """Aho-Corasick automaton matching whole-word occurrences of many phrases at once."""
+
+    def __init__(self, phrases: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[str]] = [[]]
+
+        for phrase in phrases:
+            phrase = phrase.strip().lower()
+            if phrase:
+                self._add(phrase)
+        self._build()
+
+    def _add(self, phrase: str) -> None:
+        state = 0
+        for char in phrase:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append(phrase)
+
+    def _build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find(self, text: str) -> Set[str]:
+        """Phrases occurring in `text` bounded by non-alphanumeric characters."""
+        text = text.lower()
+        goto, fail, output = self._goto, self._fail, self._output
+        found = set()
+        state = 0
+        for end, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for phrase in output[state]:
+                start = end - len(phrase) + 1
+                if (start == 0 or not text[start - 1].isalnum()) and \
+                        (end + 1 == len(text) or not text[end + 1].isalnum()):
+                    found.add(phrase)
+        return found
+
+
+def _iter_plain_text(fileobj) -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    while True:
+        chunk = fileobj.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        yield decoder.decode(chunk)
+    yield decoder.decode(b'', final=True)
+
+
+def _iter_pdf(fileobj) -> Iterator[str]:
+    from pypdf import PdfReader
+    from pypdf.generic import ArrayObject, IndirectObject
+
+    reader = PdfReader(fileobj)
+    for page in reader.pages:
+        yield page.extract_text() or ''
+        yield '\n'
+        # The reader caches every object it resolves; drop the page's content
+        # streams, by far the largest, so they do not pile up page after page
+        contents = page.raw_get('/Contents') if '/Contents' in page else None
+        for ref in contents if isinstance(contents, ArrayObject) else [contents]:
+            if isinstance(ref, IndirectObject):
+                reader.resolved_objects.pop((ref.generation, ref.idnum), None)
+
+
+def _iter_docx(fileobj) -> Iterator[str]:
+    with zipfile.ZipFile(fileobj) as archive, archive.open('word/document.xml') as document:
+        depth = 0
+        body = None
+        for event, element in ElementTree.iterparse(document, events=('start', 'end')):
+            if event == 'start':
+                depth += 1
+                if depth == 2:
+                    body = element
+                continue
+            depth -= 1
+            if element.tag == f'{_WORD_NS}t' and element.text:
+                yield element.text
+            elif element.tag == f'{_WORD_NS}tab':
+                yield '\t'
+            elif element.tag == f'{_WORD_NS}p':
+                yield '\n'
+                # Paragraph fully consumed; drop its content
+                element.clear()
+            if depth == 2:
+                # Top-level block (paragraph, table) fully consumed; detach it
+                # too, or the emptied elements still add up under w:body
+                body.clear()
+
+
+def iter_text(fileobj, filename: str = '') -> Iterator[str]:
+    """Yield the text of a PDF, DOCX or plain-text file in chunks."""
+    head = fileobj.read(4)
+    fileobj.seek(0)
+    name = filename.lower()
+    if head.startswith(b'%PDF') or name.endswith('.pdf'):
+        return _iter_pdf(fileobj)
+    if head.startswith(b'PK') or name.endswith('.docx'):
+        return _iter_docx(fileobj)
+    return _iter_plain_text(fileobj)
+
+
+def iter_lines(chunks: Iterable[str]) -> Iterator[str]:
+    """Re-split a stream of text chunks into lines of bounded length."""
+    pending = ''
+    for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split('\n')
+        yield from lines
+        while len(pending) > MAX_LINE_LENGTH:
+            yield pending[:MAX_LINE_LENGTH]
+            pending = pending[MAX_LINE_LENGTH:]
+    if pending:
+        yield pending
+
+
+_language_matcher = SkillMatcher(LANGUAGES)
+
+
+def _failed(error: str) -> dict:
+    return {
+        'status': 'failed',
+        'error': error,
+        'skills': [],
+        'experience_years': None,
+        'education': None,
+        'certifications': [],
+        'languages': [],
+        'parser_version': PARSER_VERSION,
+    }
+
+
+def parse_cv(fileobj, skill_matcher: SkillMatcher, filename: str = '') -> dict:
+    """
+    Extract skills, experience, education, certifications and languages from
+    a CV file. A file that cannot be read as the format it claims to be (a
+    zip that is not a DOCX, a corrupt or encrypted PDF) gives a result with
+    status 'failed', the error, and nothing extracted.
+    """
+    from pypdf.errors import PdfReadError
+
+    skills: Set[str] = set()
+    languages: Set[str] = set()
+    certifications: List[str] = []
+    education: Optional[str] = None
+    experience_years: Optional[int] = None
+
+    try:
+        for line in iter_lines(iter_text(fileobj, filename)):
+            line = line.strip()
+            if not line:
+                continue
+
+            skills |= skill_matcher.find(line)
+            languages |= _language_matcher.find(line)
+
+            for match in _EXPERIENCE_RE.finditer(line):
+                experience_years = max(experience_years or 0, int(match.group(1)))
+            if education is None and _EDUCATION_RE.search(line):
+                education = line[:255]
+            if len(certifications) < 10 and _CERTIFICATION_RE.search(line):
+                certifications.append(line[:255])
+    except (KeyError, zipfile.BadZipFile, ElementTree.ParseError, PdfReadError) as e:
+        return _failed(f'{type(e).__name__}: {e}')
+
+    return {
+        'status': 'parsed',
+        'skills': sorted(skills),
+        'experience_years': experience_years,
+        'education': education,
+        'certifications': certifications,
+        'languages': sorted(language.capitalize() for language in languages),
+        'parser_version': PARSER_VERSION,
+    }
@@ -0,0 +1,117 @@
+"""
+Read-replica routing.
+
+Only querysets that opt in with the REPLICA_HINT hint (see
+BaseService.read_queryset) are read from a replica, and only while serving
+an API request (routing_scope). Everything else - writes, reads inside a
+transaction, Celery tasks, the admin - uses the primary. Once a request
+has written, the rest of it reads from the primary as well, so it always
+sees its own writes. A replica that cannot be reached is skipped for
+DB_REPLICA_RETRY_SECONDS and its reads go to the primary meanwhile.
+
+Reads that fill a cache right after it was invalidated must not come from
+a replica that has not caught up yet, or the stale rows would be cached
+under the new version; callers send them to the primary with
+read_from_primary (see api.response_cache).
+"""
+import itertools
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+REPLICA_HINT = 'read_replica'
+
+
+class RoutingState:
+    """Per-request routing state: whether the request has written yet."""
+
+    __slots__ = ('pinned',)
+
+    def __init__(self):
+        self.pinned = False
+
+
+_routing_state: ContextVar[Optional[RoutingState]] = ContextVar('db_routing_state', default=None)
+
+
+@contextmanager
+def routing_scope():
+    """Allow replica reads for the enclosed request, until it first writes."""
+    token = _routing_state.set(RoutingState())
+    try:
+        yield
+    finally:
+        _routing_state.reset(token)
+
+
+def read_from_primary() -> None:
+    """Send the rest of the current request's reads to the primary."""
+    state = _routing_state.get()
+    if state is not None:
+        state.pinned = True
+
+
+def replica_aliases() -> List[str]:
+    return [alias for alias in settings.DATABASES if alias != DEFAULT_DB_ALIAS]
+
+
+class ReplicaRouter:
+    """Database router sending opted-in reads to the replica databases, round robin."""
+
+    def __init__(self):
+        self.replicas = replica_aliases()
+        self._counter = itertools.count()
+        self._down_until: Dict[str, float] = {}
+
+    def _available(self, alias: str) -> bool:
+        if self._down_until.get(alias, 0.0) > time.monotonic():
+            return False
+        connection = connections[alias]
+        try:
+            connection.close_if_health_check_failed()
+            connection.ensure_connection()
+        except DatabaseError as e:
+            logger.warning("Replica %s unavailable, reading from the primary: %s", alias, e)
+            self._down_until[alias] = time.monotonic() + settings.DB_REPLICA_RETRY_SECONDS
+            return False
+        return True
+
+    def _pick_replica(self) -> str:
+        for _ in range(len(self.replicas)):
+            alias = self.replicas[next(self._counter) % len(self.replicas)]
+            if self._available(alias):
+                return alias
+        return DEFAULT_DB_ALIAS
+
+    def db_for_read(self, model, **hints):
+        state = _routing_state.get()
+        if state is None or state.pinned or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+
+        # Related objects of a replica-loaded instance stay on its replica
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db in self.replicas:
+            return instance._state.db if self._available(instance._state.db) else DEFAULT_DB_ALIAS
+        if hints.get(REPLICA_HINT):
+            return self._pick_replica()
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _routing_state.get()
+        if state is not None:
+            state.pinned = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
@@ -0,0 +1,200 @@
+"""
+Password hashing off the request path.
+
+PBKDF2 is deliberately slow and holds the GIL for the whole computation,
+so hashing on a request thread stalls every other request served by the
+same worker. PasswordHasherPool runs make_password/check_password on a
+bounded process pool instead and rejects work once too much is queued.
+Bulk candidate imports hash on the same pool, a few small chunks at a
+time, so they share its workers with logins rather than forking more.
+Their chunks count against the same queue limit, but may only fill half
+of it: an import waits for room, while logins always find some.
+"""
+import asyncio
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Deque, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+
+LATENCY_SAMPLES = 1024
+
+# Passwords per pool task in bulk hashing; small enough that a login queued
+# behind an import waits for one chunk at most
+BULK_CHUNK_SIZE = 16
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hasher queue is full; the caller should retry later."""
+
+
+def _init_django(settings_module: str) -> None:
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+def hash_password(password: str) -> str:
+    """make_password, importable by pool workers."""
+    from django.contrib.auth.hashers import make_password
+    return make_password(password)
+
+
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """make_password over a chunk of passwords, importable by pool workers."""
+    return [hash_password(password) for password in passwords]
+
+
+def verify_password(password: str, encoded: str) -> Tuple[bool, bool]:
+    """Whether `password` matches `encoded`, and whether the hash should be upgraded."""
+    from django.contrib.auth.hashers import check_password, identify_hasher
+    if not check_password(password, encoded):
+        return False, False
+    return True, identify_hasher(encoded).must_update(encoded)
+
+
+def hasher_executor(workers: int) -> ProcessPoolExecutor:
+    """
+    Process pool for password hashing. Each worker sets Django up once, which
+    is a no-op where workers are forked from an already configured process.
+    """
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_django,
+        initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', 'recruiting_agent.settings.base'),),
+    )
+
+
+class PasswordHasherPool:
+    """
+    Awaitable password hashing on a lazily started process pool, with
+    backpressure (at most `max_pending` hashes queued or running) and
+    queue depth / latency statistics. Sizes default to the
+    PASSWORD_HASHER_WORKERS and PASSWORD_HASHER_MAX_PENDING settings.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_pending: Optional[int] = None):
+        self._workers = workers
+        self._max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        # Signalled whenever work finishes, for bulk hashing waiting for room
+        self._capacity = threading.Condition(self._lock)
+        self._pending = 0
+        self._peak_pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._latencies = deque(maxlen=LATENCY_SAMPLES)
+
+    @property
+    def workers(self) -> int:
+        return self._workers or settings.PASSWORD_HASHER_WORKERS
+
+    @property
+    def max_pending(self) -> int:
+        return self._max_pending or settings.PASSWORD_HASHER_MAX_PENDING
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = hasher_executor(self.workers)
+        return self._executor
+
+    async def _run(self, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise PasswordHasherBusy("Too many password operations in progress")
+            self._pending += 1
+            self._peak_pending = max(self._peak_pending, self._pending)
+
+        started = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self._finished(1, started)
+
+    def _finished(self, count: int, started: float) -> None:
+        with self._capacity:
+            self._pending -= count
+            self._completed += count
+            self._latencies.append(time.perf_counter() - started)
+            self._capacity.notify_all()
+
+    async def make_password(self, password: str) -> str:
+        """Hash a password on the pool."""
+        return await self._run(hash_password, password)
+
+    async def check_password(self, password: str, encoded: str) -> Tuple[bool, bool]:
+        """Verify a password on the pool; returns (matches, needs_rehash)."""
+        return await self._run(verify_password, password, encoded)
+
+    def hash_many(self, passwords: List[str], chunk_size: int = BULK_CHUNK_SIZE) -> Iterator[str]:
+        """
+        Hash a batch of passwords on the pool, for bulk imports; the hashes
+        are yielded in order. Only one chunk per worker is queued at a time,
+        and the first ones are submitted right away, so the batch starts
+        hashing before the caller consumes it. Queued chunks count against
+        `max_pending`, up to half of it; beyond that, submitting waits.
+        """
+        chunks = (passwords[i:i + chunk_size] for i in range(0, len(passwords), chunk_size))
+        in_flight = deque(self._submit_bulk(chunk) for chunk in itertools.islice(chunks, self.workers))
+        return self._drain(chunks, in_flight)
+
+    def _submit_bulk(self, chunk: List[str]) -> Future:
+        # Half the queue is left to logins; a chunk larger than that waits for an empty queue
+        limit = max(self.max_pending // 2, len(chunk))
+        with self._capacity:
+            self._capacity.wait_for(lambda: self._pending + len(chunk) <= limit)
+            self._pending += len(chunk)
+            self._peak_pending = max(self._peak_pending, self._pending)
+        started = time.perf_counter()
+        try:
+            future = self._get_executor().submit(hash_passwords, chunk)
+        except BaseException:
+            self._finished(len(chunk), started)
+            raise
+        future.add_done_callback(lambda _: self._finished(len(chunk), started))
+        return future
+
+    def _drain(self, chunks: Iterator[List[str]], in_flight: Deque[Future]) -> Iterator[str]:
+        while in_flight:
+            hashes = in_flight.popleft().result()
+            chunk = next(chunks, None)
+            if chunk is not None:
+                in_flight.append(self._submit_bulk(chunk))
+            yield from hashes
+
+    def stats(self) -> dict:
+        """Queue depth, throughput and latency (seconds, recent operations) of the pool."""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            stats = {
+                'workers': self.workers,
+                'max_pending': self.max_pending,
+                'pending': self._pending,
+                'peak_pending': self._peak_pending,
+                'completed': self._completed,
+                'rejected': self._rejected,
+            }
+
+        def percentile(p: float) -> float:
+            return round(latencies[min(int(p * len(latencies)), len(latencies) - 1)], 4) if latencies else 0.0
+
+        stats.update(latency_p50=percentile(0.5), latency_p99=percentile(0.99), latency_max=percentile(1.0))
+        return stats
+
+    def shutdown(self) -> None:
+        """Stop the worker processes; the pool restarts on next use."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasherPool()
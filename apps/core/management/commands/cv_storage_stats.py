@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.core.services import CVStorageService
+
+
+class Command(BaseCommand):
+    help = "Report CV dedup savings and parse cache hit rate."
+
+    def handle(self, *args, **options):
+        for key, value in CVStorageService.get_stats().items():
+            self.stdout.write(f"{key}: {value}")
@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.candidate_import import FORMATS
+from apps.core.services import CandidateService
+
+
+class Command(BaseCommand):
+    help = "Bulk-create candidates and their user accounts from a CSV or NDJSON file."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV or NDJSON file to import.")
+        parser.add_argument(
+            '--format', choices=FORMATS,
+            help="File format (default: guessed from the file name or contents)."
+        )
+        parser.add_argument('--batch-size', type=int, help="Rows per INSERT transaction.")
+        parser.add_argument('--workers', type=int, help="Password hashing processes (default: CANDIDATE_IMPORT_WORKERS).")
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], 'rb') as import_file:
+                result = CandidateService.bulk_import(
+                    import_file,
+                    fmt=options['format'],
+                    filename=options['path'],
+                    batch_size=options['batch_size'],
+                    workers=options['workers'] or settings.CANDIDATE_IMPORT_WORKERS,
+                    max_errors=None
+                )
+        except OSError as e:
+            raise CommandError(str(e))
+
+        for error in result['errors']:
+            self.stderr.write(f"row {error['row']}: {error['error']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result['created']} candidate(s), {result['failed']} row(s) failed"
+        ))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from apps.core.services import InterviewService
+
+
+class Command(BaseCommand):
+    help = "Rebuild the denormalized question/answer counters on interviews."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'interview_ids', nargs='*', type=int,
+            help="Only reconcile these interviews (default: all)."
+        )
+
+    def handle(self, *args, **options):
+        updated = InterviewService.reconcile_counters(options['interview_ids'] or None)
+        self.stdout.write(self.style.SUCCESS(f"Reconciled counters for {updated} interview(s)"))
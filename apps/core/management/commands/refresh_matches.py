@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from apps.core.services import MatchService
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the stored job/candidate matches: for the given jobs or "
+        "candidates, or for every active job when none are given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--job', type=int, action='append', default=[], help="Job posting ID (repeatable)")
+        parser.add_argument('--candidate', type=int, action='append', default=[], help="Candidate ID (repeatable)")
+
+    def handle(self, *args, **options):
+        results = [MatchService.refresh_job_matches(job_id) for job_id in options['job']]
+        results += [MatchService.refresh_candidate_matches(candidate_id) for candidate_id in options['candidate']]
+        if not options['job'] and not options['candidate']:
+            results.append(MatchService.refresh_all())
+
+        upserted = sum(result[0] for result in results)
+        deleted = sum(result[1] for result in results)
+        self.stdout.write(self.style.SUCCESS(f"Matches written: {upserted}, removed: {deleted}"))
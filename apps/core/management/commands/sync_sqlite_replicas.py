@@ -0,0 +1,34 @@
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from apps.core.db_router import replica_aliases
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the SQLite primary database into every SQLite replica configured "
+        "with DB_REPLICAS, to try read-replica routing locally. Run it again to "
+        "let the replicas catch up; until then they lag like a real replica."
+    )
+
+    def handle(self, *args, **options):
+        primary = settings.DATABASES[DEFAULT_DB_ALIAS]
+        if connections[DEFAULT_DB_ALIAS].vendor != 'sqlite':
+            raise CommandError("Only SQLite replicas can be synced locally; PostgreSQL replicas use streaming replication.")
+        if not replica_aliases():
+            raise CommandError("No replicas configured; set DB_REPLICAS to one or more database files.")
+
+        source = sqlite3.connect(primary['NAME'])
+        try:
+            for alias in replica_aliases():
+                target = sqlite3.connect(settings.DATABASES[alias]['NAME'])
+                try:
+                    source.backup(target)
+                finally:
+                    target.close()
+                self.stdout.write(f"{alias}: synced from {primary['NAME']}")
+        finally:
+            source.close()
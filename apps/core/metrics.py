@@ -0,0 +1,445 @@
+"""
+Prometheus-style metrics.
+
+Counters, gauges and histograms aggregate per thread: each thread updates
+its own shard of a metric with plain dict operations, and a scrape adds the
+shards up. A lock is only taken the first time a thread touches a metric
+and while scraping, so recording never contends with other threads.
+
+Celery workers keep their own metrics; with a broker, each worker process
+publishes a snapshot to Redis at most every METRICS_PUSH_INTERVAL seconds,
+and the API's /metrics serves them next to its own with a `worker` label.
+
+What is recorded:
+
+- HTTP: requests, latency and in-flight requests per route, and database
+  queries and time per request (see api.middleware.MetricsMiddleware).
+- Database: every query, through an execute wrapper installed on each
+  connection (connection_created).
+- Celery: task duration per task and outcome, and queue lag - the time
+  between a task becoming due (enqueued, or its countdown elapsed) and a
+  worker starting it.
+- Caches: lookups per cache and result, and the resulting hit ratio.
+"""
+import json
+import logging
+import os
+import socket
+import sys
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from celery.signals import before_task_publish, task_postrun, task_prerun, worker_init
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+Labels = Tuple[str, ...]
+# {'name', 'help', 'type', 'samples': [(sample name, {label: value}, value)]}
+Family = Dict[str, object]
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+TASK_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+class Registry:
+    """The metrics of this process, plus collectors computing samples at scrape time."""
+
+    def __init__(self):
+        self._metrics: List['Metric'] = []
+        self._collectors: List[Callable[[], Iterable[Family]]] = []
+
+    def register(self, metric: 'Metric') -> None:
+        self._metrics.append(metric)
+
+    def add_collector(self, collector: Callable[[], Iterable[Family]]) -> None:
+        self._collectors.append(collector)
+
+    def collect(self, collectors: bool = True) -> List[Family]:
+        families = [metric.collect() for metric in self._metrics]
+        if collectors:
+            for collector in self._collectors:
+                families.extend(collector())
+        return families
+
+
+REGISTRY = Registry()
+
+
+class Metric:
+    """Base class: one shard of label values -> value per thread."""
+
+    type = 'untyped'
+
+    def __init__(self, name: str, help: str, labelnames: Labels = (), registry: Registry = REGISTRY):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, dict]] = []
+        self._retired: dict = {}
+        self._lock = threading.Lock()
+        registry.register(self)
+
+    def _shard(self) -> dict:
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def _merge(self, into: dict, shard: dict) -> None:
+        raise NotImplementedError
+
+    def _totals(self) -> dict:
+        """Sum of every thread's shard; shards of finished threads are folded into one."""
+        with self._lock:
+            live = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    live.append((thread, shard))
+                else:
+                    self._merge(self._retired, shard)
+            self._shards = live
+            totals: dict = {}
+            self._merge(totals, self._retired)
+            for _, shard in live:
+                self._merge(totals, shard)
+        return totals
+
+    def _labels(self, values: Labels) -> Dict[str, str]:
+        return dict(zip(self.labelnames, values))
+
+    def _samples(self, totals: dict) -> list:
+        return [(self.name, self._labels(labels), value) for labels, value in totals.items()]
+
+    def collect(self) -> Family:
+        return {'name': self.name, 'help': self.help, 'type': self.type, 'samples': self._samples(self._totals())}
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0.0) + amount
+
+    def _merge(self, into: dict, shard: dict) -> None:
+        # list() copies in one step, while the owning thread may be adding keys
+        for labels, value in list(shard.items()):
+            into[labels] = into.get(labels, 0.0) + value
+
+    def value(self, *labels: str) -> float:
+        return self._totals().get(labels, 0.0)
+
+
+class Gauge(Counter):
+    """A counter that can go down, e.g. requests in flight."""
+
+    type = 'gauge'
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(Metric):
+    """Observations per bucket (upper bounds `buckets`, plus +Inf), with their sum."""
+
+    type = 'histogram'
+
+    def __init__(self, name: str, help: str, labelnames: Labels = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS, registry: Registry = REGISTRY):
+        super().__init__(name, help, labelnames, registry)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels: str) -> None:
+        shard = self._shard()
+        counts = shard.get(labels)
+        if counts is None:
+            # One slot per bucket, one for +Inf, then the sum
+            counts = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def _merge(self, into: dict, shard: dict) -> None:
+        for labels, counts in list(shard.items()):
+            total = into.setdefault(labels, [0] * (len(self.buckets) + 1) + [0.0])
+            for index, count in enumerate(list(counts)):
+                total[index] += count
+
+    def _samples(self, totals: dict) -> list:
+        samples = []
+        for labels, counts in totals.items():
+            labels = self._labels(labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                samples.append((f'{self.name}_bucket', dict(labels, le=_format_value(bound)), cumulative))
+            samples.append((f'{self.name}_sum', labels, counts[-1]))
+            samples.append((f'{self.name}_count', labels, cumulative))
+        return samples
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def render(families: Iterable[Family]) -> str:
+    """Prometheus text exposition format (0.0.4). Families sharing a name are merged."""
+    merged: Dict[str, Family] = {}
+    for family in families:
+        if family['name'] in merged:
+            merged[family['name']]['samples'] = merged[family['name']]['samples'] + list(family['samples'])
+        else:
+            merged[family['name']] = dict(family)
+    lines = []
+    for family in merged.values():
+        lines.append(f"# HELP {family['name']} {family['help']}")
+        lines.append(f"# TYPE {family['name']} {family['type']}")
+        for name, labels, value in family['samples']:
+            label_text = ','.join(f'{key}="{_escape(label)}"' for key, label in labels.items())
+            lines.append(f'{name}{{{label_text}}} {_format_value(value)}' if label_text else f'{name} {_format_value(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+def stats_collector(prefix: str, help: str, stats: Callable[[], dict]) -> Callable[[], List[Family]]:
+    """
+    Collector exposing a component's stats() dict as gauges named
+    `<prefix>_<key>`. Lists become one sample per index (label `index`);
+    non-numeric values are skipped.
+    """
+    def collect() -> List[Family]:
+        families = []
+        for key, value in stats().items():
+            if isinstance(value, bool):
+                value = int(value)
+            if isinstance(value, (int, float)):
+                samples = [(f'{prefix}_{key}', {}, value)]
+            elif isinstance(value, list):
+                samples = [(f'{prefix}_{key}', {'index': str(index)}, item) for index, item in enumerate(value)]
+            else:
+                continue
+            families.append({'name': f'{prefix}_{key}', 'help': f'{help}: {key}', 'type': 'gauge', 'samples': samples})
+        return families
+    return collect
+
+
+# HTTP (recorded by api.middleware.MetricsMiddleware)
+http_requests = Counter(
+    'http_requests_total', 'HTTP requests by route and status code', ('method', 'route', 'status'))
+http_request_duration = Histogram(
+    'http_request_duration_seconds', 'HTTP request latency', ('method', 'route'))
+http_requests_in_flight = Gauge(
+    'http_requests_in_flight', 'HTTP requests being served')
+http_request_db_queries = Histogram(
+    'http_request_db_queries', 'Database queries per HTTP request', ('route',), buckets=COUNT_BUCKETS)
+http_request_db_duration = Histogram(
+    'http_request_db_duration_seconds', 'Database time per HTTP request', ('route',))
+
+# Database
+db_queries = Counter('db_queries_total', 'Database queries', ('database',))
+db_query_duration = Histogram(
+    'db_query_duration_seconds', 'Database query latency', ('database',), buckets=QUERY_BUCKETS)
+
+# Celery
+task_duration = Histogram(
+    'celery_task_duration_seconds', 'Celery task run time', ('task', 'state'), buckets=TASK_BUCKETS)
+task_queue_lag = Histogram(
+    'celery_task_queue_lag_seconds', 'Time between a Celery task becoming due and starting', ('task',),
+    buckets=TASK_BUCKETS)
+
+# Caches
+cache_requests = Counter('cache_requests_total', 'Cache lookups by result', ('cache', 'result'))
+
+
+def _cache_hit_ratio() -> List[Family]:
+    lookups: Dict[str, List[float]] = {}
+    for (cache, result), count in cache_requests._totals().items():
+        hits_total = lookups.setdefault(cache, [0.0, 0.0])
+        hits_total[1] += count
+        if result != 'miss':
+            hits_total[0] += count
+    samples = [('cache_hit_ratio', {'cache': cache}, hits / total) for cache, (hits, total) in lookups.items() if total]
+    return [{'name': 'cache_hit_ratio', 'help': 'Share of cache lookups that were hits', 'type': 'gauge', 'samples': samples}]
+
+
+REGISTRY.add_collector(_cache_hit_ratio)
+
+
+class DatabaseUsage:
+    """
+    Queries run, and time spent in them, while tracking (see
+    track_db_usage). With `capture`, `statements` also collects
+    (sql, seconds, caller) for each query; it is None otherwise.
+    """
+
+    __slots__ = ('queries', 'seconds', 'statements', 'parent')
+
+    def __init__(self, capture: bool = False, parent: Optional['DatabaseUsage'] = None):
+        self.queries = 0
+        self.seconds = 0.0
+        self.statements: Optional[List[Tuple[str, float, str]]] = [] if capture else None
+        self.parent = parent
+
+
+_db_usage: ContextVar[Optional[DatabaseUsage]] = ContextVar('db_usage', default=None)
+
+
+@contextmanager
+def track_db_usage(capture: bool = False):
+    """
+    Count the enclosed code's queries, and with `capture` collect their SQL.
+    The usage object travels with the context, so queries run through
+    sync_to_async or on AnyIO worker threads on behalf of a request are
+    counted too. Scopes nest: outer scopes count the inner scopes' queries.
+    """
+    usage = DatabaseUsage(capture, parent=_db_usage.get())
+    token = _db_usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _db_usage.reset(token)
+
+
+def _caller() -> str:
+    """The innermost project frame (outside Django and this module) that ran the query."""
+    root = str(settings.BASE_DIR)
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(root) and 'site-packages' not in filename and filename != __file__:
+            return f'{os.path.relpath(filename, root)}:{frame.f_lineno} in {frame.f_code.co_name}'
+        frame = frame.f_back
+    return ''
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper timing every query."""
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        alias = context['connection'].alias
+        db_queries.inc(alias)
+        db_query_duration.observe(elapsed, alias)
+        usage = _db_usage.get()
+        while usage is not None:
+            usage.queries += 1
+            usage.seconds += elapsed
+            if usage.statements is not None:
+                usage.statements.append((sql, elapsed, _caller()))
+            usage = usage.parent
+
+
+def _install_query_recorder(sender, connection, **kwargs):
+    # connection_created fires on every reconnect of the same wrapper
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class WorkerExporter:
+    """Publishes a Celery worker process's metrics to Redis, for the API's /metrics."""
+
+    PREFIX = 'metrics:worker:'
+
+    def __init__(self):
+        self.enabled = False
+        self._client = None
+        self._last_push = 0.0
+
+    @property
+    def client(self):
+        if self._client is None:
+            import redis
+
+            self._client = redis.Redis.from_url(settings.REDIS_URL)
+        return self._client
+
+    def maybe_push(self) -> None:
+        if not self.enabled or time.monotonic() - self._last_push < settings.METRICS_PUSH_INTERVAL:
+            return
+        self._last_push = time.monotonic()
+        worker = f'{socket.gethostname()}:{os.getpid()}'
+        snapshot = json.dumps(REGISTRY.collect(collectors=False))
+        # Expires once the worker has stopped pushing
+        self.client.set(self.PREFIX + worker, snapshot, ex=int(settings.METRICS_PUSH_INTERVAL * 6))
+
+    def collect(self) -> List[Family]:
+        """Every live worker's metrics, labelled with the worker."""
+        from apps.core.task_queue import task_queue
+
+        # Without a broker, tasks run in this process and are counted here
+        if task_queue.local:
+            return []
+        import redis
+
+        try:
+            keys = list(self.client.scan_iter(match=self.PREFIX + '*'))
+            snapshots = self.client.mget(keys) if keys else []
+        except redis.RedisError as e:
+            logger.warning("Could not read worker metrics from Redis: %s", e)
+            return []
+        families = []
+        for key, snapshot in zip(keys, snapshots):
+            if snapshot is None:
+                continue
+            worker = key.decode()[len(self.PREFIX):]
+            for family in json.loads(snapshot):
+                family['samples'] = [(name, dict(labels, worker=worker), value) for name, labels, value in family['samples']]
+                families.append(family)
+        return families
+
+
+worker_exporter = WorkerExporter()
+
+_task_started: Dict[str, float] = {}
+
+
+def _enable_worker_export(**kwargs):
+    worker_exporter.enabled = bool(settings.REDIS_URL)
+
+
+def _stamp_due_time(headers=None, **kwargs):
+    if headers is not None and 'due_at' not in headers:
+        eta = headers.get('eta')
+        headers['due_at'] = datetime.fromisoformat(eta).timestamp() if eta else time.time()
+
+
+def _task_started_at(task_id=None, task=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+    # Custom message headers become request attributes; eager runs keep them in request.headers
+    due_at = getattr(task.request, 'due_at', None) or (task.request.headers or {}).get('due_at')
+    if due_at:
+        task_queue_lag.observe(max(time.time() - due_at, 0.0), task.name)
+
+
+def _task_finished(task_id=None, task=None, state=None, **kwargs):
+    started = _task_started.pop(task_id, None)
+    if started is not None:
+        task_duration.observe(time.perf_counter() - started, task.name, state or 'UNKNOWN')
+    worker_exporter.maybe_push()
+
+
+def install() -> None:
+    """Connect the query, task and cache instrumentation (from CoreConfig.ready)."""
+    connection_created.connect(_install_query_recorder, weak=False, dispatch_uid='metrics.query_recorder')
+    worker_init.connect(_enable_worker_export, weak=False, dispatch_uid='metrics.worker_export')
+    before_task_publish.connect(_stamp_due_time, weak=False, dispatch_uid='metrics.due_time')
+    task_prerun.connect(_task_started_at, weak=False, dispatch_uid='metrics.task_started')
+    task_postrun.connect(_task_finished, weak=False, dispatch_uid='metrics.task_finished')
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_add_interview_questions_support'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['-created_at', '-id'], name='idx_interview_created'),
+        ),
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['candidate', '-created_at', '-id'], name='idx_interview_cand_created'),
+        ),
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['job_posting', '-created_at', '-id'], name='idx_interview_job_created'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='idx_job_status_created'),
+        ),
+        migrations.AddIndex(
+            model_name='jobposting',
+            index=models.Index(fields=['company', '-created_at', '-id'], name='idx_job_company_created'),
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:11
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'skills',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='JobSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_posting', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_links', to='core.jobposting')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_links', to='core.skill')),
+            ],
+            options={
+                'db_table': 'job_skills',
+            },
+        ),
+        migrations.CreateModel(
+            name='CandidateSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_links', to='core.candidate')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='candidate_links', to='core.skill')),
+            ],
+            options={
+                'db_table': 'candidate_skills',
+            },
+        ),
+        migrations.AddField(
+            model_name='candidate',
+            name='canonical_skills',
+            field=models.ManyToManyField(blank=True, related_name='candidates', through='core.CandidateSkill', to='core.skill'),
+        ),
+        migrations.AddField(
+            model_name='jobposting',
+            name='canonical_skills',
+            field=models.ManyToManyField(blank=True, related_name='job_postings', through='core.JobSkill', to='core.skill'),
+        ),
+        migrations.AddIndex(
+            model_name='jobskill',
+            index=models.Index(fields=['skill', 'job_posting'], name='idx_job_skill_skill'),
+        ),
+        migrations.AddConstraint(
+            model_name='jobskill',
+            constraint=models.UniqueConstraint(fields=('job_posting', 'skill'), name='unique_job_skill'),
+        ),
+        migrations.AddIndex(
+            model_name='candidateskill',
+            index=models.Index(fields=['skill', 'candidate'], name='idx_candidate_skill_skill'),
+        ),
+        migrations.AddConstraint(
+            model_name='candidateskill',
+            constraint=models.UniqueConstraint(fields=('candidate', 'skill'), name='unique_candidate_skill'),
+        ),
+    ]
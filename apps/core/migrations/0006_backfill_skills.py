@@ -0,0 +1,46 @@
+# Data migration: populate the normalized skills tables from the JSON skill lists
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+
+def _canonical_names(skills):
+    return {skill.strip().lower() for skill in skills or [] if isinstance(skill, str) and skill.strip()}
+
+
+def _backfill(apps, model_name, skills_field, link_model_name, owner_field):
+    Skill = apps.get_model('core', 'Skill')
+    Owner = apps.get_model('core', model_name)
+    Link = apps.get_model('core', link_model_name)
+    skill_ids = dict(Skill.objects.values_list('name', 'id'))
+
+    rows = Owner.objects.order_by('id').values_list('id', skills_field)
+    batch = []
+    for owner_id, skills in rows.iterator(chunk_size=BATCH_SIZE):
+        names = _canonical_names(skills)
+        missing = [name for name in names if name not in skill_ids]
+        if missing:
+            Skill.objects.bulk_create([Skill(name=name) for name in missing], ignore_conflicts=True)
+            skill_ids.update(Skill.objects.filter(name__in=missing).values_list('name', 'id'))
+        batch.extend(Link(**{owner_field: owner_id, 'skill_id': skill_ids[name]}) for name in names)
+        if len(batch) >= BATCH_SIZE:
+            Link.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        Link.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+def backfill_skills(apps, schema_editor):
+    _backfill(apps, 'Candidate', 'skills', 'CandidateSkill', 'candidate_id')
+    _backfill(apps, 'JobPosting', 'required_skills', 'JobSkill', 'job_posting_id')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_skills'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_skills, migrations.RunPython.noop),
+    ]
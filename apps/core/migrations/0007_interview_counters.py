@@ -0,0 +1,61 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:13
+
+from django.db import migrations, models
+from django.db.models import Count, FloatField, IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Interview = apps.get_model('core', 'Interview')
+    Question = apps.get_model('core', 'Question')
+    Answer = apps.get_model('core', 'Answer')
+
+    def aggregate(queryset, group_by, expression, output_field):
+        return Coalesce(
+            Subquery(
+                queryset.order_by().values(group_by).annotate(total=expression).values('total'),
+                output_field=output_field
+            ),
+            0,
+            output_field=output_field
+        )
+
+    questions = Question.objects.filter(interview=OuterRef('pk'))
+    answers = Answer.objects.filter(question__interview=OuterRef('pk'))
+    Interview.objects.update(
+        question_count=aggregate(questions, 'interview', Count('id'), IntegerField()),
+        answered_count=aggregate(answers, 'question__interview', Count('id'), IntegerField()),
+        score_sum=aggregate(answers, 'question__interview', Sum('score'), FloatField()),
+        scored_count=aggregate(answers, 'question__interview', Count('score'), IntegerField())
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_backfill_skills'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interview',
+            name='answered_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='interview',
+            name='question_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='interview',
+            name='score_sum',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='interview',
+            name='scored_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Full-text search index for job postings (GIN tsvector on PostgreSQL, FTS5 on SQLite)
+from django.db import migrations
+
+from apps.core.search import install_search_index, uninstall_search_index
+
+
+def install(apps, schema_editor):
+    install_search_index(schema_editor.connection)
+
+
+def uninstall(apps, schema_editor):
+    uninstall_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_interview_counters'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
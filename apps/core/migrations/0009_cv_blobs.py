@@ -0,0 +1,52 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:16
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_job_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CVBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('file', models.FileField(max_length=255, upload_to='cvs/')),
+                ('size', models.BigIntegerField()),
+                ('upload_count', models.IntegerField(default=1)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'cv_blobs',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CVParseResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('parser_version', models.IntegerField()),
+                ('parsed_data', models.JSONField(default=dict)),
+                ('hit_count', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('blob', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='parse_results', to='core.cvblob')),
+            ],
+            options={
+                'db_table': 'cv_parse_results',
+            },
+        ),
+        migrations.AddField(
+            model_name='candidate',
+            name='cv_blob',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='candidates', to='core.cvblob'),
+        ),
+        migrations.AddConstraint(
+            model_name='cvparseresult',
+            constraint=models.UniqueConstraint(fields=('blob', 'parser_version'), name='unique_cv_parse_result'),
+        ),
+    ]
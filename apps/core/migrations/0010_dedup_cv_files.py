@@ -0,0 +1,71 @@
+# Data migration: move existing CV uploads into content-addressed storage
+import hashlib
+import logging
+from functools import partial
+
+from django.core.files.storage import default_storage
+from django.db import migrations, transaction
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _digest(path):
+    digest = hashlib.sha256()
+    size = 0
+    with default_storage.open(path, 'rb') as cv_file:
+        for chunk in iter(lambda: cv_file.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+            size += len(chunk)
+    return digest.hexdigest(), size
+
+
+def _delete_files(paths):
+    for path in paths:
+        try:
+            default_storage.delete(path)
+        except OSError as e:
+            logger.warning("Could not delete duplicate CV file %s: %s", path, e)
+
+
+def dedup_cv_files(apps, schema_editor):
+    """
+    Point every candidate at a CVBlob, and delete the duplicate files only
+    once the migration has committed: if it rolls back, the candidates
+    still reference their original files, which must still exist.
+    """
+    Candidate = apps.get_model('core', 'Candidate')
+    CVBlob = apps.get_model('core', 'CVBlob')
+
+    duplicates = []
+    candidates = Candidate.objects.exclude(cv_file='').exclude(cv_file__isnull=True).filter(cv_blob__isnull=True)
+    for candidate in candidates.order_by('id').iterator(chunk_size=500):
+        path = candidate.cv_file.name
+        if not default_storage.exists(path):
+            continue
+
+        sha256, size = _digest(path)
+        blob = CVBlob.objects.filter(sha256=sha256).first()
+        if blob is None:
+            # First copy of this content becomes the stored blob, in place
+            blob = CVBlob.objects.create(sha256=sha256, file=path, size=size, upload_count=1)
+        elif blob.file.name != path:
+            blob.upload_count += 1
+            blob.save(update_fields=['upload_count'])
+            duplicates.append(path)
+
+        Candidate.objects.filter(pk=candidate.pk).update(cv_blob=blob, cv_file=blob.file.name)
+
+    transaction.on_commit(partial(_delete_files, duplicates), using=schema_editor.connection.alias)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_cv_blobs'),
+    ]
+
+    operations = [
+        migrations.RunPython(dedup_cv_files, migrations.RunPython.noop),
+    ]
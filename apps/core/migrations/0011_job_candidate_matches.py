@@ -0,0 +1,35 @@
+# Generated by Django 4.2.7 on 2026-10-18 06:51
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_dedup_cv_files'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobCandidateMatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(validators=[django.core.validators.MinValueValidator(0.0), django.core.validators.MaxValueValidator(100.0)])),
+                ('matched_skills', models.JSONField(default=list)),
+                ('experience_delta', models.IntegerField(default=0)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('candidate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_matches', to='core.candidate')),
+                ('job_posting', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='candidate_matches', to='core.jobposting')),
+            ],
+            options={
+                'db_table': 'job_candidate_matches',
+                'indexes': [models.Index(fields=['job_posting', '-score', 'candidate'], name='idx_match_job_score'), models.Index(fields=['candidate', '-score'], name='idx_match_candidate_score')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='jobcandidatematch',
+            constraint=models.UniqueConstraint(fields=('job_posting', 'candidate'), name='unique_job_candidate_match'),
+        ),
+    ]
@@ -43,13 +43,66 @@ class Company(models.Model):
         return self.company_name
 
 
+class Skill(models.Model):
+    """Canonical (trimmed, lowercase) skill name shared by candidates and job postings."""
+    name = models.CharField(max_length=255, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'skills'
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
+class CVBlob(models.Model):
+    """Content-addressed CV file, stored once per distinct SHA-256 digest."""
+    sha256 = models.CharField(max_length=64, unique=True)
+    file = models.FileField(upload_to='cvs/', max_length=255)
+    size = models.BigIntegerField()
+    upload_count = models.IntegerField(default=1)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'cv_blobs'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return self.sha256
+
+
+class CVParseResult(models.Model):
+    """Cached parse_cv output for one CV content hash and parser version."""
+    blob = models.ForeignKey(CVBlob, on_delete=models.CASCADE, related_name='parse_results')
+    parser_version = models.IntegerField()
+    parsed_data = models.JSONField(default=dict)
+    hit_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'cv_parse_results'
+        constraints = [
+            models.UniqueConstraint(fields=['blob', 'parser_version'], name='unique_cv_parse_result'),
+        ]
+
+    def __str__(self):
+        return f"{self.blob_id} v{self.parser_version}"
+
+
 class Candidate(models.Model):
     """Candidate profile linked to a User with 'candidate' role."""
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='candidate_profile')
     full_name = models.CharField(max_length=255)
     cv_file = models.FileField(upload_to='cvs/', blank=True, null=True)
+    cv_blob = models.ForeignKey(
+        CVBlob, on_delete=models.SET_NULL, related_name='candidates', blank=True, null=True
+    )
     cv_parsed_data = models.JSONField(default=dict, blank=True)
     skills = models.JSONField(default=list, blank=True)
+    canonical_skills = models.ManyToManyField(
+        Skill, through='CandidateSkill', related_name='candidates', blank=True
+    )
     experience_years = models.IntegerField(default=0, validators=[MinValueValidator(0)])
     education = models.TextField(blank=True)
     linkedin_url = models.URLField(blank=True, null=True)
@@ -76,6 +129,9 @@ class JobPosting(models.Model):
     title = models.CharField(max_length=255)
     description = models.TextField()
     required_skills = models.JSONField(default=list)
+    canonical_skills = models.ManyToManyField(
+        Skill, through='JobSkill', related_name='job_postings', blank=True
+    )
     experience_required = models.IntegerField(default=0, validators=[MinValueValidator(0)])
     location = models.CharField(max_length=255, blank=True)
     salary_range = models.CharField(max_length=100, blank=True)
@@ -86,11 +142,75 @@ class JobPosting(models.Model):
     class Meta:
         db_table = 'job_postings'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', '-created_at', '-id'], name='idx_job_status_created'),
+            models.Index(fields=['company', '-created_at', '-id'], name='idx_job_company_created'),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.company.company_name}"
 
 
+class CandidateSkill(models.Model):
+    """Normalized link between a candidate and a skill, kept in sync with Candidate.skills."""
+    candidate = models.ForeignKey(Candidate, on_delete=models.CASCADE, related_name='skill_links')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='candidate_links')
+
+    class Meta:
+        db_table = 'candidate_skills'
+        constraints = [
+            models.UniqueConstraint(fields=['candidate', 'skill'], name='unique_candidate_skill'),
+        ]
+        indexes = [
+            models.Index(fields=['skill', 'candidate'], name='idx_candidate_skill_skill'),
+        ]
+
+    def __str__(self):
+        return f"{self.candidate_id} - {self.skill_id}"
+
+
+class JobSkill(models.Model):
+    """Normalized link between a job posting and a required skill, kept in sync with JobPosting.required_skills."""
+    job_posting = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='skill_links')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='job_links')
+
+    class Meta:
+        db_table = 'job_skills'
+        constraints = [
+            models.UniqueConstraint(fields=['job_posting', 'skill'], name='unique_job_skill'),
+        ]
+        indexes = [
+            models.Index(fields=['skill', 'job_posting'], name='idx_job_skill_skill'),
+        ]
+
+    def __str__(self):
+        return f"{self.job_posting_id} - {self.skill_id}"
+
+
+class JobCandidateMatch(models.Model):
+    """Precomputed skill match between an active job posting and a candidate, maintained by MatchService."""
+    job_posting = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='candidate_matches')
+    candidate = models.ForeignKey(Candidate, on_delete=models.CASCADE, related_name='job_matches')
+    score = models.FloatField(validators=[MinValueValidator(0.0), MaxValueValidator(100.0)])
+    matched_skills = models.JSONField(default=list)
+    # Candidate's experience minus the job's required experience, in years
+    experience_delta = models.IntegerField(default=0)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'job_candidate_matches'
+        constraints = [
+            models.UniqueConstraint(fields=['job_posting', 'candidate'], name='unique_job_candidate_match'),
+        ]
+        indexes = [
+            models.Index(fields=['job_posting', '-score', 'candidate'], name='idx_match_job_score'),
+            models.Index(fields=['candidate', '-score'], name='idx_match_candidate_score'),
+        ]
+
+    def __str__(self):
+        return f"{self.job_posting_id} - {self.candidate_id}: {self.score}"
+
+
 class Interview(models.Model):
     """Interview sessions between candidates and the intelligent agent."""
     STATUS_CHOICES = [
@@ -115,6 +235,11 @@ class Interview(models.Model):
     )
     questions_data = models.JSONField(default=list, blank=True)
     answers_data = models.JSONField(default=list, blank=True)
+    # Denormalized answer accounting, maintained with F() updates by InterviewService
+    question_count = models.IntegerField(default=0)
+    answered_count = models.IntegerField(default=0)
+    score_sum = models.FloatField(default=0.0)
+    scored_count = models.IntegerField(default=0)
     agent_recommendation = models.TextField(blank=True)
     started_at = models.DateTimeField(null=True, blank=True)
     completed_at = models.DateTimeField(null=True, blank=True)
@@ -127,6 +252,9 @@ class Interview(models.Model):
         indexes = [
             models.Index(fields=['status', 'job_posting']),
             models.Index(fields=['candidate', 'status']),
+            models.Index(fields=['-created_at', '-id'], name='idx_interview_created'),
+            models.Index(fields=['candidate', '-created_at', '-id'], name='idx_interview_cand_created'),
+            models.Index(fields=['job_posting', '-created_at', '-id'], name='idx_interview_job_created'),
         ]
 
     def __str__(self):
@@ -152,6 +280,12 @@ class Question(models.Model):
     class Meta:
         db_table = 'questions'
         ordering = ['interview', 'order']
+        constraints = [
+            models.UniqueConstraint(fields=['interview', 'order'], name='unique_interview_question_order'),
+        ]
+        indexes = [
+            models.Index(fields=['interview', 'order'], name='idx_question_interview_order'),
+        ]
 
     def __str__(self):
         return f"Q{self.order}: {self.question_text[:50]}..."
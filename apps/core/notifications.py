@@ -0,0 +1,208 @@
+"""
+Batched user notifications.
+
+notify() only buffers messages. Messages for the same user and channel that
+arrive within NOTIFICATION_WINDOW seconds are coalesced into one
+notification, and a single flush hands the buffer to the transport in
+batches of NOTIFICATION_BATCH_SIZE - one Celery task per batch, sent as a
+group - instead of one task per recipient.
+
+The buffer lives in Redis when REDIS_URL is set, so every process feeds the
+same flush. Without Redis it is per process, and so is the flush (see
+apps.core.task_queue).
+"""
+import json
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, Protocol, Tuple
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+Notification = Dict[str, object]
+
+# How long past its window a flush claim is held before it counts as lost
+FLUSH_CLAIM_GRACE = 60.0
+
+
+class NotificationTransport(Protocol):
+    """Delivers batches of coalesced notifications: {'user_id', 'channel', 'messages'}."""
+
+    def send_batch(self, notifications: List[Notification]) -> int:
+        """Deliver a batch; returns the number of notifications sent."""
+        ...
+
+
+class ConsoleTransport:
+    """
+    Prints notifications; stands in until an email/SMS provider is integrated.
+    Implements NotificationTransport, as do the transports below.
+    """
+
+    def send_batch(self, notifications: List[Notification]) -> int:
+        for notification in notifications:
+            print(
+                f"Notification to user {notification['user_id']} ({notification['channel']}): "
+                + " | ".join(notification['messages'])
+            )
+        return len(notifications)
+
+
+class FileTransport:
+    """Appends notifications as JSON lines to NOTIFICATION_FILE_PATH, for local development."""
+
+    _lock = threading.Lock()
+
+    def send_batch(self, notifications: List[Notification]) -> int:
+        lines = ''.join(json.dumps(notification) + '\n' for notification in notifications)
+        with self._lock, open(settings.NOTIFICATION_FILE_PATH, 'a', encoding='utf-8') as log:
+            log.write(lines)
+        return len(notifications)
+
+
+class MemoryTransport:
+    """Keeps every batch in memory, for tests."""
+
+    def __init__(self):
+        self.batches: List[List[Notification]] = []
+
+    def send_batch(self, notifications: List[Notification]) -> int:
+        self.batches.append(list(notifications))
+        return len(notifications)
+
+    @property
+    def sent(self) -> List[Notification]:
+        return [notification for batch in self.batches for notification in batch]
+
+
+@lru_cache(maxsize=None)
+def get_transport() -> NotificationTransport:
+    """The transport configured by NOTIFICATION_TRANSPORT (a dotted class path)."""
+    return import_string(settings.NOTIFICATION_TRANSPORT)()
+
+
+def coalesce(messages: Iterable[Notification]) -> List[Notification]:
+    """One notification per (user, channel), carrying its messages in arrival order."""
+    grouped: Dict[Tuple[int, str], Notification] = {}
+    for message in messages:
+        key = (message['user_id'], message['channel'])
+        if key not in grouped:
+            grouped[key] = {'user_id': message['user_id'], 'channel': message['channel'], 'messages': []}
+        if message['message'] not in grouped[key]['messages']:
+            grouped[key]['messages'].append(message['message'])
+    return list(grouped.values())
+
+
+class LocalBuffer:
+    """In-process message buffer."""
+
+    def __init__(self):
+        self._messages = deque()
+        self._lock = threading.Lock()
+        # monotonic() deadline of the scheduled flush's claim, or None
+        self._flush_claim_expires = None
+
+    def push(self, messages: List[Notification]) -> None:
+        with self._lock:
+            self._messages.extend(messages)
+
+    def claim_flush(self, window: float) -> bool:
+        """
+        True for the first caller after a flush; it schedules the next one.
+        As with RedisBuffer, the claim lapses `window` plus FLUSH_CLAIM_GRACE
+        seconds on, so a flush that never ran does not stop all later ones.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if self._flush_claim_expires is not None and now < self._flush_claim_expires:
+                return False
+            self._flush_claim_expires = now + window + FLUSH_CLAIM_GRACE
+            return True
+
+    def drain(self) -> List[Notification]:
+        with self._lock:
+            self._flush_claim_expires = None
+            messages, self._messages = list(self._messages), deque()
+            return messages
+
+
+class RedisBuffer:
+    """Message buffer shared by every process through a Redis list."""
+
+    KEY = 'notifications:pending'
+    FLUSH_KEY = 'notifications:flush'
+
+    def __init__(self, url: str):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+
+    def push(self, messages: List[Notification]) -> None:
+        if messages:
+            self.client.rpush(self.KEY, *(json.dumps(message) for message in messages))
+
+    def claim_flush(self, window: float) -> bool:
+        # Expires on its own if the flush task is lost
+        return bool(self.client.set(self.FLUSH_KEY, 1, nx=True, px=int((window + FLUSH_CLAIM_GRACE) * 1000)))
+
+    def drain(self) -> List[Notification]:
+        # Release the claim first: messages pushed from now on schedule a new flush
+        self.client.delete(self.FLUSH_KEY)
+        pipeline = self.client.pipeline(transaction=True)
+        pipeline.lrange(self.KEY, 0, -1)
+        pipeline.delete(self.KEY)
+        raw, _ = pipeline.execute()
+        return [json.loads(message) for message in raw]
+
+
+class NotificationDispatcher:
+    """Buffers, coalesces and batches notifications (see module docstring)."""
+
+    def __init__(self):
+        self._buffer = None
+        self._lock = threading.Lock()
+
+    @property
+    def buffer(self):
+        if self._buffer is None:
+            with self._lock:
+                if self._buffer is None:
+                    self._buffer = RedisBuffer(settings.REDIS_URL) if settings.REDIS_URL else LocalBuffer()
+        return self._buffer
+
+    def notify(self, user_ids: Iterable[int], message: str, channel: str = 'email') -> int:
+        """Queue `message` for every user; returns the number of recipients."""
+        messages = [{'user_id': user_id, 'channel': channel, 'message': message} for user_id in user_ids]
+        if not messages:
+            return 0
+        self.buffer.push(messages)
+        if self.buffer.claim_flush(settings.NOTIFICATION_WINDOW):
+            self._schedule_flush()
+        return len(messages)
+
+    def _schedule_flush(self) -> None:
+        from apps.core.task_queue import task_queue
+        from apps.core.tasks import flush_notifications
+        task_queue.enqueue(flush_notifications, countdown=settings.NOTIFICATION_WINDOW)
+
+    def flush(self) -> int:
+        """
+        Deliver everything buffered so far, coalesced per user and channel.
+        A single batch is sent right away; more are fanned out as one Celery
+        group. Returns the number of notifications.
+        """
+        notifications = coalesce(self.buffer.drain())
+        size = settings.NOTIFICATION_BATCH_SIZE
+        batches = [notifications[start:start + size] for start in range(0, len(notifications), size)]
+        if len(batches) == 1:
+            get_transport().send_batch(batches[0])
+        elif batches:
+            from celery import group
+            from apps.core.tasks import deliver_notifications
+            group(deliver_notifications.s(batch) for batch in batches).apply_async()
+        return len(notifications)
+
+
+notification_dispatcher = NotificationDispatcher()
@@ -0,0 +1,148 @@
+"""
+Full-text search over job postings.
+
+PostgreSQL keeps a weighted `search_vector` tsvector as a stored generated
+column on job_postings, with a GIN index. SQLite (the local/dev database)
+keeps an external-content FTS5 table maintained by triggers. Both are
+created by migration 0008 and re-checked after every migrate, because
+SQLite drops triggers whenever Django rebuilds the job_postings table.
+"""
+import re
+from typing import List, Optional, Tuple
+
+# Relative weights: title > skills > location > description
+_PG_SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(required_skills::text, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(location, '')), 'C') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'D')"
+)
+
+_PG_INSTALL = [
+    f"ALTER TABLE job_postings ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    f"GENERATED ALWAYS AS ({_PG_SEARCH_VECTOR}) STORED",
+    "CREATE INDEX IF NOT EXISTS idx_job_search_vector ON job_postings USING GIN (search_vector)",
+]
+
+_PG_UNINSTALL = [
+    "DROP INDEX IF EXISTS idx_job_search_vector",
+    "ALTER TABLE job_postings DROP COLUMN IF EXISTS search_vector",
+]
+
+_SQLITE_COLUMNS = "title, description, location, required_skills"
+
+# Ranked matches looked up per result wanted, before falling back to all of them
+_SQLITE_OVERFETCH = 4
+
+_SQLITE_TRIGGERS = {
+    'job_postings_fts_ai': f"""
+        CREATE TRIGGER IF NOT EXISTS job_postings_fts_ai AFTER INSERT ON job_postings BEGIN
+            INSERT INTO job_postings_fts(rowid, {_SQLITE_COLUMNS})
+            VALUES (new.id, new.title, new.description, new.location, new.required_skills);
+        END""",
+    'job_postings_fts_ad': f"""
+        CREATE TRIGGER IF NOT EXISTS job_postings_fts_ad AFTER DELETE ON job_postings BEGIN
+            INSERT INTO job_postings_fts(job_postings_fts, rowid, {_SQLITE_COLUMNS})
+            VALUES ('delete', old.id, old.title, old.description, old.location, old.required_skills);
+        END""",
+    'job_postings_fts_au': f"""
+        CREATE TRIGGER IF NOT EXISTS job_postings_fts_au
+        AFTER UPDATE OF {_SQLITE_COLUMNS} ON job_postings BEGIN
+            INSERT INTO job_postings_fts(job_postings_fts, rowid, {_SQLITE_COLUMNS})
+            VALUES ('delete', old.id, old.title, old.description, old.location, old.required_skills);
+            INSERT INTO job_postings_fts(rowid, {_SQLITE_COLUMNS})
+            VALUES (new.id, new.title, new.description, new.location, new.required_skills);
+        END""",
+}
+
+_SQLITE_UNINSTALL = [
+    *[f"DROP TRIGGER IF EXISTS {name}" for name in _SQLITE_TRIGGERS],
+    "DROP TABLE IF EXISTS job_postings_fts",
+]
+
+
+def install_search_index(connection) -> None:
+    """Create the job search index for this database if it is missing."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            for sql in _PG_INSTALL:
+                cursor.execute(sql)
+        elif connection.vendor == 'sqlite':
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger') AND name LIKE %s",
+                ['job_postings_fts%']
+            )
+            existing = {row[0] for row in cursor.fetchall()}
+            if 'job_postings_fts' in existing and existing.issuperset(_SQLITE_TRIGGERS):
+                return
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS job_postings_fts USING fts5("
+                f"{_SQLITE_COLUMNS}, content='job_postings', content_rowid='id')"
+            )
+            for sql in _SQLITE_TRIGGERS.values():
+                cursor.execute(sql)
+            # Rows written while the triggers were missing are not indexed yet
+            cursor.execute("INSERT INTO job_postings_fts(job_postings_fts) VALUES ('rebuild')")
+
+
+def uninstall_search_index(connection) -> None:
+    """Drop the job search index for this database."""
+    statements = {'postgresql': _PG_UNINSTALL, 'sqlite': _SQLITE_UNINSTALL}.get(connection.vendor, [])
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def _fts5_query(text: str) -> str:
+    """Turn free text into a safe FTS5 query: every word must match, the last one as a prefix."""
+    terms = [f'"{term}"' for term in re.findall(r'\w+', text)]
+    if terms:
+        terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def search_job_ids(connection, text: str, status: str, limit: int) -> Optional[List[Tuple[int, float]]]:
+    """
+    Return (job_id, rank) pairs for postings matching `text`, best match first.
+    Higher rank is better. Returns None if this database has no search index.
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                "SELECT id, ts_rank_cd(search_vector, query) AS rank "
+                "FROM job_postings, websearch_to_tsquery('english', %s) AS query "
+                "WHERE search_vector @@ query AND status = %s "
+                "ORDER BY rank DESC, id DESC LIMIT %s",
+                [text, status, limit]
+            )
+        elif connection.vendor == 'sqlite':
+            query = _fts5_query(text)
+            if not query:
+                return []
+            # bm25() is lower-is-better; weights follow the column order above.
+            # Matches are ranked inside the FTS table and only the best few
+            # are joined for their status, since looking up every match of a
+            # common term costs as much as ranking them. If too few of those
+            # have the status, rank again without the cap (LIMIT -1) - unless
+            # the cap already covered every match, counted by `matched`.
+            # Matches without the status come last, with a NULL id.
+            for fetch in (limit * _SQLITE_OVERFETCH, -1):
+                cursor.execute(
+                    "SELECT j.id, -f.score AS rank, f.matched FROM ("
+                    "SELECT rowid, score, COUNT(*) OVER () AS matched FROM ("
+                    "SELECT rowid, bm25(job_postings_fts, 10.0, 1.0, 2.0, 5.0) AS score "
+                    "FROM job_postings_fts WHERE job_postings_fts MATCH %s "
+                    "ORDER BY score, rowid DESC LIMIT %s"
+                    ")) f LEFT JOIN job_postings j ON j.id = f.rowid AND j.status = %s "
+                    "ORDER BY j.id IS NULL, rank DESC, j.id DESC LIMIT %s",
+                    [query, fetch, status, limit]
+                )
+                rows = cursor.fetchall()
+                matched = rows[0][2] if rows else 0
+                rows = [row for row in rows if row[0] is not None]
+                if len(rows) == limit or matched < fetch:
+                    break
+            return [(row[0], float(row[1])) for row in rows]
+        else:
+            return None
+        return [(row[0], float(row[1])) for row in cursor.fetchall()]
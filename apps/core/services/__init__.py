@@ -1,15 +1,21 @@
 from .base import BaseService
+from .skill_service import SkillService
+from .cv_storage_service import CVStorageService
 from .user_service import UserService
 from .company_service import CompanyService
 from .candidate_service import CandidateService
 from .job_service import JobService
 from .interview_service import InterviewService
+from .match_service import MatchService
 
 __all__ = [
     'BaseService',
+    'SkillService',
+    'CVStorageService',
     'UserService',
     'CompanyService',
     'CandidateService',
     'JobService',
     'InterviewService',
+    'MatchService',
 ]
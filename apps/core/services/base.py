@@ -1,5 +1,24 @@
-from typing import Optional, List, Dict, Any
-from django.db.models import Model, QuerySet
+import base64
+from datetime import datetime
+from typing import Optional, List, Dict, Any, Tuple
+from django.db.models import Model, QuerySet, Q
+from apps.core.db_router import REPLICA_HINT
+
+
+def encode_cursor(obj: Model) -> str:
+    """Encode an object's (created_at, id) keyset position as an opaque cursor."""
+    raw = f"{obj.created_at.isoformat()}|{obj.pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by encode_cursor. Raises ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        created_at, obj_id = raw.rsplit('|', 1)
+        return datetime.fromisoformat(created_at), int(obj_id)
+    except (TypeError, UnicodeDecodeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
 
 
 class BaseService:
@@ -7,9 +26,26 @@ class BaseService:
     
     model: Model = None
     
+    @classmethod
+    def read_queryset(cls) -> QuerySet:
+        """
+        All objects, for reads that may be served by a read replica during an
+        API request (see apps.core.db_router). Never use it to load objects
+        that are modified and saved: a replica can lag behind the primary.
+        """
+        return cls.model.objects.db_manager(hints={REPLICA_HINT: True}).all()
+    
     @classmethod
     def get_by_id(cls, obj_id: int) -> Optional[Model]:
-        """Retrieve an object by ID."""
+        """Retrieve an object by ID, possibly from a read replica."""
+        try:
+            return cls.read_queryset().get(id=obj_id)
+        except cls.model.DoesNotExist:
+            return None
+    
+    @classmethod
+    def get_for_write(cls, obj_id: int) -> Optional[Model]:
+        """Retrieve an object by ID from the primary database, to modify it."""
         try:
             return cls.model.objects.get(id=obj_id)
         except cls.model.DoesNotExist:
@@ -17,12 +53,45 @@ class BaseService:
     
     @classmethod
     def get_all(cls, filters: Optional[Dict[str, Any]] = None) -> QuerySet:
-        """Retrieve all objects with optional filters."""
-        queryset = cls.model.objects.all()
+        """Retrieve all objects with optional filters, possibly from a read replica."""
+        queryset = cls.read_queryset()
         if filters:
             queryset = queryset.filter(**filters)
         return queryset
     
+    @classmethod
+    def _keyset_page(cls, queryset: QuerySet, cursor: Optional[str], limit: int) -> QuerySet:
+        """Slice a queryset to the page after `cursor`, newest first, plus one lookahead row."""
+        queryset = queryset.order_by('-created_at', '-id')
+        if cursor:
+            created_at, obj_id = decode_cursor(cursor)
+            queryset = queryset.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=obj_id)
+            )
+        return queryset[:limit + 1]
+    
+    @classmethod
+    def _keyset_result(cls, objs: List[Model], limit: int) -> Tuple[List[Model], Optional[str]]:
+        """Trim the lookahead row and compute the cursor for the next page."""
+        if len(objs) > limit:
+            objs = objs[:limit]
+            return objs, encode_cursor(objs[-1])
+        return objs, None
+    
+    @classmethod
+    def paginate(cls, queryset: QuerySet, cursor: Optional[str] = None,
+                 limit: int = 50) -> Tuple[List[Model], Optional[str]]:
+        """Return one keyset page of `queryset` ordered by (created_at, id) and the next cursor."""
+        objs = list(cls._keyset_page(queryset, cursor, limit))
+        return cls._keyset_result(objs, limit)
+    
+    @classmethod
+    async def apaginate(cls, queryset: QuerySet, cursor: Optional[str] = None,
+                        limit: int = 50) -> Tuple[List[Model], Optional[str]]:
+        """Async variant of paginate."""
+        objs = [obj async for obj in cls._keyset_page(queryset, cursor, limit)]
+        return cls._keyset_result(objs, limit)
+    
     @classmethod
     def create(cls, **data) -> Model:
         """Create a new object."""
@@ -31,7 +100,7 @@ class BaseService:
     @classmethod
     def update(cls, obj_id: int, **data) -> Optional[Model]:
         """Update an existing object."""
-        obj = cls.get_by_id(obj_id)
+        obj = cls.get_for_write(obj_id)
         if obj:
             for key, value in data.items():
                 setattr(obj, key, value)
@@ -41,8 +110,53 @@ class BaseService:
     @classmethod
     def delete(cls, obj_id: int) -> bool:
         """Delete an object by ID."""
-        obj = cls.get_by_id(obj_id)
+        obj = cls.get_for_write(obj_id)
         if obj:
             obj.delete()
             return True
         return False
+
+    @classmethod
+    async def aget_by_id(cls, obj_id: int) -> Optional[Model]:
+        """Retrieve an object by ID using the async ORM, possibly from a read replica."""
+        try:
+            return await cls.read_queryset().aget(id=obj_id)
+        except cls.model.DoesNotExist:
+            return None
+    
+    @classmethod
+    async def aget_for_write(cls, obj_id: int) -> Optional[Model]:
+        """Retrieve an object by ID from the primary database using the async ORM."""
+        try:
+            return await cls.model.objects.aget(id=obj_id)
+        except cls.model.DoesNotExist:
+            return None
+    
+    @classmethod
+    async def aget_all(cls, filters: Optional[Dict[str, Any]] = None) -> List[Model]:
+        """Retrieve all objects with optional filters using the async ORM."""
+        return [obj async for obj in cls.get_all(filters)]
+    
+    @classmethod
+    async def acreate(cls, **data) -> Model:
+        """Create a new object using the async ORM."""
+        return await cls.model.objects.acreate(**data)
+    
+    @classmethod
+    async def aupdate(cls, obj_id: int, **data) -> Optional[Model]:
+        """Update an existing object using the async ORM."""
+        obj = await cls.aget_for_write(obj_id)
+        if obj:
+            for key, value in data.items():
+                setattr(obj, key, value)
+            await obj.asave()
+        return obj
+    
+    @classmethod
+    async def adelete(cls, obj_id: int) -> bool:
+        """Delete an object by ID using the async ORM."""
+        obj = await cls.aget_for_write(obj_id)
+        if obj:
+            await obj.adelete()
+            return True
+        return False
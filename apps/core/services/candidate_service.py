@@ -1,6 +1,13 @@
-from typing import Optional
+from typing import Callable, Iterator, List, Optional, Tuple
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from apps.core.candidate_import import detect_format, iter_records
+from apps.core.hashing import PasswordHasherPool, password_hasher
 from apps.core.models import Candidate, User
 from .base import BaseService
+from .match_service import MatchService
+from .skill_service import SkillService, normalize_skill
 
 
 class CandidateService(BaseService):
@@ -9,6 +16,7 @@ class CandidateService(BaseService):
     model = Candidate
     
     @classmethod
+    @transaction.atomic
     def create_candidate_with_user(cls, username: str, email: str, password: str,
                                     full_name: str, **candidate_data) -> Candidate:
         """Create a candidate profile along with its user account."""
@@ -26,8 +34,157 @@ class CandidateService(BaseService):
             full_name=full_name,
             **candidate_data
         )
+        SkillService.sync_candidate_skills(candidate)
+        MatchService.schedule_candidate_refresh(candidate.id)
         return candidate
     
+    @classmethod
+    def bulk_import(cls, fileobj, fmt: str = None, filename: str = '', batch_size: int = None,
+                    workers: int = None, max_errors: Optional[int] = 1000) -> dict:
+        """
+        Create candidates and their user accounts from a CSV or NDJSON file.
+        Rows are inserted in batches, each in one transaction; a bad row is
+        reported in `errors` (at most `max_errors` of them) and skipped
+        without affecting the rest of its batch. ValueError is raised only for
+        a file that cannot be read at all, before anything is inserted. The
+        new candidates' matches are computed afterwards, by one background
+        task. Passwords are hashed on the shared password hasher pool, or on
+        a pool of `workers` processes started for this import.
+        """
+        batch_size = batch_size or settings.CANDIDATE_IMPORT_BATCH_SIZE
+        fmt = fmt or detect_format(fileobj, filename)
+        result = {'created': 0, 'failed': 0, 'errors': []}
+        created_ids = []
+        
+        def fail(row: int, error: str) -> None:
+            result['failed'] += 1
+            if max_errors is None or len(result['errors']) < max_errors:
+                result['errors'].append({'row': row, 'error': error})
+        
+        # Processes serving requests share the password hashing pool; a
+        # standalone import (see the import_candidates command) gets its own
+        pool = PasswordHasherPool(workers=workers) if workers else password_hasher
+        try:
+            pending = None
+            for batch in cls._iter_import_batches(fileobj, fmt, batch_size, fail):
+                # Hash this batch on the pool while the previous one is inserted
+                hashes = pool.hash_many([fields['password'] for _, fields in batch])
+                if pending:
+                    created_ids += cls._insert_import_batch(*pending, fail)
+                pending = (batch, hashes)
+            if pending:
+                created_ids += cls._insert_import_batch(*pending, fail)
+        finally:
+            if pool is not password_hasher:
+                pool.shutdown()
+            # Batches inserted before an error stay, so they get their matches too
+            MatchService.schedule_candidate_batch_refresh(created_ids)
+        
+        result['created'] = len(created_ids)
+        result['errors'].sort(key=lambda error: error['row'])
+        return result
+    
+    @classmethod
+    def _iter_import_batches(cls, fileobj, fmt: str, batch_size: int,
+                             fail: Callable[[int, str], None]) -> Iterator[List[Tuple[int, dict]]]:
+        """
+        Valid (row, fields) records in batches, minus usernames that are taken.
+        A file that becomes unreadable partway (e.g. invalid UTF-8) ends the
+        import there with an error on the next row; earlier batches stand.
+        """
+        seen = set()
+        batch = []
+        row = 0
+        try:
+            for row, fields, error in iter_records(fileobj, fmt):
+                if error:
+                    fail(row, error)
+                elif fields['username'] in seen:
+                    fail(row, f"duplicate username in file: {fields['username']}")
+                else:
+                    seen.add(fields['username'])
+                    batch.append((row, fields))
+                    if len(batch) >= batch_size:
+                        yield cls._drop_existing_users(batch, fail)
+                        batch = []
+        except ValueError as e:
+            if not row:
+                # Nothing read yet: the whole file is rejected
+                raise
+            fail(row + 1, f"file unreadable from this row on, rest of the import skipped: {e}")
+        if batch:
+            yield cls._drop_existing_users(batch, fail)
+    
+    @classmethod
+    def _drop_existing_users(cls, batch: List[Tuple[int, dict]],
+                             fail: Callable[[int, str], None]) -> List[Tuple[int, dict]]:
+        taken = set(User.objects.filter(
+            username__in=[fields['username'] for _, fields in batch]
+        ).values_list('username', flat=True))
+        for row, fields in batch:
+            if fields['username'] in taken:
+                fail(row, f"username already exists: {fields['username']}")
+        return [(row, fields) for row, fields in batch if fields['username'] not in taken]
+    
+    @classmethod
+    def _insert_import_batch(cls, batch: List[Tuple[int, dict]], hashes: Iterator[str],
+                             fail: Callable[[int, str], None]) -> List[int]:
+        """
+        Insert one batch in a transaction, falling back to row by row if any
+        row conflicts. Returns the IDs of the candidates created.
+        """
+        passwords = list(hashes)
+        try:
+            with transaction.atomic():
+                return cls._bulk_insert([fields for _, fields in batch], passwords)
+        except IntegrityError:
+            pass
+        
+        # Something was written since the batch was checked; isolate the bad rows
+        created = []
+        for (row, fields), password in zip(batch, passwords):
+            try:
+                with transaction.atomic():
+                    created += cls._bulk_insert([fields], [password])
+            except IntegrityError as e:
+                fail(row, f"could not be inserted: {e}")
+        return created
+    
+    @classmethod
+    def _bulk_insert(cls, rows: List[dict], passwords: List[str]) -> List[int]:
+        users = User.objects.bulk_create([
+            User(username=fields['username'], email=fields['email'], password=password, role='candidate')
+            for fields, password in zip(rows, passwords)
+        ])
+        if any(user.pk is None for user in users):
+            # Backend cannot return IDs from a bulk INSERT
+            ids = dict(User.objects.filter(
+                username__in=[user.username for user in users]
+            ).values_list('username', 'id'))
+            for user in users:
+                user.pk = ids[user.username]
+        
+        candidates = cls.model.objects.bulk_create([
+            cls.model(
+                user=user,
+                full_name=fields['full_name'],
+                skills=fields['skills'],
+                experience_years=fields['experience_years'],
+                education=fields['education'],
+                linkedin_url=fields['linkedin_url']
+            )
+            for user, fields in zip(users, rows)
+        ])
+        if any(candidate.pk is None for candidate in candidates):
+            ids = dict(cls.model.objects.filter(
+                user_id__in=[user.pk for user in users]
+            ).values_list('user_id', 'id'))
+            for candidate in candidates:
+                candidate.pk = ids[candidate.user_id]
+        
+        SkillService.link_new_candidates(candidates)
+        return [candidate.pk for candidate in candidates]
+    
     @classmethod
     def get_by_user_id(cls, user_id: int) -> Optional[Candidate]:
         """Get candidate profile by user ID."""
@@ -37,14 +194,102 @@ class CandidateService(BaseService):
             return None
     
     @classmethod
-    def update_cv(cls, candidate_id: int, cv_file, parsed_data: dict = None) -> Optional[Candidate]:
-        """Update candidate's CV and parsed data."""
-        candidate = cls.get_by_id(candidate_id)
+    async def aget_by_user_id(cls, user_id: int) -> Optional[Candidate]:
+        """Get candidate profile by user ID using the async ORM."""
+        try:
+            return await cls.model.objects.aget(user_id=user_id)
+        except cls.model.DoesNotExist:
+            return None
+    
+    @classmethod
+    @transaction.atomic
+    def update(cls, obj_id: int, **data) -> Optional[Candidate]:
+        """Update a candidate profile and invalidate its owner's cached principal."""
+        from .user_service import UserService
+        
+        candidate = super().update(obj_id, **data)
+        if candidate:
+            if 'skills' in data:
+                SkillService.sync_candidate_skills(candidate)
+            if 'skills' in data or 'experience_years' in data:
+                MatchService.schedule_candidate_refresh(candidate.id)
+            UserService.invalidate_principal(candidate.user_id)
+        return candidate
+    
+    @classmethod
+    def attach_cv(cls, candidate: Candidate, cv_file, filename: str = None) -> Candidate:
+        """Point a candidate at the content-addressed copy of an uploaded CV (not saved)."""
+        from .cv_storage_service import CVStorageService
+        
+        filename = filename or getattr(cv_file, 'name', '') or ''
+        blob = CVStorageService.store(cv_file, filename=filename)
+        candidate.cv_blob = blob
+        candidate.cv_file = blob.file.name
+        return candidate
+    
+    @classmethod
+    def schedule_cv_parse(cls, candidate: Candidate) -> None:
+        """Parse a candidate's CV in the background once the transaction commits."""
+        from apps.core.task_queue import task_queue
+        from apps.core.tasks import parse_cv_async
+        
+        # Per candidate: each upload of the same file still has to reach its candidate
+        key = f"cv-parse:{candidate.id}:{candidate.cv_blob.sha256}"
+        transaction.on_commit(lambda: task_queue.enqueue(parse_cv_async, candidate.id, key=key))
+    
+    @classmethod
+    @transaction.atomic
+    def update_cv(cls, candidate_id: int, cv_file, parsed_data: dict = None,
+                  filename: str = None) -> Optional[Candidate]:
+        """
+        Update candidate's CV. Unless `parsed_data` is given, the CV is parsed
+        in the background (parse_cv_async) once stored.
+        """
+        from .user_service import UserService
+        
+        candidate = cls.get_for_write(candidate_id)
         if candidate:
-            candidate.cv_file = cv_file
+            cls.attach_cv(candidate, cv_file, filename=filename)
             if parsed_data:
                 candidate.cv_parsed_data = parsed_data
             candidate.save()
+            if not parsed_data:
+                cls.schedule_cv_parse(candidate)
+            UserService.invalidate_principal(candidate.user_id)
+        return candidate
+    
+    @classmethod
+    @transaction.atomic
+    def apply_parsed_cv(cls, candidate: Candidate, parsed_data: dict) -> Candidate:
+        """
+        Store CV parse results on a candidate with a single UPDATE. Parsed skills
+        are added to the existing ones; experience and education are only
+        overwritten when the CV provided them.
+        A failed parse is stored as is and extracts nothing, so it changes
+        nothing else.
+        """
+        from .user_service import UserService
+        
+        known = {normalize_skill(skill) for skill in candidate.skills}
+        candidate.skills = candidate.skills + [
+            skill for skill in parsed_data.get('skills', []) if normalize_skill(skill) not in known
+        ]
+        candidate.cv_parsed_data = parsed_data
+        if parsed_data.get('experience_years') is not None:
+            candidate.experience_years = parsed_data['experience_years']
+        if parsed_data.get('education'):
+            candidate.education = parsed_data['education']
+        candidate.updated_at = timezone.now()
+        
+        cls.model.objects.filter(pk=candidate.pk).update(
+            skills=candidate.skills,
+            cv_parsed_data=candidate.cv_parsed_data,
+            experience_years=candidate.experience_years,
+            education=candidate.education,
+            updated_at=candidate.updated_at
+        )
+        SkillService.sync_candidate_skills(candidate)
+        UserService.invalidate_principal(candidate.user_id)
         return candidate
     
     @classmethod
@@ -54,3 +299,8 @@ class CandidateService(BaseService):
         if candidate:
             return candidate.interviews.all()
         return []
+    
+    @classmethod
+    def get_candidates_with_skill(cls, skill: str):
+        """Get all candidates that list a skill, via the candidate_skills index."""
+        return cls.model.objects.filter(skill_links__skill__name=normalize_skill(skill))
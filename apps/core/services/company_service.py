@@ -36,6 +36,24 @@ class CompanyService(BaseService):
         except cls.model.DoesNotExist:
             return None
     
+    @classmethod
+    async def aget_by_user_id(cls, user_id: int) -> Optional[Company]:
+        """Get company profile by user ID using the async ORM."""
+        try:
+            return await cls.model.objects.aget(user_id=user_id)
+        except cls.model.DoesNotExist:
+            return None
+    
+    @classmethod
+    def update(cls, obj_id: int, **data) -> Optional[Company]:
+        """Update a company profile and invalidate its owner's cached principal."""
+        from .user_service import UserService
+        
+        company = super().update(obj_id, **data)
+        if company:
+            UserService.invalidate_principal(company.user_id)
+        return company
+    
     @classmethod
     def get_company_jobs(cls, company_id: int):
         """Get all job postings for a company."""
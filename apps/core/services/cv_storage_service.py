@@ -0,0 +1,121 @@
+import hashlib
+import os
+import tempfile
+from typing import Iterator, Optional, Tuple
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from apps.core.models import CVBlob, CVParseResult
+from .base import BaseService
+
+CHUNK_SIZE = 64 * 1024
+KNOWN_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+
+def iter_chunks(fileobj) -> Iterator[bytes]:
+    """Read an uploaded or plain file object in fixed-size chunks."""
+    if hasattr(fileobj, 'chunks'):
+        yield from fileobj.chunks(CHUNK_SIZE)
+        return
+    while True:
+        chunk = fileobj.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        yield chunk
+
+
+def hash_stream(fileobj, sink=None) -> Tuple[str, int]:
+    """SHA-256 hex digest and size of a file, optionally copying it into `sink` on the way."""
+    digest = hashlib.sha256()
+    size = 0
+    for chunk in iter_chunks(fileobj):
+        digest.update(chunk)
+        size += len(chunk)
+        if sink is not None:
+            sink.write(chunk)
+    return digest.hexdigest(), size
+
+
+class CVStorageService(BaseService):
+    """Service for content-addressed CV storage and the parse result cache."""
+
+    model = CVBlob
+
+    @classmethod
+    def storage_path(cls, sha256: str, filename: str = '') -> str:
+        """Storage key for a CV: its digest, fanned out by prefix, keeping a known extension."""
+        extension = os.path.splitext(filename)[1].lower()
+        if extension not in KNOWN_EXTENSIONS:
+            extension = ''
+        return f"cvs/{sha256[:2]}/{sha256}{extension}"
+
+    @classmethod
+    def _reuse(cls, sha256: str) -> Optional[CVBlob]:
+        """Count another upload of known content and return its blob, if any."""
+        if cls.model.objects.filter(sha256=sha256).update(upload_count=F('upload_count') + 1):
+            return cls.model.objects.get(sha256=sha256)
+        return None
+
+    @classmethod
+    def store(cls, fileobj, filename: str = '') -> CVBlob:
+        """
+        Store a CV by content. The file is hashed while it is spooled to a
+        temporary file; content that is already stored is not written again.
+        """
+        with tempfile.TemporaryFile() as spool:
+            sha256, size = hash_stream(fileobj, sink=spool)
+
+            blob = cls._reuse(sha256)
+            if blob:
+                return blob
+
+            spool.seek(0)
+            path = cls.storage_path(sha256, filename)
+            name = default_storage.save(path, File(spool, name=path))
+
+        try:
+            with transaction.atomic():
+                return cls.model.objects.create(sha256=sha256, file=name, size=size)
+        except IntegrityError:
+            # An identical upload won the race; keep its copy
+            default_storage.delete(name)
+            return cls._reuse(sha256)
+
+    @classmethod
+    def get_parse_result(cls, blob: CVBlob, parser_version: int) -> Optional[dict]:
+        """Cached parse output for a blob and parser version, counting the hit."""
+        results = CVParseResult.objects.filter(blob=blob, parser_version=parser_version)
+        if not results.update(hit_count=F('hit_count') + 1):
+            return None
+        return results.values_list('parsed_data', flat=True).first()
+
+    @classmethod
+    def save_parse_result(cls, blob: CVBlob, parser_version: int, parsed_data: dict) -> None:
+        """Cache parse output for a blob and parser version."""
+        CVParseResult.objects.bulk_create(
+            [CVParseResult(blob=blob, parser_version=parser_version, parsed_data=parsed_data)],
+            ignore_conflicts=True
+        )
+
+    @classmethod
+    def get_stats(cls) -> dict:
+        """Dedup and parse-cache effectiveness across all stored CVs."""
+        blobs = cls.model.objects.aggregate(
+            files=Count('id'),
+            uploads=Sum('upload_count'),
+            bytes_stored=Sum('size'),
+            bytes_saved=Sum((F('upload_count') - 1) * F('size'))
+        )
+        parses = CVParseResult.objects.aggregate(misses=Count('id'), hits=Sum('hit_count'))
+        hits, misses = parses['hits'] or 0, parses['misses'] or 0
+
+        return {
+            'files': blobs['files'],
+            'uploads': blobs['uploads'] or 0,
+            'bytes_stored': blobs['bytes_stored'] or 0,
+            'bytes_saved': blobs['bytes_saved'] or 0,
+            'parse_cache_hits': hits,
+            'parse_cache_misses': misses,
+            'parse_cache_hit_rate': round(hits / (hits + misses), 4) if hits + misses else 0.0,
+        }
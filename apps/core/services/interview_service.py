@@ -1,7 +1,12 @@
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 from datetime import datetime
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, FloatField, IntegerField, OuterRef, Prefetch, Subquery, Sum
+from django.db.models.functions import Coalesce
 from apps.core.models import Interview, Question, Answer, JobPosting, Candidate
+from apps.core.notifications import notification_dispatcher
 from .base import BaseService
+from .skill_service import normalize_skill
 
 
 class InterviewService(BaseService):
@@ -9,6 +14,16 @@ class InterviewService(BaseService):
     
     model = Interview
     
+    # Columns needed to render an interview in a listing (InterviewResponse)
+    LIST_FIELDS = (
+        'id', 'job_posting_id', 'candidate_id', 'status', 'channel',
+        'skill_match_score', 'final_score', 'agent_recommendation',
+        'started_at', 'completed_at', 'created_at',
+    )
+    
+    # Denormalized answer accounting kept on the interview row
+    COUNTER_FIELDS = ('question_count', 'answered_count', 'score_sum', 'scored_count')
+    
     @classmethod
     def create_interview(cls, job_posting_id: int, candidate_id: int, 
                          channel: str = 'web') -> Optional[Interview]:
@@ -16,8 +31,8 @@ class InterviewService(BaseService):
         from .job_service import JobService
         from .candidate_service import CandidateService
         
-        job = JobService.get_by_id(job_posting_id)
-        candidate = CandidateService.get_by_id(candidate_id)
+        job = JobService.get_for_write(job_posting_id)
+        candidate = CandidateService.get_for_write(candidate_id)
         
         if not job or not candidate:
             return None
@@ -35,6 +50,7 @@ class InterviewService(BaseService):
         return interview
     
     @classmethod
+    @transaction.atomic
     def start_interview(cls, interview_id: int) -> Optional[Interview]:
         """Start an interview and generate initial questions."""
         interview = cls.get_by_id(interview_id)
@@ -43,7 +59,7 @@ class InterviewService(BaseService):
         
         interview.status = 'in_progress'
         interview.started_at = datetime.now()
-        interview.save()
+        interview.save(update_fields=['status', 'started_at', 'updated_at'])
         
         # Generate adaptive questions based on job requirements
         cls._generate_questions(interview)
@@ -51,10 +67,14 @@ class InterviewService(BaseService):
         return interview
     
     @classmethod
+    @transaction.atomic
     def submit_answer(cls, question_id: int, answer_text: str) -> Optional[Answer]:
         """Submit an answer to a question."""
         try:
-            question = Question.objects.get(id=question_id)
+            # The interview row stays locked until commit, so its counters are current
+            question = Question.objects.select_related('interview').select_for_update(
+                of=('interview',)
+            ).get(id=question_id)
         except Question.DoesNotExist:
             return None
         
@@ -69,18 +89,95 @@ class InterviewService(BaseService):
         
         # Check if all questions are answered
         interview = question.interview
-        total_questions = interview.questions.count()
-        answered_questions = Answer.objects.filter(question__interview=interview).count()
+        cls._record_answers(interview, [score])
         
-        if answered_questions == total_questions:
+        if interview.answered_count >= interview.question_count:
             cls._complete_interview(interview)
         
         return answer
     
+    @classmethod
+    @transaction.atomic
+    def submit_answers(cls, interview_id: int, candidate_id: int,
+                       answers_data: List[Dict]) -> Optional[Tuple[Interview, List[Answer]]]:
+        """
+        Submit a batch of answers to one of a candidate's interviews. The
+        interview row is locked, the questions are loaded in one query, new
+        answers are inserted with one INSERT, and the counters and completion
+        check are updated once. Questions that already have an answer keep it,
+        so a retried batch is harmless. Returns None if the interview does not
+        belong to the candidate.
+        """
+        interview = cls.model.objects.select_for_update().filter(
+            pk=interview_id, candidate_id=candidate_id
+        ).first()
+        if not interview:
+            return None
+        
+        question_ids = [data['question_id'] for data in answers_data]
+        if len(set(question_ids)) != len(question_ids):
+            raise ValueError("Each question can only be answered once per batch")
+        
+        questions = Question.objects.filter(interview=interview).select_related('answer').in_bulk(question_ids)
+        missing = [question_id for question_id in question_ids if question_id not in questions]
+        if missing:
+            raise ValueError(f"Questions not part of this interview: {missing}")
+        
+        answers = []
+        for data in answers_data:
+            question = questions[data['question_id']]
+            try:
+                answers.append(question.answer)
+            except Answer.DoesNotExist:
+                answers.append(Answer(
+                    question=question,
+                    answer_text=data['answer_text'],
+                    score=cls._evaluate_answer(question, data['answer_text'])
+                ))
+        
+        new_answers = [answer for answer in answers if answer.pk is None]
+        if not new_answers:
+            return interview, answers
+        if interview.status == 'completed':
+            raise ValueError("Interview is already completed")
+        
+        Answer.objects.bulk_create(new_answers)
+        cls._record_answers(interview, [answer.score for answer in new_answers])
+        
+        if interview.answered_count >= interview.question_count:
+            cls._complete_interview(interview)
+        
+        return interview, answers
+    
+    @classmethod
+    def _record_answers(cls, interview: Interview, scores: List[Optional[float]]) -> None:
+        """
+        Atomically add answers to the interview's counters. Callers hold the
+        interview's row lock, so the loaded counters are current and are
+        advanced in memory rather than read back.
+        """
+        scored = [score for score in scores if score is not None]
+        cls.model.objects.filter(pk=interview.pk).update(
+            answered_count=F('answered_count') + len(scores),
+            score_sum=F('score_sum') + sum(scored),
+            scored_count=F('scored_count') + len(scored)
+        )
+        interview.answered_count += len(scores)
+        interview.score_sum += sum(scored)
+        interview.scored_count += len(scored)
+    
+    @classmethod
+    def _record_questions(cls, interview: Interview, count: int) -> None:
+        """Atomically add newly created questions to the interview's counter."""
+        cls.model.objects.filter(pk=interview.pk).update(
+            question_count=F('question_count') + count
+        )
+        interview.question_count += count
+    
     @classmethod
     def complete_interview(cls, interview_id: int) -> Optional[Interview]:
         """Manually complete an interview."""
-        interview = cls.get_by_id(interview_id)
+        interview = cls.get_for_write(interview_id)
         if interview:
             return cls._complete_interview(interview)
         return None
@@ -88,8 +185,8 @@ class InterviewService(BaseService):
     @classmethod
     def _calculate_skill_match(cls, job: JobPosting, candidate: Candidate) -> float:
         """Calculate skill match percentage between job requirements and candidate skills."""
-        required_skills = set(skill.lower() for skill in job.required_skills)
-        candidate_skills = set(skill.lower() for skill in candidate.skills)
+        required_skills = set(normalize_skill(skill) for skill in job.required_skills)
+        candidate_skills = set(normalize_skill(skill) for skill in candidate.skills)
         
         if not required_skills:
             return 0.0
@@ -110,16 +207,19 @@ class InterviewService(BaseService):
         for idx, skill in enumerate(job.required_skills[:5], 1):  # Limit to 5 questions
             difficulty = cls._determine_difficulty(skill, candidate)
             
-            question = Question.objects.create(
+            questions.append(Question(
                 interview=interview,
                 question_text=f"Can you describe your experience with {skill}?",
                 difficulty=difficulty,
                 skill_evaluated=skill,
                 expected_answer_keywords=[skill.lower(), 'experience', 'project'],
                 order=idx
-            )
-            questions.append(question)
+            ))
         
+        # Single INSERT; unique_interview_question_order rejects a second generation
+        with transaction.atomic():
+            questions = Question.objects.bulk_create(questions)
+            cls._record_questions(interview, len(questions))
         return questions
     
     @classmethod
@@ -153,21 +253,12 @@ class InterviewService(BaseService):
         interview.status = 'completed'
         interview.completed_at = datetime.now()
         
-        # Calculate final score from submitted answers
-        answers = Answer.objects.filter(question__interview=interview)
-        if answers.exists():
-            # Calculate average score from answered questions only
-            total_score = 0
-            scored_answers = 0
-            
-            for answer in answers:
-                if answer.score is not None:
-                    total_score += answer.score
-                    scored_answers += 1
-            
-            if scored_answers > 0:
+        # Calculate final score from the running answer counters
+        if interview.answered_count > 0:
+            # Average score from answered questions only
+            if interview.scored_count > 0:
                 # Average score (0-10 scale) converted to 0-100 scale
-                avg_answer_score = (total_score / scored_answers) * 10
+                avg_answer_score = (interview.score_sum / interview.scored_count) * 10
                 # Final score: 40% skill match + 60% interview performance
                 final_score = (interview.skill_match_score * 0.4) + (avg_answer_score * 0.6)
                 interview.final_score = round(final_score, 2)
@@ -181,7 +272,16 @@ class InterviewService(BaseService):
             interview.final_score = 0.0
             interview.agent_recommendation = "Not Recommended: No answers submitted."
         
-        interview.save()
+        interview.save(update_fields=[
+            'status', 'completed_at', 'final_score', 'agent_recommendation', 'updated_at'
+        ])
+        
+        # Completions of many interviews reach the company as one coalesced notification
+        company_user_id = JobPosting.objects.filter(
+            pk=interview.job_posting_id
+        ).values_list('company__user_id', flat=True).first()
+        message = f"Interview #{interview.id} has been completed with a final score of {interview.final_score}."
+        transaction.on_commit(lambda: notification_dispatcher.notify([company_user_id], message))
         return interview
     
     @classmethod
@@ -199,17 +299,41 @@ class InterviewService(BaseService):
     @classmethod
     def get_interviews_by_job(cls, job_id: int):
         """Get all interviews for a specific job posting."""
-        return cls.model.objects.filter(job_posting_id=job_id)
+        return cls.read_queryset().filter(job_posting_id=job_id)
     
     @classmethod
     def get_interviews_by_candidate(cls, candidate_id: int):
         """Get all interviews for a specific candidate."""
-        return cls.model.objects.filter(candidate_id=candidate_id)
+        return cls.read_queryset().filter(candidate_id=candidate_id)
+    
+    @classmethod
+    def get_interviews_by_company(cls, company_id: int):
+        """Get all interviews across a company's job postings in a single query."""
+        return cls.read_queryset().filter(
+            job_posting__company_id=company_id
+        ).only(*cls.LIST_FIELDS)
+    
+    @classmethod
+    def get_interview_detail(cls, interview_id: int, with_answers: bool = False) -> Optional[Interview]:
+        """
+        Get an interview with its candidate, job posting, company and ordered
+        questions loaded in two queries. With `with_answers`, each question's
+        answer is joined into the question query instead of loaded per question.
+        """
+        questions = Question.objects.order_by('order')
+        if with_answers:
+            questions = questions.select_related('answer')
+        
+        return cls.read_queryset().select_related(
+            'candidate', 'job_posting__company'
+        ).prefetch_related(
+            Prefetch('questions', queryset=questions)
+        ).filter(id=interview_id).first()
     
     @classmethod
     def upload_questions(cls, interview_id: int, questions_data: List[Dict]) -> Optional[List[Question]]:
         """Upload interview questions from mobile app."""
-        interview = cls.get_by_id(interview_id)
+        interview = cls.get_for_write(interview_id)
         if not interview:
             return None
         
@@ -218,16 +342,50 @@ class InterviewService(BaseService):
         if existing_questions > 0:
             raise ValueError("Questions already uploaded for this interview")
         
-        # Create questions in a transaction
-        created_questions = []
-        for q_data in questions_data:
-            question = Question.objects.create(
+        questions = [
+            Question(
                 interview=interview,
                 question_text=q_data['question_text'],
                 difficulty=q_data['difficulty'].lower(),
                 skill_evaluated=q_data['skill_evaluated'],
                 order=q_data['order']
             )
-            created_questions.append(question)
+            for q_data in questions_data
+        ]
         
-        return created_questions
+        # Create all questions with one INSERT. unique_interview_question_order
+        # rejects duplicate orders and concurrent uploads for the same interview.
+        try:
+            with transaction.atomic():
+                questions = Question.objects.bulk_create(questions)
+                cls._record_questions(interview, len(questions))
+            return questions
+        except IntegrityError:
+            raise ValueError("Questions already uploaded for this interview or duplicate question order")
+    
+    @classmethod
+    def reconcile_counters(cls, interview_ids: Optional[List[int]] = None) -> int:
+        """Rebuild the denormalized counters from the questions and answers tables."""
+        def aggregate(queryset, group_by, expression, output_field):
+            return Coalesce(
+                Subquery(
+                    queryset.order_by().values(group_by).annotate(total=expression).values('total'),
+                    output_field=output_field
+                ),
+                0,
+                output_field=output_field
+            )
+        
+        questions = Question.objects.filter(interview=OuterRef('pk'))
+        answers = Answer.objects.filter(question__interview=OuterRef('pk'))
+        
+        interviews = cls.model.objects.all()
+        if interview_ids is not None:
+            interviews = interviews.filter(id__in=interview_ids)
+        
+        return interviews.update(
+            question_count=aggregate(questions, 'interview', Count('id'), IntegerField()),
+            answered_count=aggregate(answers, 'question__interview', Count('id'), IntegerField()),
+            score_sum=aggregate(answers, 'question__interview', Sum('score'), FloatField()),
+            scored_count=aggregate(answers, 'question__interview', Count('score'), IntegerField())
+        )
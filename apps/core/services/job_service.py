@@ -1,6 +1,16 @@
 from typing import Optional, List
-from apps.core.models import JobPosting, Company
+from django.db import connection, transaction
+from django.db.models import Q
+from apps.core.cache import job_cache_version
+from apps.core.models import JobPosting, Company, Interview
+from apps.core.notifications import notification_dispatcher
+from apps.core.search import search_job_ids
 from .base import BaseService
+from .match_service import MatchService
+from .skill_service import SkillService, normalize_skill
+
+# Job fields that stored candidate matches depend on
+MATCH_INPUTS = {'status', 'required_skills', 'experience_required'}
 
 
 class JobService(BaseService):
@@ -9,6 +19,7 @@ class JobService(BaseService):
     model = JobPosting
     
     @classmethod
+    @transaction.atomic
     def create_job(cls, company_id: int, title: str, description: str, 
                    required_skills: List[str], **job_data) -> Optional[JobPosting]:
         """Create a new job posting for a company."""
@@ -25,31 +36,100 @@ class JobService(BaseService):
             required_skills=required_skills,
             **job_data
         )
+        SkillService.sync_job_skills(job)
+        cls.invalidate_cache()
+        if job.status == 'active':
+            MatchService.schedule_job_refresh([job.id])
+        return job
+    
+    @classmethod
+    @transaction.atomic
+    def update(cls, obj_id: int, **data) -> Optional[JobPosting]:
+        """Update a job posting, keeping its normalized skills and cached responses in sync."""
+        closing = data.get('status') == 'closed' and cls.model.objects.filter(
+            pk=obj_id
+        ).exclude(status='closed').exists()
+        job = super().update(obj_id, **data)
+        if job:
+            if closing:
+                cls.notify_job_closed(job)
+            if 'required_skills' in data:
+                SkillService.sync_job_skills(job)
+            if MATCH_INPUTS.intersection(data):
+                MatchService.schedule_job_refresh([job.id])
+            cls.invalidate_cache()
         return job
     
+    @classmethod
+    def delete(cls, obj_id: int) -> bool:
+        """Delete a job posting and drop its cached responses."""
+        deleted = super().delete(obj_id)
+        if deleted:
+            cls.invalidate_cache()
+        return deleted
+    
+    @classmethod
+    def notify_job_closed(cls, job: JobPosting) -> None:
+        """Tell every candidate who interviewed for a job that it has closed, once the transaction commits."""
+        user_ids = list(
+            Interview.objects.filter(job_posting_id=job.id)
+            .values_list('candidate__user_id', flat=True).distinct()
+        )
+        if user_ids:
+            message = f"The position '{job.title}' has been closed."
+            transaction.on_commit(lambda: notification_dispatcher.notify(user_ids, message))
+    
+    @classmethod
+    def invalidate_cache(cls) -> None:
+        """Orphan every cached job response once the current transaction commits."""
+        transaction.on_commit(job_cache_version.bump)
+    
     @classmethod
     def get_jobs_by_company(cls, company_id: int):
         """Get all job postings for a specific company."""
-        return cls.model.objects.filter(company_id=company_id)
+        return cls.read_queryset().filter(company_id=company_id)
     
     @classmethod
     def get_active_jobs(cls):
         """Get all active job postings."""
-        return cls.model.objects.filter(status='active')
+        return cls.read_queryset().filter(status='active')
     
     @classmethod
     def update_job_status(cls, job_id: int, status: str) -> Optional[JobPosting]:
         """Update job posting status."""
-        job = cls.get_by_id(job_id)
+        job = cls.get_for_write(job_id)
         if job and status in ['draft', 'active', 'closed']:
+            closing = status == 'closed' and job.status != 'closed'
             job.status = status
             job.save()
+            cls.invalidate_cache()
+            MatchService.schedule_job_refresh([job.id])
+            if closing:
+                cls.notify_job_closed(job)
         return job
     
     @classmethod
     def can_user_manage_job(cls, job_id: int, user_id: int) -> bool:
-        """Check if a user can manage a specific job posting."""
-        job = cls.get_by_id(job_id)
+        """Check if a user can manage a specific job posting, against the primary."""
+        job = cls.get_for_write(job_id)
         if job and job.company.user_id == user_id:
             return True
         return False
+    
+    @classmethod
+    def get_jobs_requiring_skill(cls, skill: str):
+        """Get all job postings that require a skill, via the job_skills index."""
+        return cls.model.objects.filter(skill_links__skill__name=normalize_skill(skill))
+    
+    @classmethod
+    def search(cls, text: str, limit: int = 20, status: str = 'active') -> List[JobPosting]:
+        """Full-text search over title, description, location and skills, best match first."""
+        ranked = search_job_ids(connection, text, status, limit)
+        if ranked is None:
+            # No search index on this database; fall back to substring matching
+            return list(cls.model.objects.filter(
+                Q(title__icontains=text) | Q(description__icontains=text), status=status
+            )[:limit])
+        
+        jobs = cls.model.objects.in_bulk([job_id for job_id, _ in ranked])
+        return [jobs[job_id] for job_id, _ in ranked if job_id in jobs]
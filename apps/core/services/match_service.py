@@ -0,0 +1,347 @@
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, QuerySet
+
+from apps.core.db_router import REPLICA_HINT
+from apps.core.models import Candidate, CandidateSkill, JobCandidateMatch, JobPosting, JobSkill
+from apps.core.task_queue import task_queue
+from .skill_service import normalize_skill
+
+# Stored match columns compared to decide whether a row needs rewriting
+MATCH_FIELDS = ('score', 'matched_skills', 'experience_delta')
+
+# Number of set bits for every byte value, used to popcount packed bitsets
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+class SkillVocabulary:
+    """Interning table mapping canonical skill names to dense bit positions."""
+
+    def __init__(self):
+        self._positions: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def intern(self, skill: str) -> int:
+        """Return the bit position of a skill, assigning a new one if unseen."""
+        name = normalize_skill(skill)
+        position = self._positions.get(name)
+        if position is None:
+            position = self._positions[name] = len(self._positions)
+        return position
+
+    def lookup(self, skill: str) -> Optional[int]:
+        """Return the bit position of a skill, or None if no row has it."""
+        return self._positions.get(normalize_skill(skill))
+
+    def positions(self, skills: Iterable[str]) -> Tuple[List[int], int]:
+        """Distinct known positions for `skills`, and how many distinct skills were given."""
+        names = {normalize_skill(skill) for skill in skills}
+        known = [self._positions[name] for name in names if name in self._positions]
+        return known, len(names)
+
+
+class SkillMatrix:
+    """Skill sets of many rows (candidates or jobs) packed as one bitset per row."""
+
+    def __init__(self, ids: np.ndarray, bits: np.ndarray):
+        self.ids = ids
+        self.bits = bits
+        self.sizes = _POPCOUNT[bits].sum(axis=1, dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def build(cls, rows: Iterable[Tuple[int, List[str]]], vocabulary: SkillVocabulary) -> 'SkillMatrix':
+        """Pack (id, skills) rows, interning every skill into `vocabulary`."""
+        ids, row_index, positions = [], [], []
+        for row, (obj_id, skills) in enumerate(rows):
+            ids.append(obj_id)
+            for skill in skills or []:
+                row_index.append(row)
+                positions.append(vocabulary.intern(skill))
+
+        width = max((len(vocabulary) + 7) // 8, 1)
+        bits = np.zeros((len(ids), width), dtype=np.uint8)
+        if positions:
+            positions = np.asarray(positions, dtype=np.int64)
+            np.bitwise_or.at(
+                bits,
+                (np.asarray(row_index, dtype=np.int64), positions >> 3),
+                (1 << (positions & 7)).astype(np.uint8),
+            )
+        return cls(np.asarray(ids, dtype=np.int64), bits)
+
+    def count_positions(self, positions: List[int]) -> np.ndarray:
+        """For every row, how many of the given bit positions are set."""
+        counts = np.zeros(len(self.ids), dtype=np.int32)
+        width = self.bits.shape[1] * 8
+        for position in positions:
+            if position < width:
+                counts += (self.bits[:, position >> 3] >> (position & 7)) & 1
+        return counts
+
+    def pack(self, positions: List[int]) -> np.ndarray:
+        """Pack bit positions into a single row compatible with this matrix."""
+        row = np.zeros(self.bits.shape[1], dtype=np.uint8)
+        for position in positions:
+            if position < self.bits.shape[1] * 8:
+                row[position >> 3] |= 1 << (position & 7)
+        return row
+
+
+def _top_k(ids: np.ndarray, scores: np.ndarray, limit: int) -> List[Tuple[int, float]]:
+    """Highest scores first, ties broken by ID; rows scoring zero are dropped."""
+    if limit < len(scores):
+        # Everything tied with the limit-th score, so the ID tie-break decides the cut
+        threshold = -np.partition(-scores, limit - 1)[limit - 1]
+        candidates = np.flatnonzero(scores >= threshold)
+    else:
+        candidates = np.arange(len(scores))
+    order = candidates[np.lexsort((ids[candidates], -scores[candidates]))][:limit]
+    return [(int(ids[i]), round(float(scores[i]), 2)) for i in order if scores[i] > 0]
+
+
+class SkillMatchIndex:
+    """Snapshot of every candidate's and active job's skills as packed bitsets."""
+
+    def __init__(self):
+        self.built_at = time.monotonic()
+        self.vocabulary = SkillVocabulary()
+        self.candidates = SkillMatrix.build(
+            Candidate.objects.values_list('id', 'skills').iterator(chunk_size=5000),
+            self.vocabulary,
+        )
+        self.jobs = SkillMatrix.build(
+            JobPosting.objects.filter(status='active')
+                .values_list('id', 'required_skills').iterator(chunk_size=5000),
+            self.vocabulary,
+        )
+
+    def rank_candidates(self, required_skills: List[str], limit: int) -> List[Tuple[int, float]]:
+        """Top `limit` candidates for a job's required skills, as (candidate_id, score)."""
+        positions, required = self.vocabulary.positions(required_skills)
+        if not required or not len(self.candidates):
+            return []
+        scores = self.candidates.count_positions(positions) * (100.0 / required)
+        return _top_k(self.candidates.ids, scores, limit)
+
+    def rank_jobs(self, skills: List[str], limit: int) -> List[Tuple[int, float]]:
+        """Top `limit` active jobs for a candidate's skills, as (job_id, score)."""
+        positions, _ = self.vocabulary.positions(skills)
+        if not len(self.jobs):
+            return []
+        candidate_row = self.jobs.pack(positions)
+        matched = _POPCOUNT[self.jobs.bits & candidate_row].sum(axis=1, dtype=np.int32)
+        scores = np.divide(
+            matched * 100.0, self.jobs.sizes,
+            out=np.zeros(len(self.jobs), dtype=np.float64), where=self.jobs.sizes > 0,
+        )
+        return _top_k(self.jobs.ids, scores, limit)
+
+
+class MatchService:
+    """Service for ranking candidates against jobs (and jobs against candidates) in bulk."""
+
+    _index: Optional[SkillMatchIndex] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def _is_fresh(cls, index: Optional[SkillMatchIndex]) -> bool:
+        return index is not None and time.monotonic() - index.built_at <= settings.SKILL_MATCH_INDEX_TTL
+
+    @classmethod
+    def get_index(cls) -> SkillMatchIndex:
+        """
+        Return the current index, rebuilding it once it is older than
+        SKILL_MATCH_INDEX_TTL. While one thread rebuilds, others keep
+        using the previous snapshot instead of waiting.
+        """
+        index = cls._index
+        if cls._is_fresh(index):
+            return index
+        if not cls._lock.acquire(blocking=index is None):
+            return index
+        try:
+            index = cls._index
+            if not cls._is_fresh(index):
+                index = cls._index = SkillMatchIndex()
+            return index
+        finally:
+            cls._lock.release()
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Force the next lookup to rebuild the index."""
+        cls._index = None
+
+    @classmethod
+    def top_candidates_for_job(cls, job: JobPosting, limit: int = 20) -> List[Tuple[int, float]]:
+        """Best-matching candidates for a job, as (candidate_id, skill match %)."""
+        return cls.get_index().rank_candidates(job.required_skills, limit)
+
+    @classmethod
+    def top_jobs_for_candidate(cls, candidate: Candidate, limit: int = 20) -> List[Tuple[int, float]]:
+        """Best-matching active jobs for a candidate, as (job_id, skill match %)."""
+        return cls.get_index().rank_jobs(candidate.skills, limit)
+
+    @classmethod
+    def stored_candidates_for_job(cls, job_id: int, limit: int = 20) -> QuerySet:
+        """
+        Best-matching candidates for an active job from the precomputed
+        job_candidate_matches table: one range scan of idx_match_job_score.
+        """
+        return JobCandidateMatch.objects.db_manager(hints={REPLICA_HINT: True}).filter(
+            job_posting_id=job_id
+        ).select_related('candidate').only(
+            'candidate_id', *MATCH_FIELDS, 'candidate__full_name', 'candidate__experience_years'
+        ).order_by('-score', 'candidate_id')[:limit]
+
+    @staticmethod
+    def _match(job_id: int, candidate_id: int, matched: List[str], required: int,
+               experience_delta: int) -> JobCandidateMatch:
+        return JobCandidateMatch(
+            job_posting_id=job_id,
+            candidate_id=candidate_id,
+            score=round(len(matched) * 100.0 / required, 2),
+            matched_skills=sorted(matched),
+            experience_delta=experience_delta,
+        )
+
+    @classmethod
+    def _sync(cls, existing: QuerySet, computed: Dict, key) -> Tuple[int, int]:
+        """
+        Make the stored rows in `existing` match `computed` (keyed by the
+        `key` field, or a tuple of fields), writing only rows whose values
+        changed. Returns (upserted, deleted).
+        """
+        keys = (key,) if isinstance(key, str) else tuple(key)
+        current = {}
+        for row in existing.values_list('pk', *keys, *MATCH_FIELDS).iterator(chunk_size=5000):
+            match_key = row[1] if len(keys) == 1 else row[1:1 + len(keys)]
+            current[match_key] = (row[0], row[1 + len(keys):])
+        changed = [
+            match for match_key, match in computed.items()
+            if match_key not in current
+            or current[match_key][1] != tuple(getattr(match, field) for field in MATCH_FIELDS)
+        ]
+        stale = [current[match_key][0] for match_key in current.keys() - computed.keys()]
+
+        with transaction.atomic():
+            if stale:
+                JobCandidateMatch.objects.filter(pk__in=stale).delete()
+            if changed:
+                JobCandidateMatch.objects.bulk_create(
+                    changed,
+                    batch_size=1000,
+                    update_conflicts=True,
+                    unique_fields=['job_posting', 'candidate'],
+                    update_fields=[*MATCH_FIELDS, 'computed_at'],
+                )
+        return len(changed), len(stale)
+
+    @classmethod
+    def refresh_job_matches(cls, job_id: int) -> Tuple[int, int]:
+        """
+        Recompute the stored matches of one job from the skills tables. Only
+        active jobs keep matches; rows of other jobs are removed.
+        """
+        job = JobPosting.objects.filter(pk=job_id).only('status', 'experience_required').first()
+        computed = {}
+        if job and job.status == 'active':
+            skills = dict(JobSkill.objects.filter(job_posting_id=job_id).values_list('skill_id', 'skill__name'))
+            matched, experience = defaultdict(list), {}
+            links = CandidateSkill.objects.filter(skill_id__in=skills).values_list(
+                'candidate_id', 'skill_id', 'candidate__experience_years'
+            )
+            for candidate_id, skill_id, experience_years in links.iterator(chunk_size=5000):
+                matched[candidate_id].append(skills[skill_id])
+                experience[candidate_id] = experience_years - job.experience_required
+            computed = {
+                candidate_id: cls._match(job_id, candidate_id, names, len(skills), experience[candidate_id])
+                for candidate_id, names in matched.items()
+            }
+        return cls._sync(JobCandidateMatch.objects.filter(job_posting_id=job_id), computed, 'candidate_id')
+
+    @classmethod
+    def refresh_candidate_matches(cls, candidate_id: int) -> Tuple[int, int]:
+        """Recompute the stored matches of one candidate against every active job."""
+        return cls.refresh_candidate_batch_matches([candidate_id])
+
+    @classmethod
+    def refresh_candidate_batch_matches(cls, candidate_ids: Iterable[int]) -> Tuple[int, int]:
+        """Recompute the stored matches of several candidates against every active job."""
+        candidate_ids = list(candidate_ids)
+        experience_years = dict(Candidate.objects.filter(pk__in=candidate_ids).values_list('id', 'experience_years'))
+        skills = defaultdict(dict)
+        for candidate_id, skill_id, name in CandidateSkill.objects.filter(
+            candidate_id__in=list(experience_years)
+        ).values_list('candidate_id', 'skill_id', 'skill__name').iterator(chunk_size=5000):
+            skills[candidate_id][skill_id] = name
+
+        jobs_by_skill, experience_required = defaultdict(list), {}
+        links = JobSkill.objects.filter(
+            skill_id__in={skill_id for names in skills.values() for skill_id in names},
+            job_posting__status='active',
+        ).values_list('job_posting_id', 'skill_id', 'job_posting__experience_required')
+        for job_id, skill_id, required_experience in links.iterator(chunk_size=5000):
+            jobs_by_skill[skill_id].append(job_id)
+            experience_required[job_id] = required_experience
+        required = dict(
+            JobSkill.objects.filter(job_posting_id__in=list(experience_required))
+            .values('job_posting_id').annotate(count=Count('id')).values_list('job_posting_id', 'count')
+        )
+
+        computed = {}
+        for candidate_id, names in skills.items():
+            matched = defaultdict(list)
+            for skill_id, name in names.items():
+                for job_id in jobs_by_skill[skill_id]:
+                    matched[job_id].append(name)
+            for job_id, job_names in matched.items():
+                computed[(candidate_id, job_id)] = cls._match(
+                    job_id, candidate_id, job_names, required[job_id],
+                    experience_years[candidate_id] - experience_required[job_id],
+                )
+        return cls._sync(
+            JobCandidateMatch.objects.filter(candidate_id__in=candidate_ids), computed, ('candidate_id', 'job_posting_id')
+        )
+
+    @classmethod
+    def refresh_all(cls) -> Tuple[int, int]:
+        """Rebuild the stored matches of every active job and drop those of inactive jobs."""
+        upserted, deleted = 0, 0
+        deleted += JobCandidateMatch.objects.exclude(job_posting__status='active').delete()[0]
+        for job_id in JobPosting.objects.filter(status='active').values_list('id', flat=True).iterator():
+            job_upserted, job_deleted = cls.refresh_job_matches(job_id)
+            upserted, deleted = upserted + job_upserted, deleted + job_deleted
+        return upserted, deleted
+
+    @classmethod
+    def schedule_job_refresh(cls, job_ids: Iterable[int]) -> None:
+        """Recompute the stored matches of jobs in the background once the transaction commits."""
+        from apps.core.tasks import refresh_job_matches
+        for job_id in job_ids:
+            transaction.on_commit(lambda job_id=job_id: task_queue.enqueue(refresh_job_matches, job_id))
+
+    @classmethod
+    def schedule_candidate_refresh(cls, candidate_id: int) -> None:
+        """Recompute a candidate's stored matches in the background once the transaction commits."""
+        from apps.core.tasks import refresh_candidate_matches
+        transaction.on_commit(lambda: task_queue.enqueue(refresh_candidate_matches, candidate_id))
+
+    @classmethod
+    def schedule_candidate_batch_refresh(cls, candidate_ids: Iterable[int]) -> None:
+        """Recompute the stored matches of several candidates in one background task once the transaction commits."""
+        from apps.core.tasks import refresh_candidate_batch_matches
+        candidate_ids = list(candidate_ids)
+        if candidate_ids:
+            transaction.on_commit(lambda: task_queue.enqueue(refresh_candidate_batch_matches, candidate_ids))
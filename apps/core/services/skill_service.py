@@ -0,0 +1,91 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+from django.db import transaction
+from django.db.models import Count, Max
+from apps.core.cv_parser import SkillMatcher
+from apps.core.models import Skill, CandidateSkill, JobSkill, Candidate, JobPosting
+from .base import BaseService
+
+
+def normalize_skill(skill: str) -> str:
+    """Canonical form of a skill name used for matching and the skills table."""
+    return skill.strip().lower()
+
+
+class SkillService(BaseService):
+    """Service for the normalized skills tables."""
+
+    model = Skill
+
+    _matcher: Optional[SkillMatcher] = None
+    _matcher_signature: Optional[Tuple] = None
+
+    @classmethod
+    def canonical_names(cls, skills: Iterable[str]) -> List[str]:
+        """
+        Distinct, non-empty canonical names for a list of raw skill strings.
+        Skills come from JSON fields, so anything but a string is skipped.
+        """
+        return sorted({
+            normalize_skill(skill) for skill in skills or [] if isinstance(skill, str) and skill.strip()
+        })
+
+    @classmethod
+    def get_or_create_many(cls, names: List[str]) -> Dict[str, int]:
+        """Map canonical skill names to Skill IDs, inserting any that are missing."""
+        if not names:
+            return {}
+        cls.model.objects.bulk_create(
+            [cls.model(name=name) for name in names], ignore_conflicts=True
+        )
+        return dict(cls.model.objects.filter(name__in=names).values_list('name', 'id'))
+
+    @classmethod
+    def _sync_links(cls, link_model, owner_field: str, owner_id: int, skills: Iterable[str]) -> None:
+        """Make the link rows for one owner match its raw skill list exactly."""
+        skill_ids = set(cls.get_or_create_many(cls.canonical_names(skills)).values())
+        links = link_model.objects.filter(**{owner_field: owner_id})
+        current = set(links.values_list('skill_id', flat=True))
+
+        if current - skill_ids:
+            links.filter(skill_id__in=current - skill_ids).delete()
+        if skill_ids - current:
+            link_model.objects.bulk_create(
+                [link_model(**{owner_field: owner_id, 'skill_id': skill_id})
+                 for skill_id in skill_ids - current],
+                ignore_conflicts=True
+            )
+
+    @classmethod
+    @transaction.atomic
+    def sync_candidate_skills(cls, candidate: Candidate) -> None:
+        """Mirror Candidate.skills into the candidate_skills table."""
+        cls._sync_links(CandidateSkill, 'candidate_id', candidate.id, candidate.skills)
+
+    @classmethod
+    def link_new_candidates(cls, candidates: List[Candidate]) -> None:
+        """Create candidate_skills rows for freshly inserted candidates in one pass."""
+        names = {candidate.id: cls.canonical_names(candidate.skills) for candidate in candidates}
+        skill_ids = cls.get_or_create_many(sorted(set().union(*names.values())))
+        CandidateSkill.objects.bulk_create(
+            [CandidateSkill(candidate_id=candidate_id, skill_id=skill_ids[name])
+             for candidate_id, candidate_names in names.items() for name in candidate_names],
+            ignore_conflicts=True
+        )
+
+    @classmethod
+    @transaction.atomic
+    def sync_job_skills(cls, job: JobPosting) -> None:
+        """Mirror JobPosting.required_skills into the job_skills table."""
+        cls._sync_links(JobSkill, 'job_posting_id', job.id, job.required_skills)
+
+    @classmethod
+    def get_matcher(cls) -> SkillMatcher:
+        """
+        Compiled matcher over every canonical skill name. Rebuilt only when
+        the skills table has changed since the last call.
+        """
+        signature = tuple(cls.model.objects.aggregate(count=Count('id'), last=Max('id')).values())
+        if cls._matcher is None or signature != cls._matcher_signature:
+            names = cls.model.objects.values_list('name', flat=True).iterator(chunk_size=5000)
+            cls._matcher, cls._matcher_signature = SkillMatcher(names), signature
+        return cls._matcher
@@ -1,8 +1,30 @@
+from functools import partial
 from typing import Optional
+from asgiref.sync import sync_to_async
 from django.contrib.auth.hashers import make_password
-from apps.core.models import User
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import DEFERRED
+from apps.core.cache import principal_cache
+from apps.core.hashing import password_hasher
+from apps.core.models import Candidate, Company, User
 from .base import BaseService
 
+# What a cached principal keeps of the user: the fields authentication and
+# the /me endpoints read. The password hash and the rest never reach the cache.
+PRINCIPAL_FIELDS = ('id', 'username', 'email', 'role', 'phone', 'is_staff', 'is_active', 'created_at')
+# Profiles are cached by ID only; endpoints needing more load them
+PRINCIPAL_PROFILES = {'company_profile': Company, 'candidate_profile': Candidate}
+
+
+def _from_fields(model, values: dict):
+    """An instance as if loaded with .only(*values); the other fields are deferred."""
+    fields = model._meta.concrete_fields
+    return model.from_db(
+        DEFAULT_DB_ALIAS,
+        [field.attname for field in fields],
+        [values.get(field.attname, DEFERRED) for field in fields]
+    )
+
 
 class UserService(BaseService):
     """Service for User management."""
@@ -21,6 +43,17 @@ class UserService(BaseService):
         )
         return user
     
+    @classmethod
+    async def acreate_user(cls, username: str, email: str, password: str, role: str = 'candidate', **extra_fields) -> User:
+        """Create a new user, hashing the password on the hasher pool."""
+        return await cls.model.objects.acreate(
+            username=username,
+            email=email,
+            password=await password_hasher.make_password(password),
+            role=role,
+            **extra_fields
+        )
+    
     @classmethod
     def get_by_username(cls, username: str) -> Optional[User]:
         """Retrieve user by username."""
@@ -29,6 +62,14 @@ class UserService(BaseService):
         except cls.model.DoesNotExist:
             return None
     
+    @classmethod
+    async def aget_by_username(cls, username: str) -> Optional[User]:
+        """Retrieve user by username using the async ORM."""
+        try:
+            return await cls.model.objects.aget(username=username)
+        except cls.model.DoesNotExist:
+            return None
+    
     @classmethod
     def get_by_email(cls, email: str) -> Optional[User]:
         """Retrieve user by email."""
@@ -37,13 +78,103 @@ class UserService(BaseService):
         except cls.model.DoesNotExist:
             return None
     
+    @classmethod
+    async def aget_by_email(cls, email: str) -> Optional[User]:
+        """Retrieve the first user with an email using the async ORM."""
+        return await cls.model.objects.filter(email=email).afirst()
+    
     @classmethod
     def authenticate(cls, username: str, password: str) -> Optional[User]:
         """Authenticate user credentials."""
         from django.contrib.auth import authenticate
         return authenticate(username=username, password=password)
     
+    @classmethod
+    async def aauthenticate(cls, username: str, password: str) -> Optional[User]:
+        """
+        Async variant of authenticate (ModelBackend rules) that verifies the
+        password on the hasher pool. Raises PasswordHasherBusy when the pool is full.
+        """
+        try:
+            user = await cls.model.objects.aget(username=username)
+        except cls.model.DoesNotExist:
+            # Hash anyway so unknown usernames take as long as wrong passwords
+            await password_hasher.make_password(password)
+            return None
+        
+        matches, needs_rehash = await password_hasher.check_password(password, user.password)
+        if not matches or not user.is_active:
+            return None
+        if needs_rehash:
+            user.password = await password_hasher.make_password(password)
+            await user.asave(update_fields=['password'])
+        return user
+    
     @classmethod
     def get_users_by_role(cls, role: str):
         """Get all users with a specific role."""
         return cls.model.objects.filter(role=role)
+    
+    @classmethod
+    def get_principal(cls, user_id: int) -> Optional[User]:
+        """
+        Get a user with its company/candidate profile already attached.
+        Served from the principal cache when possible, otherwise one joined
+        query. Only PRINCIPAL_FIELDS are loaded, and only the IDs of the
+        profiles; anything else is a deferred field. Inactive users are
+        returned as None, like missing ones.
+        """
+        data = principal_cache.get(user_id)
+        if data is None:
+            data = cls.model.objects.filter(id=user_id).values(
+                *PRINCIPAL_FIELDS, *(f'{name}__id' for name in PRINCIPAL_PROFILES)
+            ).first()
+            if data is None:
+                return None
+            principal_cache.set(user_id, data)
+        return cls._principal(data)
+    
+    @classmethod
+    async def aget_principal(cls, user_id: int) -> Optional[User]:
+        """Async variant of get_principal; in-process cache hits never leave the event loop."""
+        data = principal_cache.get_local(user_id)
+        if data is None:
+            return await sync_to_async(cls.get_principal)(user_id)
+        return cls._principal(data)
+    
+    @classmethod
+    def _principal(cls, data: dict) -> Optional[User]:
+        """Rebuild a principal from its cached fields, or None if the user is inactive."""
+        if not data['is_active']:
+            return None
+        user = _from_fields(cls.model, data)
+        for name, model in PRINCIPAL_PROFILES.items():
+            profile = None
+            if data[f'{name}__id'] is not None:
+                profile = _from_fields(model, {'id': data[f'{name}__id'], 'user_id': user.id})
+                model._meta.get_field('user').set_cached_value(profile, user)
+            cls.model._meta.get_field(name).set_cached_value(user, profile)
+        return user
+    
+    @classmethod
+    def invalidate_principal(cls, user_id: int) -> None:
+        """
+        Drop a cached principal after the user or its profile changed. Inside
+        a transaction this waits for the commit, so that a request reading
+        the old row meanwhile cannot cache it again.
+        """
+        transaction.on_commit(partial(principal_cache.delete, user_id))
+    
+    @classmethod
+    def update(cls, obj_id: int, **data) -> Optional[User]:
+        """Update a user and invalidate its cached principal."""
+        user = super().update(obj_id, **data)
+        cls.invalidate_principal(obj_id)
+        return user
+    
+    @classmethod
+    def delete(cls, obj_id: int) -> bool:
+        """Delete a user and invalidate its cached principal."""
+        deleted = super().delete(obj_id)
+        cls.invalidate_principal(obj_id)
+        return deleted
@@ -1,32 +1,42 @@
 from celery import shared_task
-from django.core.files.base import ContentFile
-import json
+from django.core.files.storage import default_storage
 
 
 @shared_task
-def parse_cv_async(candidate_id: int, cv_file_path: str):
+def parse_cv_async(candidate_id: int, cv_file_path: str = None):
     """
     Asynchronous task to parse CV and extract relevant information.
-    This is a placeholder for actual CV parsing logic using NLP/ML.
+    Streams the stored PDF/DOCX/text file through apps.core.cv_parser and
+    writes the results back to the candidate in a single UPDATE. Results are
+    cached per CV content hash and parser version, so known files are never
+    parsed twice. A file that cannot be parsed is recorded on the candidate
+    as a failed result rather than failing the task.
     """
-    from apps.core.services import CandidateService
-    
-    # Placeholder: In production, use libraries like pdfplumber, spaCy, or external APIs
-    parsed_data = {
-        'skills': ['Python', 'Django', 'FastAPI', 'PostgreSQL'],
-        'experience_years': 3,
-        'education': 'Bachelor in Computer Science',
-        'certifications': [],
-        'languages': ['English', 'Spanish']
-    }
+    from apps.core.cv_parser import PARSER_VERSION, parse_cv
+    from apps.core.services import CandidateService, CVStorageService, MatchService, SkillService
     
     candidate = CandidateService.get_by_id(candidate_id)
-    if candidate:
-        candidate.cv_parsed_data = parsed_data
-        candidate.skills = parsed_data.get('skills', [])
-        candidate.experience_years = parsed_data.get('experience_years', 0)
-        candidate.education = parsed_data.get('education', '')
-        candidate.save()
+    if not candidate:
+        return {'status': 'failed', 'candidate_id': candidate_id, 'reason': 'Candidate not found'}
+    
+    blob = candidate.cv_blob
+    parsed_data = CVStorageService.get_parse_result(blob, PARSER_VERSION) if blob else None
+    
+    if parsed_data is None:
+        cv_file_path = blob.file.name if blob else (cv_file_path or candidate.cv_file.name)
+        if not cv_file_path:
+            return {'status': 'failed', 'candidate_id': candidate_id, 'reason': 'No CV uploaded'}
+        
+        with default_storage.open(cv_file_path, 'rb') as cv_file:
+            parsed_data = parse_cv(cv_file, SkillService.get_matcher(), filename=cv_file_path)
+        
+        if blob:
+            CVStorageService.save_parse_result(blob, PARSER_VERSION, parsed_data)
+    
+    CandidateService.apply_parsed_cv(candidate, parsed_data)
+    if parsed_data.get('status') == 'failed':
+        return {'status': 'failed', 'candidate_id': candidate_id, 'reason': parsed_data['error']}
+    MatchService.refresh_candidate_matches(candidate.id)
     
     return {'status': 'success', 'candidate_id': candidate_id, 'parsed_data': parsed_data}
 
@@ -65,12 +75,73 @@ def calculate_final_score(interview_id: int):
     return {'status': 'failed', 'interview_id': interview_id}
 
 
+@shared_task
+def refresh_job_matches(job_id: int):
+    """
+    Recompute the stored candidate matches of a job posting. Runs when a job
+    is created, edited or changes status; non-active jobs lose their matches.
+    """
+    from apps.core.services import MatchService
+    
+    upserted, deleted = MatchService.refresh_job_matches(job_id)
+    return {'status': 'success', 'job_id': job_id, 'upserted': upserted, 'deleted': deleted}
+
+
+@shared_task
+def refresh_candidate_matches(candidate_id: int):
+    """
+    Recompute the stored job matches of a candidate after their skills or
+    experience changed.
+    """
+    from apps.core.services import MatchService
+    
+    upserted, deleted = MatchService.refresh_candidate_matches(candidate_id)
+    return {'status': 'success', 'candidate_id': candidate_id, 'upserted': upserted, 'deleted': deleted}
+
+
+@shared_task
+def refresh_candidate_batch_matches(candidate_ids: list, chunk_size: int = 1000):
+    """
+    Compute the stored job matches of newly created candidates, e.g. after a
+    bulk import, in chunks of `chunk_size` candidates.
+    """
+    from apps.core.services import MatchService
+    
+    upserted, deleted = 0, 0
+    for start in range(0, len(candidate_ids), chunk_size):
+        chunk_upserted, chunk_deleted = MatchService.refresh_candidate_batch_matches(candidate_ids[start:start + chunk_size])
+        upserted, deleted = upserted + chunk_upserted, deleted + chunk_deleted
+    return {'status': 'success', 'candidates': len(candidate_ids), 'upserted': upserted, 'deleted': deleted}
+
+
 @shared_task
 def send_notification(user_id: int, message: str, notification_type: str = 'email'):
     """
-    Asynchronous task to send notifications to users.
-    Placeholder for email/SMS/push notification logic.
+    Asynchronous task to send a notification to one user. Prefer calling
+    notification_dispatcher.notify() directly, which needs no task per recipient.
+    """
+    from apps.core.notifications import notification_dispatcher
+    
+    notification_dispatcher.notify([user_id], message, notification_type)
+    return {'status': 'queued', 'user_id': user_id, 'type': notification_type}
+
+
+@shared_task
+def flush_notifications():
     """
-    # In production, integrate with email services (SendGrid, AWS SES) or SMS (Twilio)
-    print(f"Notification to user {user_id}: {message} (type: {notification_type})")
-    return {'status': 'success', 'user_id': user_id, 'type': notification_type}
+    Deliver the notifications buffered during the last NOTIFICATION_WINDOW,
+    coalesced per user and channel, in batches.
+    """
+    from apps.core.notifications import notification_dispatcher
+    
+    return {'status': 'success', 'notifications': notification_dispatcher.flush()}
+
+
+@shared_task
+def deliver_notifications(notifications: list):
+    """
+    Send one batch of coalesced notifications through the configured transport.
+    """
+    from apps.core.notifications import get_transport
+    
+    return {'status': 'success', 'sent': get_transport().send_batch(notifications)}
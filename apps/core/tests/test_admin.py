@@ -0,0 +1,74 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from apps.core.models import Answer, Interview, JobPosting, Question, User
+from apps.core.services import CandidateService, CompanyService, InterviewService
+from apps.core.task_queue import task_queue
+
+
+class InterviewCounterAdminTests(TestCase):
+    """Admin edits of questions and answers keep the Interview counters right."""
+
+    def setUp(self):
+        self.enterContext(mock.patch.object(task_queue, 'enqueue'))
+        company = CompanyService.create_company_with_user('acme', 'acme@example.com', 'pw12345!', 'Acme')
+        candidate = CandidateService.create_candidate_with_user('bob', 'bob@example.com', 'pw12345!', 'Bob')
+        job = JobPosting.objects.create(company=company, title='Backend', description='APIs', required_skills=['python'])
+        self.interview = Interview.objects.create(job_posting=job, candidate=candidate)
+        self.questions = InterviewService.upload_questions(self.interview.id, [
+            {'question_text': f'Q{order}?', 'difficulty': 'medium', 'skill_evaluated': 'python', 'order': order}
+            for order in range(2)
+        ])
+        Answer.objects.create(question=self.questions[0], answer_text='A', score=6.0)
+        InterviewService.reconcile_counters([self.interview.id])
+        admin = User.objects.create_superuser('admin', 'admin@example.com', 'pw12345!')
+        self.client.force_login(admin)
+
+    def counters(self):
+        interview = Interview.objects.get(pk=self.interview.pk)
+        return tuple(getattr(interview, field) for field in InterviewService.COUNTER_FIELDS)
+
+    def test_inline_questions(self):
+        data = {
+            'job_posting': self.interview.job_posting_id, 'candidate': self.interview.candidate_id,
+            'status': 'pending', 'channel': 'web',
+            'questions-TOTAL_FORMS': 3, 'questions-INITIAL_FORMS': 2,
+            'questions-MIN_NUM_FORMS': 0, 'questions-MAX_NUM_FORMS': 1000,
+        }
+        for index, question in enumerate(self.questions):
+            data.update({
+                f'questions-{index}-id': question.id, f'questions-{index}-interview': self.interview.id,
+                f'questions-{index}-question_text': question.question_text,
+                f'questions-{index}-difficulty': 'medium', f'questions-{index}-skill_evaluated': 'python',
+                f'questions-{index}-order': question.order,
+            })
+        # Delete the answered question, add a new one
+        data['questions-0-DELETE'] = 'on'
+        data.update({
+            'questions-2-interview': self.interview.id, 'questions-2-question_text': 'Q2?',
+            'questions-2-difficulty': 'hard', 'questions-2-skill_evaluated': 'django', 'questions-2-order': 2,
+        })
+
+        response = self.client.post(f'/admin/core/interview/{self.interview.id}/change/', data)
+        self.assertEqual(response.status_code, 302, response.content[:2000])
+        self.assertEqual(self.counters(), (2, 0, 0.0, 0))
+
+    def test_question_deleted(self):
+        response = self.client.post(f'/admin/core/question/{self.questions[0].id}/delete/', {'post': 'yes'})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.counters(), (1, 0, 0.0, 0))
+
+    def test_answers_added_and_deleted(self):
+        self.assertEqual(self.counters(), (2, 1, 6.0, 1))
+        response = self.client.post('/admin/core/answer/add/', {
+            'question': self.questions[1].id, 'answer_text': 'B', 'score': 8.0, 'evaluation_notes': '',
+        })
+        self.assertEqual(response.status_code, 302, response.content[:2000])
+        self.assertEqual(self.counters(), (2, 2, 14.0, 2))
+
+        response = self.client.post('/admin/core/answer/', {
+            'action': 'delete_selected', 'post': 'yes', '_selected_action': [a.id for a in Answer.objects.all()],
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.counters(), (2, 0, 0.0, 0))
@@ -0,0 +1,95 @@
+from unittest import mock
+
+from django.test import TransactionTestCase
+from fastapi.testclient import TestClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.main import app
+from apps.core.cache import principal_cache
+from apps.core.models import Answer, Interview, JobPosting
+from apps.core.notifications import notification_dispatcher
+from apps.core.services import CandidateService, CompanyService, InterviewService
+from apps.core.task_queue import task_queue
+
+
+class SubmitAnswersBatchTests(TransactionTestCase):
+    """POST /interviews/{id}/answers:batch"""
+
+    def setUp(self):
+        principal_cache.local.clear()
+        self.enterContext(mock.patch.object(task_queue, 'enqueue'))
+        self.notify = self.enterContext(mock.patch.object(notification_dispatcher, 'notify'))
+        company = CompanyService.create_company_with_user('acme', 'acme@example.com', 'pw12345!', 'Acme')
+        self.candidate = CandidateService.create_candidate_with_user('bob', 'bob@example.com', 'pw12345!', 'Bob')
+        self.job = JobPosting.objects.create(company=company, title='Backend', description='APIs', required_skills=['python'])
+        self.interview = self.new_interview()
+        self.questions = list(self.interview.questions.order_by('order'))
+        token = RefreshToken.for_user(self.candidate.user).access_token
+        self.client = TestClient(app, headers={'Authorization': f'Bearer {token}'})
+
+    def new_interview(self) -> Interview:
+        interview = Interview.objects.create(job_posting=self.job, candidate=self.candidate)
+        InterviewService.upload_questions(interview.id, [
+            {'question_text': f'Question {order}?', 'difficulty': 'medium', 'skill_evaluated': 'python', 'order': order}
+            for order in range(3)
+        ])
+        return interview
+
+    def submit(self, questions, interview_id=None):
+        return self.client.post(
+            f'/api/agent/interviews/{interview_id or self.interview.id}/answers:batch',
+            json={'answers': [
+                {'question_id': question.id, 'answer_text': f'I used python for {question.order} years.'}
+                for question in questions
+            ]},
+        )
+
+    def test_retry_with_the_same_payload_is_idempotent(self):
+        first = self.submit(self.questions[:2])
+        self.assertEqual(first.status_code, 201, first.text)
+        retry = self.submit(self.questions[:2])
+        self.assertEqual(retry.status_code, 201, retry.text)
+
+        self.assertEqual([a['id'] for a in retry.json()['answers']], [a['id'] for a in first.json()['answers']])
+        self.assertEqual(Answer.objects.filter(question__interview=self.interview).count(), 2)
+        interview = Interview.objects.get(pk=self.interview.pk)
+        self.assertEqual(interview.answered_count, 2)
+        self.assertEqual(interview.status, 'pending')
+
+    def test_completed_interview_is_a_conflict(self):
+        InterviewService.complete_interview(self.interview.id)
+
+        response = self.submit(self.questions)
+        self.assertEqual(response.status_code, 409)
+        self.assertIn('already completed', response.json()['detail'])
+        self.assertFalse(Answer.objects.filter(question__interview=self.interview).exists())
+
+    def test_questions_of_another_interview_are_rejected(self):
+        other = self.new_interview()
+        response = self.submit([self.questions[0], other.questions.first()])
+
+        self.assertEqual(response.status_code, 409)
+        self.assertIn('not part of this interview', response.json()['detail'])
+        # All or nothing: the valid answer in the batch is not kept either
+        self.assertFalse(Answer.objects.filter(question__interview=self.interview).exists())
+        self.assertEqual(Interview.objects.get(pk=self.interview.pk).answered_count, 0)
+
+    def test_completion_is_triggered_once(self):
+        with mock.patch.object(
+            InterviewService, '_complete_interview', wraps=InterviewService._complete_interview
+        ) as complete:
+            self.assertEqual(self.submit(self.questions[:1]).status_code, 201)
+            self.assertEqual(complete.call_count, 0)
+
+            response = self.submit(self.questions)
+            self.assertEqual(response.status_code, 201, response.text)
+            self.assertEqual(response.json()['interview']['status'], 'completed')
+            self.assertEqual(complete.call_count, 1)
+
+            # Retrying the completing batch changes nothing
+            self.assertEqual(self.submit(self.questions).status_code, 201)
+            self.assertEqual(complete.call_count, 1)
+
+        self.notify.assert_called_once()
+        interview = Interview.objects.get(pk=self.interview.pk)
+        self.assertEqual((interview.status, interview.answered_count), ('completed', 3))
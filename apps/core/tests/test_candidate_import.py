@@ -0,0 +1,146 @@
+import csv
+import io
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth.hashers import check_password
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from fastapi.testclient import TestClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.agent.endpoints import users
+from api.main import app
+from apps.core.cache import principal_cache
+from apps.core.hashing import PasswordHasherPool, password_hasher
+from apps.core.models import Candidate, User
+from apps.core.services import CandidateService
+from apps.core.task_queue import task_queue
+
+# Pool workers are forked after the override, so they hash quickly too
+FAST_HASHERS = override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+
+CSV = (
+    "username,email,password,full_name\n"
+    "ann,ann@example.com,pw-ann,Ann\n"
+    "bob,bob@example.com,pw-bob,Bob\n"
+)
+
+
+@FAST_HASHERS
+class HashManyTests(SimpleTestCase):
+    def test_hashes_in_order(self):
+        pool = PasswordHasherPool(workers=2)
+        self.addCleanup(pool.shutdown)
+        passwords = [f'password-{n}' for n in range(50)]
+        hashes = list(pool.hash_many(passwords, chunk_size=4))
+        self.assertEqual(len(hashes), 50)
+        self.assertTrue(all(map(check_password, passwords, hashes)))
+
+    def test_one_chunk_per_worker_queued(self):
+        pool = PasswordHasherPool(workers=2)
+        self.addCleanup(pool.shutdown)
+        with mock.patch.object(pool._get_executor(), 'submit', wraps=pool._get_executor().submit) as submit:
+            hashes = pool.hash_many([f'password-{n}' for n in range(40)], chunk_size=4)
+            self.assertEqual(submit.call_count, 2)
+            next(hashes)
+            self.assertEqual(submit.call_count, 3)
+            list(hashes)
+        self.assertEqual(submit.call_count, 10)
+
+    def test_bulk_leaves_half_the_queue_to_logins(self):
+        pool = PasswordHasherPool(workers=2, max_pending=8)
+        self.addCleanup(pool.shutdown)
+        hashes = pool.hash_many([f'password-{n}' for n in range(40)], chunk_size=4)
+        next(hashes)
+        # Mid-import, a login is queued rather than turned away
+        self.assertTrue(check_password('login', async_to_sync(pool.make_password)('login')))
+        list(hashes)
+        stats = pool.stats()
+        self.assertEqual(stats['pending'], 0)
+        self.assertLessEqual(stats['peak_pending'], 5)
+        self.assertEqual(stats['completed'], 41)
+
+
+@FAST_HASHERS
+class BulkImportPoolTests(TestCase):
+    def test_without_workers_uses_the_shared_pool(self):
+        self.addCleanup(password_hasher.shutdown)
+        with mock.patch.object(password_hasher, 'hash_many', wraps=password_hasher.hash_many) as hash_many, \
+                mock.patch.object(task_queue, 'enqueue'):
+            result = CandidateService.bulk_import(io.BytesIO(CSV.encode()), fmt='csv')
+        self.assertEqual(result['created'], 2)
+        hash_many.assert_called_once_with(['pw-ann', 'pw-bob'])
+        self.assertTrue(User.objects.get(username='bob').check_password('pw-bob'))
+
+
+@FAST_HASHERS
+class MalformedImportTests(TestCase):
+    def setUp(self):
+        self.addCleanup(password_hasher.shutdown)
+        self.enqueue = self.enterContext(mock.patch.object(task_queue, 'enqueue'))
+
+    def import_file(self, content: bytes) -> dict:
+        with self.captureOnCommitCallbacks(execute=True):
+            return CandidateService.bulk_import(io.BytesIO(content), fmt='csv', batch_size=1)
+
+    def refreshed_ids(self) -> list:
+        return [candidate_id for call in self.enqueue.call_args_list for candidate_id in call.args[1]]
+
+    def test_malformed_csv_row_is_reported_and_skipped(self):
+        limit = csv.field_size_limit(100)
+        self.addCleanup(csv.field_size_limit, limit)
+        long_name = 'x' * 200
+        result = self.import_file((CSV + f'dan,dan@example.com,pw,{long_name}\ncy,cy@example.com,pw-cy,Cy\n').encode())
+
+        self.assertEqual(result['created'], 3)
+        self.assertEqual(result['failed'], 1)
+        self.assertEqual(result['errors'][0]['row'], 3)
+        self.assertIn('malformed CSV', result['errors'][0]['error'])
+        self.assertEqual(len(self.refreshed_ids()), 3)
+
+    def test_unreadable_rest_of_file_keeps_earlier_batches(self):
+        # Past the first chunk the reader decodes, so the first rows are read
+        rows = ''.join(f'user{n},user{n}@example.com,pw-{n},User {n}\n' for n in range(500))
+        content = (CSV + rows).encode() + b'cy,cy@example.com,pw-cy,\xff\xfe\n'
+        result = self.import_file(content)
+
+        self.assertGreater(result['created'], 0)
+        self.assertEqual(result['created'], User.objects.count())
+        self.assertEqual(result['failed'], 1)
+        self.assertIn('rest of the import skipped', result['errors'][0]['error'])
+        self.assertEqual(sorted(self.refreshed_ids()), sorted(Candidate.objects.values_list('id', flat=True)))
+
+    def test_unreadable_file_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.import_file(b'\xff\xfe' + CSV.encode())
+        self.assertFalse(User.objects.exists())
+
+
+@FAST_HASHERS
+class ImportEndpointTests(TransactionTestCase):
+    def setUp(self):
+        principal_cache.local.clear()
+        staff = User.objects.create_user('ops', 'ops@example.com', 'pw12345!', role='company', is_staff=True)
+        self.headers = {'Authorization': f'Bearer {RefreshToken.for_user(staff).access_token}'}
+        self.client = TestClient(app)
+
+    def post(self):
+        return self.client.post(
+            '/api/agent/users/import/candidates', headers=self.headers,
+            files={'file': ('candidates.csv', CSV.encode(), 'text/csv')},
+        )
+
+    def test_concurrent_imports_are_rejected(self):
+        self.assertTrue(users._import_slots.acquire(blocking=False))
+        try:
+            response = self.post()
+        finally:
+            users._import_slots.release()
+        self.assertEqual(response.status_code, 429)
+        self.assertFalse(User.objects.filter(username='ann').exists())
+
+        self.addCleanup(password_hasher.shutdown)
+        with mock.patch.object(task_queue, 'enqueue'):
+            response = self.post()
+        self.assertEqual(response.status_code, 200, response.text)
+        self.assertEqual(response.json()['created'], 2)
@@ -0,0 +1,136 @@
+import io
+import tempfile
+import tracemalloc
+import zipfile
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from fastapi.testclient import TestClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.main import app
+from apps.core.cache import principal_cache
+from apps.core.cv_parser import SkillMatcher, iter_lines, iter_text, parse_cv
+from apps.core.models import Candidate
+from apps.core.services import CandidateService
+from apps.core.task_queue import task_queue
+from apps.core.tasks import parse_cv_async
+
+
+def docx(body: str) -> io.BytesIO:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('word/document.xml', (
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            f'<w:body>{body}</w:body></w:document>'
+        ))
+    buffer.seek(0)
+    return buffer
+
+
+def paragraph(text: str) -> str:
+    return f'<w:p><w:r><w:t>{text}</w:t></w:r></w:p>'
+
+
+class DocxParsingTests(SimpleTestCase):
+    def test_paragraphs_and_tables(self):
+        table = f'<w:tbl><w:tr><w:tc>{paragraph("Python")}</w:tc><w:tc>{paragraph("Go")}</w:tc></w:tr></w:tbl>'
+        lines = list(iter_lines(iter_text(docx(paragraph('Skills:') + table + paragraph('5 years')))))
+        self.assertEqual(lines, ['Skills:', 'Python', 'Go', '5 years'])
+
+    def test_memory_does_not_grow_with_the_document(self):
+        def peak(paragraphs: int) -> int:
+            file = docx(paragraph('Senior engineer, 5 years of Python') * paragraphs)
+            tracemalloc.start()
+            try:
+                parse_cv(file, SkillMatcher(['python']))
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        self.assertLess(peak(20_000), peak(2_000) * 2)
+
+
+def not_a_docx() -> io.BytesIO:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('notes.txt', 'Python')
+    buffer.seek(0)
+    return buffer
+
+
+def truncated_pdf() -> io.BytesIO:
+    return io.BytesIO(b'%PDF-1.4\n1 0 obj\n<< /Type /Catalog /Pages 2 0 R >>\nendobj\n2 0 obj\n<< /Type')
+
+
+class UnreadableFileTests(SimpleTestCase):
+    def test_zip_without_a_document_fails(self):
+        result = parse_cv(not_a_docx(), SkillMatcher(['python']), filename='cv.docx')
+        self.assertEqual(result['status'], 'failed')
+        self.assertIn('word/document.xml', result['error'])
+        self.assertEqual(result['skills'], [])
+
+    def test_truncated_pdf_fails(self):
+        result = parse_cv(truncated_pdf(), SkillMatcher(['python']), filename='cv.pdf')
+        self.assertEqual(result['status'], 'failed')
+        self.assertEqual(result['skills'], [])
+
+    def test_readable_file_is_parsed(self):
+        result = parse_cv(docx(paragraph('Python, 5 years')), SkillMatcher(['python']))
+        self.assertEqual(result['status'], 'parsed')
+        self.assertEqual(result['skills'], ['python'])
+
+
+class ParseTaskTests(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+        self.candidate = CandidateService.create_candidate_with_user(
+            'bob', 'bob@example.com', 'pw12345!', 'Bob', skills=['Go']
+        )
+
+    def test_unreadable_upload_is_recorded_as_failed(self):
+        for name, upload in (('cv.docx', not_a_docx()), ('cv.pdf', truncated_pdf())):
+            with self.subTest(name):
+                upload.name = name
+                CandidateService.update_cv(self.candidate.id, upload)
+                result = parse_cv_async(self.candidate.id)
+
+                self.assertEqual(result['status'], 'failed')
+                candidate = Candidate.objects.get(pk=self.candidate.pk)
+                self.assertEqual(candidate.cv_parsed_data['status'], 'failed')
+                self.assertEqual(candidate.skills, ['Go'])
+
+
+class CVUploadTests(TransactionTestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+        principal_cache.local.clear()
+        self.client = TestClient(app)
+
+    def upload(self, username: str, content: bytes):
+        candidate = CandidateService.create_candidate_with_user(
+            username, f'{username}@example.com', 'pw12345!', username.title()
+        )
+        headers = {'Authorization': f'Bearer {RefreshToken.for_user(candidate.user).access_token}'}
+        response = self.client.post(
+            '/api/agent/users/me/cv', headers=headers, files={'file': ('cv.docx', content, 'application/octet-stream')}
+        )
+        self.assertEqual(response.status_code, 202, response.text)
+        return Candidate.objects.select_related('cv_blob').get(pk=candidate.pk)
+
+    def test_upload_enqueues_parsing_per_candidate(self):
+        content = docx(paragraph('Python, 5 years')).getvalue()
+        with mock.patch.object(task_queue, 'enqueue') as enqueue:
+            ann = self.upload('ann', content)
+            bob = self.upload('bob', content)
+
+        self.assertEqual(ann.cv_blob_id, bob.cv_blob_id)
+        parses = [call for call in enqueue.call_args_list if call.args[0] is parse_cv_async]
+        self.assertEqual(parses, [
+            mock.call(parse_cv_async, ann.id, key=f'cv-parse:{ann.id}:{ann.cv_blob.sha256}'),
+            mock.call(parse_cv_async, bob.id, key=f'cv-parse:{bob.id}:{bob.cv_blob.sha256}'),
+        ])
@@ -0,0 +1,71 @@
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connections
+from django.test import TransactionTestCase, override_settings
+
+from apps.core.db_router import routing_scope
+from apps.core.models import JobPosting
+from apps.core.services import CompanyService, JobService
+
+ROUTERS = override_settings(DATABASE_ROUTERS=['apps.core.db_router.ReplicaRouter'])
+
+
+@contextmanager
+def replica_database(**config):
+    """
+    A second SQLite alias, as DB_REPLICAS would configure. By default it
+    opens the primary's test database, like a replica that has caught up.
+    """
+    settings.DATABASES['replica_0'] = dict(connections['default'].settings_dict, TEST={'MIRROR': 'default'}, **config)
+    try:
+        # The router reads the aliases when it is created
+        with ROUTERS:
+            yield
+    finally:
+        connections['replica_0'].close()
+        del connections['replica_0']
+        del settings.DATABASES['replica_0']
+
+
+class ReplicaRouterTests(TransactionTestCase):
+    def setUp(self):
+        self.company = CompanyService.create_company_with_user('acme', 'acme@example.com', 'pw12345!', 'Acme')
+        JobPosting.objects.create(company=self.company, title='Backend', description='APIs')
+
+    def test_request_reads_go_to_the_replica(self):
+        with replica_database(), routing_scope():
+            jobs = JobService.read_queryset()
+            self.assertEqual(jobs.db, 'replica_0')
+            self.assertEqual([job.title for job in jobs], ['Backend'])
+            # Related rows of a replica-loaded instance come from the same replica
+            self.assertEqual(jobs[0].company._state.db, 'replica_0')
+
+    def test_reads_outside_a_request_stay_on_the_primary(self):
+        with replica_database():
+            self.assertEqual(JobService.read_queryset().db, 'default')
+
+    def test_reads_after_a_write_stay_on_the_primary(self):
+        with replica_database(), routing_scope():
+            self.assertEqual(JobService.read_queryset().db, 'replica_0')
+            JobPosting.objects.create(company=self.company, title='Frontend', description='UIs')
+
+            jobs = JobService.read_queryset()
+            self.assertEqual(jobs.db, 'default')
+            self.assertEqual(sorted(job.title for job in jobs), ['Backend', 'Frontend'])
+
+        with replica_database(), routing_scope():
+            # A new request reads from the replica again
+            self.assertEqual(JobService.read_queryset().db, 'replica_0')
+
+    def test_without_a_replica_reads_use_the_primary(self):
+        with ROUTERS, routing_scope():
+            self.assertEqual(JobService.read_queryset().db, 'default')
+            self.assertEqual(JobService.read_queryset().count(), 1)
+
+    def test_unreachable_replica_falls_back_to_the_primary(self):
+        with replica_database(NAME='/nonexistent/replica.sqlite3'), routing_scope(), \
+                self.assertLogs('apps.core.db_router', 'WARNING'):
+            jobs = JobService.read_queryset()
+            self.assertEqual(jobs.db, 'default')
+            self.assertEqual(jobs.count(), 1)
@@ -0,0 +1,72 @@
+import io
+from unittest import mock
+
+import numpy as np
+from django.test import SimpleTestCase, TestCase
+
+from apps.core.services import CandidateService, CompanyService, JobService, MatchService, SkillService
+from apps.core.services.match_service import _top_k
+from apps.core.task_queue import task_queue
+
+
+def run_now(task, *args, **kwargs):
+    """Stand-in for task_queue.enqueue running the task in the test's transaction."""
+    task(*args)
+    return 'test'
+
+
+class NewCandidateMatchesTests(TestCase):
+    """Candidates get precomputed matches as soon as they are created, whichever way."""
+
+    @classmethod
+    def setUpTestData(cls):
+        company = CompanyService.create_company_with_user('acme', 'acme@example.com', 'pw12345!', 'Acme')
+        with mock.patch.object(task_queue, 'enqueue', side_effect=run_now):
+            cls.job = JobService.create_job(
+                company.id, 'Backend developer', 'APIs', ['python', 'django'], status='active'
+            )
+
+    def stored(self):
+        return {
+            match.candidate.full_name: (match.score, match.matched_skills)
+            for match in MatchService.stored_candidates_for_job(self.job.id)
+        }
+
+    def test_create_candidate_with_user(self):
+        with mock.patch.object(task_queue, 'enqueue', side_effect=run_now):
+            with self.captureOnCommitCallbacks(execute=True):
+                CandidateService.create_candidate_with_user(
+                    'bob', 'bob@example.com', 'pw12345!', 'Bob', skills=['Python'], experience_years=3
+                )
+        self.assertEqual(self.stored(), {'Bob': (50.0, ['python'])})
+
+    def test_bulk_import_schedules_one_refresh(self):
+        csv = (
+            "username,email,password,full_name,skills,experience_years\n"
+            "ann,ann@example.com,pw12345!,Ann,python;django,2\n"
+            "cid,cid@example.com,pw12345!,Cid,django,1\n"
+            "dee,dee@example.com,pw12345!,Dee,go,5\n"
+        )
+        with mock.patch.object(task_queue, 'enqueue', side_effect=run_now) as enqueue:
+            with self.captureOnCommitCallbacks(execute=True):
+                result = CandidateService.bulk_import(io.BytesIO(csv.encode()), fmt='csv', workers=1)
+        self.assertEqual(result['created'], 3)
+        self.assertEqual(enqueue.call_count, 1)
+        self.assertEqual(len(enqueue.call_args.args[1]), 3)
+        self.assertEqual(self.stored(), {'Ann': (100.0, ['django', 'python']), 'Cid': (50.0, ['django'])})
+
+
+class TopKTests(SimpleTestCase):
+    def test_ties_at_the_cut_go_to_the_lowest_ids(self):
+        ids = np.arange(100, 0, -1)
+        scores = np.array([50.0] * 99 + [100.0])
+        self.assertEqual(_top_k(ids, scores, 3), [(1, 100.0), (2, 50.0), (3, 50.0)])
+
+    def test_zero_scores_are_dropped(self):
+        self.assertEqual(_top_k(np.array([1, 2]), np.array([0.0, 20.0]), 5), [(2, 20.0)])
+
+
+class CanonicalNamesTests(SimpleTestCase):
+    def test_non_strings_are_skipped(self):
+        skills = [' Python', 'python', None, 3, {'name': 'go'}, ['rust'], '', '  ', 'Django ']
+        self.assertEqual(SkillService.canonical_names(skills), ['django', 'python'])
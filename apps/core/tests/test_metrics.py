@@ -0,0 +1,79 @@
+import threading
+
+from django.test import SimpleTestCase
+
+from apps.core.metrics import Counter, Histogram, Registry, render
+
+
+class HistogramTests(SimpleTestCase):
+    def setUp(self):
+        self.histogram = Histogram('latency_seconds', 'Latency', ('route',), buckets=(0.1, 1.0), registry=Registry())
+
+    def samples(self):
+        return {(name, labels.get('le')): value for name, labels, value in self.histogram.collect()['samples']}
+
+    def test_bucket_bounds_are_inclusive_and_counts_cumulative(self):
+        for value in (0.05, 0.1, 0.5, 1.0, 3.0):
+            self.histogram.observe(value, '/jobs')
+        self.assertEqual(self.samples(), {
+            ('latency_seconds_bucket', '0.1'): 2,
+            ('latency_seconds_bucket', '1'): 4,
+            ('latency_seconds_bucket', '+Inf'): 5,
+            ('latency_seconds_sum', None): 4.65,
+            ('latency_seconds_count', None): 5,
+        })
+
+    def test_labels_are_kept_apart(self):
+        self.histogram.observe(0.5, '/jobs')
+        self.histogram.observe(0.5, '/users')
+        counts = [value for name, labels, value in self.histogram.collect()['samples'] if name.endswith('_count')]
+        self.assertEqual(counts, [1, 1])
+
+
+class ShardTests(SimpleTestCase):
+    def test_finished_threads_are_folded_into_the_totals(self):
+        counter = Counter('events_total', 'Events', ('kind',), registry=Registry())
+        counter.inc('a')
+
+        def record():
+            for _ in range(10):
+                counter.inc('a')
+            counter.inc('b', amount=2)
+
+        threads = [threading.Thread(target=record) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual((counter.value('a'), counter.value('b')), (31.0, 6.0))
+        # The exited threads' shards were retired, and are still counted
+        self.assertEqual(len(counter._shards), 1)
+        self.assertEqual((counter.value('a'), counter.value('b')), (31.0, 6.0))
+
+        counter.inc('a')
+        self.assertEqual(counter.value('a'), 32.0)
+
+
+class ExpositionTests(SimpleTestCase):
+    def test_label_values_are_escaped(self):
+        counter = Counter('errors_total', 'Errors', ('message',), registry=Registry())
+        counter.inc('bad "quote"\\path\nnext')
+        self.assertEqual(render([counter.collect()]), (
+            '# HELP errors_total Errors\n'
+            '# TYPE errors_total counter\n'
+            'errors_total{message="bad \\"quote\\"\\\\path\\nnext"} 1\n'
+        ))
+
+    def test_families_sharing_a_name_are_merged(self):
+        family = {'name': 'queue_depth', 'help': 'Depth', 'type': 'gauge'}
+        text = render([
+            dict(family, samples=[('queue_depth', {}, 2.5)]),
+            dict(family, samples=[('queue_depth', {'worker': 'w1'}, 3)]),
+        ])
+        self.assertEqual(text, (
+            '# HELP queue_depth Depth\n'
+            '# TYPE queue_depth gauge\n'
+            'queue_depth 2.5\n'
+            'queue_depth{worker="w1"} 3\n'
+        ))
@@ -0,0 +1,58 @@
+import importlib
+import shutil
+import tempfile
+from types import SimpleNamespace
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, override_settings
+
+from apps.core.models import Candidate, User
+
+dedup = importlib.import_module('apps.core.migrations.0010_dedup_cv_files')
+
+
+class Rollback(Exception):
+    pass
+
+
+class DedupCVFilesMigrationTests(TestCase):
+    """Migration 0010 deletes duplicate CV files only once it has committed."""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+
+        for name, content in (('ann', b'same'), ('bob', b'same'), ('cid', b'other')):
+            path = default_storage.save(f'cvs/{name}.txt', ContentFile(content))
+            user = User.objects.create_user(name, f'{name}@example.com', 'pw12345!')
+            Candidate.objects.create(user=user, full_name=name, cv_file=path)
+
+        executor = MigrationExecutor(connection)
+        self.apps = executor.loader.project_state(('core', '0010_dedup_cv_files')).apps
+        self.schema_editor = SimpleNamespace(connection=connection)
+
+    def cv_files(self):
+        return sorted(default_storage.listdir('cvs')[1])
+
+    def test_rolled_back_migration_keeps_files(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(Rollback), transaction.atomic():
+                dedup.dedup_cv_files(self.apps, self.schema_editor)
+                raise Rollback
+        self.assertEqual(callbacks, [])
+        self.assertEqual(self.cv_files(), ['ann.txt', 'bob.txt', 'cid.txt'])
+        self.assertFalse(Candidate.objects.filter(cv_blob__isnull=False).exists())
+
+    def test_duplicates_deleted_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            dedup.dedup_cv_files(self.apps, self.schema_editor)
+            self.assertEqual(self.cv_files(), ['ann.txt', 'bob.txt', 'cid.txt'])
+        self.assertEqual(self.cv_files(), ['ann.txt', 'cid.txt'])
+        self.assertEqual(
+            dict(Candidate.objects.values_list('full_name', 'cv_file')),
+            {'ann': 'cvs/ann.txt', 'bob': 'cvs/ann.txt', 'cid': 'cvs/cid.txt'},
+        )
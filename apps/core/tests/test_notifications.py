@@ -0,0 +1,80 @@
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from apps.core import notifications
+from apps.core.notifications import LocalBuffer, NotificationDispatcher
+from apps.core.task_queue import task_queue
+from apps.core.tasks import flush_notifications
+
+
+@override_settings(
+    REDIS_URL='',
+    NOTIFICATION_TRANSPORT='apps.core.notifications.MemoryTransport',
+    NOTIFICATION_WINDOW=0.2,
+    NOTIFICATION_BATCH_SIZE=200,
+)
+class NotificationBatchingTests(SimpleTestCase):
+    def setUp(self):
+        notifications.get_transport.cache_clear()
+        self.addCleanup(notifications.get_transport.cache_clear)
+        self.dispatcher = NotificationDispatcher()
+
+    @property
+    def transport(self):
+        return notifications.get_transport()
+
+    def test_one_window_is_one_batch(self):
+        with mock.patch.object(task_queue, 'enqueue') as enqueue:
+            for user_id in range(25):
+                self.dispatcher.notify([user_id], f'Update {user_id}')
+            enqueue.assert_called_once_with(flush_notifications, countdown=0.2)
+            self.assertEqual(self.dispatcher.flush(), 25)
+
+            self.assertEqual(len(self.transport.batches), 1)
+            self.assertEqual([n['user_id'] for n in self.transport.batches[0]], list(range(25)))
+
+            # The flush released the claim: the next window schedules its own flush
+            self.dispatcher.notify([1, 2], 'Second window')
+            self.assertEqual(enqueue.call_count, 2)
+            self.assertEqual(self.dispatcher.flush(), 2)
+
+        self.assertEqual(len(self.transport.batches), 2)
+        self.assertEqual(self.transport.batches[1], [
+            {'user_id': 1, 'channel': 'email', 'messages': ['Second window']},
+            {'user_id': 2, 'channel': 'email', 'messages': ['Second window']},
+        ])
+
+    def test_messages_to_one_user_are_coalesced(self):
+        with mock.patch.object(task_queue, 'enqueue'):
+            self.dispatcher.notify([7], 'Interview completed')
+            self.dispatcher.notify([7], 'New job posted')
+            self.dispatcher.notify([7], 'New job posted')
+            self.dispatcher.notify([7], 'Interview completed', channel='sms')
+            self.dispatcher.flush()
+
+        self.assertEqual(self.transport.batches, [[
+            {'user_id': 7, 'channel': 'email', 'messages': ['Interview completed', 'New job posted']},
+            {'user_id': 7, 'channel': 'sms', 'messages': ['Interview completed']},
+        ]])
+
+    def test_scheduled_flush_delivers_after_the_window(self):
+        with mock.patch.object(notifications, 'notification_dispatcher', self.dispatcher):
+            for user_id in range(10):
+                self.dispatcher.notify([user_id], 'Hello')
+            self.assertEqual(self.transport.batches, [])
+
+            deadline = time.monotonic() + 10
+            while not self.transport.batches and time.monotonic() < deadline:
+                time.sleep(0.02)
+        self.assertEqual(len(self.transport.batches), 1)
+        self.assertEqual(len(self.transport.batches[0]), 10)
+
+    def test_lost_flush_claim_lapses(self):
+        buffer = LocalBuffer()
+        self.assertTrue(buffer.claim_flush(window=0.0))
+        self.assertFalse(buffer.claim_flush(window=0.0))
+        later = time.monotonic() + notifications.FLUSH_CLAIM_GRACE + 1
+        with mock.patch.object(notifications.time, 'monotonic', return_value=later):
+            self.assertTrue(buffer.claim_flush(window=0.0))
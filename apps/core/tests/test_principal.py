@@ -0,0 +1,70 @@
+from asgiref.sync import async_to_sync
+from django.test import TestCase
+
+from apps.core.cache import principal_cache
+from apps.core.models import User
+from apps.core.services import CandidateService, CompanyService, UserService
+
+
+class PrincipalCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = CompanyService.create_company_with_user('acme', 'acme@example.com', 'pw12345!', 'Acme')
+        cls.candidate = CandidateService.create_candidate_with_user('bob', 'bob@example.com', 'pw12345!', 'Bob')
+
+    def setUp(self):
+        principal_cache.local.clear()
+
+    def test_cached_without_the_password(self):
+        user = self.company.user
+        UserService.get_principal(user.id)
+        raw = principal_cache.local.get(principal_cache._key(user.id))
+        self.assertNotIn(user.password.encode(), raw)
+        self.assertNotIn(b'password', raw)
+
+    def test_cache_hit_has_what_authentication_needs(self):
+        User.objects.filter(id=self.company.user_id).update(is_staff=True)
+        UserService.get_principal(self.company.user_id)
+        with self.assertNumQueries(0):
+            user = UserService.get_principal(self.company.user_id)
+            self.assertEqual((user.username, user.role, user.is_staff), ('acme', 'company', True))
+            self.assertEqual(user.company_profile.id, self.company.id)
+            self.assertEqual(user.company_profile.user, user)
+            self.assertIsNone(getattr(user, 'candidate_profile', None))
+        self.assertEqual(user.get_deferred_fields(), {
+            field.attname for field in User._meta.concrete_fields
+        } - {'id', 'username', 'email', 'role', 'phone', 'is_staff', 'is_active', 'created_at'})
+
+    def test_invalidated_when_the_change_commits(self):
+        user_id = self.candidate.user_id
+        UserService.get_principal(user_id)
+        with self.captureOnCommitCallbacks() as callbacks:
+            CandidateService.update(self.candidate.id, full_name='Robert')
+            UserService.update(user_id, phone='555')
+        self.assertIsNotNone(principal_cache.get_local(user_id))
+        for callback in callbacks:
+            callback()
+        self.assertIsNone(principal_cache.get_local(user_id))
+        self.assertEqual(UserService.get_principal(user_id).phone, '555')
+
+    def test_inactive_user_is_not_a_principal(self):
+        user_id = self.candidate.user_id
+        self.assertIsNotNone(UserService.get_principal(user_id))
+        with self.captureOnCommitCallbacks(execute=True):
+            UserService.update(user_id, is_active=False)
+        self.assertIsNone(UserService.get_principal(user_id))
+        self.assertIsNone(async_to_sync(UserService.aget_principal)(user_id))
+
+    def test_deactivated_in_the_admin(self):
+        user = self.candidate.user
+        UserService.get_principal(user.id)
+        admin = User.objects.create_superuser('admin', 'admin@example.com', 'pw12345!')
+        self.client.force_login(admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/admin/core/user/{user.id}/change/', {
+                'username': user.username, 'email': user.email, 'role': user.role, 'phone': '',
+                'is_active': '', 'date_joined_0': '2024-01-01', 'date_joined_1': '00:00:00',
+            })
+        self.assertEqual(response.status_code, 302, response.content[:2000])
+        self.assertIsNone(principal_cache.get_local(user.id))
+        self.assertIsNone(UserService.get_principal(user.id))
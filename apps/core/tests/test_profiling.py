@@ -0,0 +1,96 @@
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from fastapi.testclient import TestClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.main import app
+from api.profiling import fingerprint, group_statements
+from apps.core.cache import principal_cache
+from apps.core.models import User
+
+
+def bearer(user: User) -> dict:
+    return {'Authorization': f'Bearer {RefreshToken.for_user(user).access_token}'}
+
+
+class FingerprintTests(SimpleTestCase):
+    def test_in_lists_of_any_length_match(self):
+        self.assertEqual(
+            fingerprint('SELECT "id", "name" FROM "skill" WHERE "id" IN (%s, %s, %s)'),
+            'SELECT ... FROM "skill" WHERE "id" IN (...)',
+        )
+        self.assertEqual(
+            fingerprint('SELECT "id" FROM "skill" WHERE "id" IN (1)'),
+            fingerprint("SELECT \"id\"\nFROM \"skill\" WHERE \"id\" IN (2, 'x', 4.5)"),
+        )
+
+    def test_multi_row_values_match(self):
+        two = fingerprint('INSERT INTO "answer" ("a", "b") VALUES (%s, %s), (%s, %s)')
+        self.assertEqual(two, 'INSERT INTO "answer" ("a", "b") VALUES (?, ?), ...')
+        self.assertEqual(two, fingerprint("INSERT INTO \"answer\" (\"a\", \"b\") VALUES (1, 'x'), (2, 'y'), (3, 'z')"))
+
+    def test_select_list_with_a_subquery_is_kept(self):
+        sql = (
+            'SELECT "job"."id", (SELECT COUNT(*) FROM "interview" WHERE "interview"."job_id" = "job"."id") '
+            'FROM "job" WHERE "job"."id" = %s'
+        )
+        self.assertEqual(fingerprint(sql), sql.replace('%s', '?'))
+        # Different outer tables stay apart
+        self.assertNotEqual(fingerprint(sql), fingerprint(sql.replace('FROM "job" WHERE', 'FROM "company" WHERE')))
+
+    def test_distinct_select_list_is_elided(self):
+        self.assertEqual(
+            fingerprint('SELECT DISTINCT "a"."id", "a"."name" FROM "a" WHERE "a"."n" = 3'),
+            'SELECT DISTINCT ... FROM "a" WHERE "a"."n" = ?',
+        )
+
+
+@override_settings(QUERY_PROFILE_DUPLICATES=3)
+class GroupStatementsTests(SimpleTestCase):
+    def test_repeated_queries_are_flagged(self):
+        statements = [
+            (f'SELECT "id" FROM "question" WHERE "interview_id" = {n}', 0.002, 'views.py:10 detail') for n in range(3)
+        ] + [
+            ('SELECT "id" FROM "interview" WHERE "id" = 1', 0.001, 'views.py:5 detail'),
+            ('SELECT "id" FROM "answer" WHERE "question_id" = 1', 0.001, 'views.py:12 detail'),
+            ('SELECT "id" FROM "answer" WHERE "question_id" = 2', 0.001, 'views.py:14 other'),
+        ]
+        groups = group_statements(statements)
+
+        self.assertEqual([(group['count'], group['n_plus_one']) for group in groups], [(3, True), (2, False), (1, False)])
+        self.assertEqual(groups[0]['fingerprint'], 'SELECT ... FROM "question" WHERE "interview_id" = ?')
+        self.assertEqual(groups[0]['ms'], 6.0)
+        self.assertEqual(groups[0]['callers'], ['views.py:10 detail'])
+        self.assertEqual(sorted(groups[1]['callers']), ['views.py:12 detail', 'views.py:14 other'])
+
+
+class QueryProfilerTests(TransactionTestCase):
+    """The API runs the ORM on other threads, so the data has to be committed."""
+
+    def setUp(self):
+        principal_cache.local.clear()
+        self.client = TestClient(app)
+        self.staff = User.objects.create_user('ops', 'ops@example.com', 'pw12345!', role='company', is_staff=True)
+        self.user = User.objects.create_user('bob', 'bob@example.com', 'pw12345!', role='candidate')
+
+    def profiled(self, headers: dict) -> bool:
+        response = self.client.get('/api/agent/jobs', headers=dict(headers, **{'X-Profile': 'queries'}))
+        self.assertEqual(response.status_code, 200)
+        return 'server-timing' in response.headers
+
+    def test_off_unless_enabled(self):
+        self.assertFalse(self.profiled(bearer(self.staff)))
+
+    @override_settings(QUERY_PROFILER_MODE='header')
+    def test_header_mode_is_staff_only(self):
+        self.assertFalse(self.profiled({}))
+        self.assertFalse(self.profiled({'Authorization': 'Bearer not-a-token'}))
+        self.assertFalse(self.profiled(bearer(self.user)))
+        with self.assertLogs('api.profiling', 'INFO') as logs:
+            self.assertTrue(self.profiled(bearer(self.staff)))
+        self.assertIn('GET /api/agent/jobs', logs.output[0])
+
+    @override_settings(QUERY_BUDGET_COUNT=0)
+    def test_over_budget_requests_are_logged(self):
+        with self.assertLogs('api.profiling', 'WARNING') as logs:
+            self.client.get('/api/agent/jobs/my-jobs', headers=bearer(self.staff))
+        self.assertIn('Request over budget', logs.output[0])
@@ -0,0 +1,111 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from api.rendering import render
+from api.schemas import InterviewDetailResponse, InterviewDetailWithAnswersResponse, InterviewResponse
+from apps.core.models import Answer, Interview, Question
+from apps.core.services import CandidateService, CompanyService, InterviewService, JobService
+from apps.core.task_queue import task_queue
+
+
+class InterviewQueryCountTests(TestCase):
+    """
+    Query counts of the interview listing and detail, including rendering:
+    they must not grow with the number of jobs, questions or answers.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = CompanyService.create_company_with_user('acme', 'acme@example.com', 'pw12345!', 'Acme')
+        cls.candidates = [
+            CandidateService.create_candidate_with_user(
+                name, f'{name}@example.com', 'pw12345!', name.title(), skills=['python']
+            )
+            for name in ('ann', 'bob')
+        ]
+        with mock.patch.object(task_queue, 'enqueue'):
+            cls.add_jobs(5)
+
+    @classmethod
+    def add_jobs(cls, count: int):
+        for index in range(count):
+            job = JobService.create_job(
+                cls.company.id, f'Job {index}', 'Work', ['python'], status='active'
+            )
+            for candidate in cls.candidates:
+                Interview.objects.create(job_posting=job, candidate=candidate)
+
+    def add_questions(self, interview: Interview, count: int):
+        questions = Question.objects.bulk_create(
+            Question(interview=interview, question_text=f'Q{order}', skill_evaluated='python', order=order)
+            for order in range(count)
+        )
+        # Every other question answered, so both cases are rendered
+        Answer.objects.bulk_create(
+            Answer(question=question, answer_text='A', score=5.0) for question in questions[::2]
+        )
+
+    def list_company_interviews(self) -> bytes:
+        queryset = InterviewService.get_interviews_by_company(self.company.id)
+        interviews, _ = InterviewService.paginate(queryset, limit=50)
+        return render(InterviewResponse, interviews, many=True)
+
+    def test_company_listing_is_one_query(self):
+        with self.assertNumQueries(1):
+            self.list_company_interviews()
+
+    def test_company_listing_does_not_grow_with_jobs(self):
+        with mock.patch.object(task_queue, 'enqueue'):
+            self.add_jobs(10)
+        with self.assertNumQueries(1):
+            body = self.list_company_interviews()
+        self.assertEqual(body.count(b'"job_posting_id"'), 30)
+
+    def view_detail(self, interview_id: int, with_answers: bool) -> bytes:
+        interview = InterviewService.get_interview_detail(interview_id, with_answers=with_answers)
+        # The permission checks of GET /interviews/{id}
+        interview.candidate.user_id, interview.job_posting.company.user_id
+        schema = InterviewDetailWithAnswersResponse if with_answers else InterviewDetailResponse
+        return render(schema, interview)
+
+    def test_detail_is_two_queries(self):
+        for count in (5, 50):
+            interview = Interview.objects.create(
+                job_posting=JobService.get_active_jobs().first(), candidate=self.candidates[0]
+            )
+            self.add_questions(interview, count)
+            for with_answers in (False, True):
+                with self.subTest(questions=count, with_answers=with_answers):
+                    with self.assertNumQueries(2):
+                        body = self.view_detail(interview.id, with_answers)
+                    self.assertEqual(body.count(b'"question_text"'), count)
+
+
+class AnswerQueryCountTests(TestCase):
+    """Submitting an answer updates the interview's counters without reading them back."""
+
+    def setUp(self):
+        company = CompanyService.create_company_with_user('acme', 'acme@example.com', 'pw12345!', 'Acme')
+        candidate = CandidateService.create_candidate_with_user('bob', 'bob@example.com', 'pw12345!', 'Bob')
+        with mock.patch.object(task_queue, 'enqueue'):
+            job = JobService.create_job(company.id, 'Backend', 'Work', ['python'], status='active')
+        self.interview = Interview.objects.create(job_posting=job, candidate=candidate)
+        self.questions = InterviewService.upload_questions(self.interview.id, [
+            {'question_text': f'Q{order}?', 'difficulty': 'medium', 'skill_evaluated': 'python', 'order': order}
+            for order in range(3)
+        ])
+
+    def test_single_answer(self):
+        # Savepoint, question with the locked interview, INSERT, UPDATE, release
+        with self.assertNumQueries(5):
+            InterviewService.submit_answer(self.questions[0].id, 'I used python.')
+        interview = Interview.objects.get(pk=self.interview.pk)
+        self.assertEqual((interview.answered_count, interview.scored_count, interview.status), (1, 1, 'pending'))
+
+    def test_batch(self):
+        answers = [{'question_id': question.id, 'answer_text': 'I used python.'} for question in self.questions[:2]]
+        # Savepoint, locked interview, questions with their answers, INSERT, UPDATE, release
+        with self.assertNumQueries(6):
+            InterviewService.submit_answers(self.interview.id, self.interview.candidate_id, answers)
+        self.assertEqual(Interview.objects.get(pk=self.interview.pk).answered_count, 2)
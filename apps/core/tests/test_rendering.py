@@ -0,0 +1,66 @@
+import orjson
+from django.test import TestCase
+from django.utils import timezone
+
+from api.rendering import render
+from api.schemas import (
+    CandidateResponse, CompanyResponse, InterviewDetailWithAnswersResponse, JobResponse, UserResponse,
+)
+from apps.core.models import Answer, Interview, JobPosting, Question
+from apps.core.services import CandidateService, CompanyService
+
+
+class RenderMatchesPydanticTests(TestCase):
+    """render() produces the same JSON as validating and dumping with the schema."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = CompanyService.create_company_with_user(
+            'acme', 'acme@example.com', 'pw12345!', 'Acme', website='https://acme.example.com/jobs?team=api',
+        )
+        cls.candidate = CandidateService.create_candidate_with_user(
+            'bob', 'bob@example.com', 'pw12345!', 'Bob', skills=['python', 'django'],
+            linkedin_url='https://www.linkedin.com/in/bob', cv_parsed_data={'skills': ['python'], 'years': 3},
+        )
+        cls.job = JobPosting.objects.create(
+            company=cls.company, title='Backend', description='APIs', required_skills=['python'], status='active',
+        )
+        cls.interview = Interview.objects.create(
+            job_posting=cls.job, candidate=cls.candidate, status='completed', skill_match_score=66.5,
+            final_score=7.25, started_at=timezone.now(), completed_at=timezone.now(),
+        )
+        for order in range(2):
+            question = Question.objects.create(
+                interview=cls.interview, question_text=f'Q{order}?', skill_evaluated='python', order=order,
+            )
+            if order == 0:
+                Answer.objects.create(question=question, answer_text='A', score=7.25, evaluation_notes='Good')
+
+    def assertRendersLikePydantic(self, schema, row, validated=None):
+        expected = schema.model_validate(row if validated is None else validated).model_dump(mode='json')
+        self.assertEqual(orjson.loads(render(schema, row)), expected)
+        self.assertEqual(orjson.loads(render(schema, [row], many=True)), [expected])
+
+    def test_urls(self):
+        self.assertRendersLikePydantic(CompanyResponse, self.company)
+        self.assertRendersLikePydantic(CandidateResponse, self.candidate)
+
+    def test_url_without_a_path(self):
+        CompanyService.update(self.company.id, website='https://acme.example.com')
+        self.company.refresh_from_db()
+        self.assertRendersLikePydantic(CompanyResponse, self.company)
+
+    def test_datetimes(self):
+        self.assertRendersLikePydantic(UserResponse, self.candidate.user)
+        self.assertRendersLikePydantic(JobResponse, self.job)
+
+    def test_nested_rows(self):
+        interview = Interview.objects.prefetch_related('questions__answer').get(pk=self.interview.pk)
+        # Pydantic reads a list where render() takes the related manager
+        fields = {name: getattr(interview, name) for name in InterviewDetailWithAnswersResponse.model_fields}
+        validated = dict(fields, questions=list(interview.questions.all()))
+        self.assertRendersLikePydantic(InterviewDetailWithAnswersResponse, interview, validated)
+
+    def test_values_rows(self):
+        row = JobPosting.objects.values(*JobResponse.model_fields).get(pk=self.job.pk)
+        self.assertRendersLikePydantic(JobResponse, row)
@@ -0,0 +1,58 @@
+from asgiref.sync import async_to_sync
+from django.test import SimpleTestCase, override_settings
+
+from api.response_cache import ResponseCache
+from apps.core.cache import CacheVersion, LocalCache, TieredCache
+from apps.core.db_router import _routing_state, routing_scope
+
+
+class ResponseCacheReplicaLagTests(SimpleTestCase):
+    """Misses right after a version bump are refilled from the primary."""
+
+    def setUp(self):
+        self.version = CacheVersion('test:version')
+        self.responses = ResponseCache(TieredCache('test', LocalCache()), self.version)
+
+    def lookup_pins(self, *parts) -> bool:
+        with routing_scope():
+            async_to_sync(self.responses.lookup)(*parts)
+            return _routing_state.get().pinned
+
+    def test_miss_after_bump_reads_from_primary(self):
+        self.version.bump()
+        self.assertTrue(self.lookup_pins('detail', 1))
+
+    def test_hit_after_bump_stays_on_replica(self):
+        key, _ = async_to_sync(self.responses.lookup)('detail', 1)
+        async_to_sync(self.responses.store)(key, b'{}')
+        self.assertFalse(self.lookup_pins('detail', 1))
+
+    @override_settings(DB_REPLICA_MAX_LAG_SECONDS=0)
+    def test_miss_once_replicas_caught_up_stays_on_replica(self):
+        self.version.bump()
+        self.assertFalse(self.lookup_pins('detail', 1))
+
+    def test_tokens_without_bump_time_are_not_fresh(self):
+        self.assertFalse(CacheVersion.bumped_within('0123456789abcdef', 5))
+
+
+class ResponseCacheSettingTests(SimpleTestCase):
+    def setUp(self):
+        self.responses = ResponseCache(
+            TieredCache('test', LocalCache()), CacheVersion('test:version'), enabled_setting='JOB_CACHE_ENABLED'
+        )
+
+    def store_and_lookup(self):
+        key, _ = async_to_sync(self.responses.lookup)('detail', 1)
+        entry = async_to_sync(self.responses.store)(key, b'{}')
+        self.assertEqual(entry[0], b'{}')
+        return async_to_sync(self.responses.lookup)('detail', 1)[1]
+
+    @override_settings(JOB_CACHE_ENABLED=False)
+    def test_disabled_cache_always_misses(self):
+        self.assertIsNone(self.store_and_lookup())
+        self.assertEqual(self.responses.cache.local._data, {})
+
+    @override_settings(JOB_CACHE_ENABLED=True)
+    def test_enabled_cache_hits(self):
+        self.assertIsNotNone(self.store_and_lookup())
@@ -0,0 +1,39 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.core.models import JobPosting
+from apps.core.services import CompanyService, JobService
+
+
+class JobSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        company = CompanyService.create_company_with_user('acme', 'acme@example.com', 'pw12345!', 'Acme')
+        # The best matches are closed, more of them than the search looks up per result
+        JobPosting.objects.bulk_create(
+            JobPosting(company=company, title='Python developer', description='python', status='closed')
+            for _ in range(10)
+        )
+        cls.active = [
+            JobPosting.objects.create(company=company, title=title, description='Python services', status='active')
+            for title in ('Backend developer', 'Platform engineer')
+        ]
+
+    def test_only_postings_with_the_status(self):
+        self.assertEqual(JobService.search('python', limit=2), self.active[::-1])
+
+    def test_best_match_first(self):
+        closed = JobService.search('python', limit=3, status='closed')
+        self.assertEqual(len(closed), 3)
+        self.assertEqual([job.id for job in closed], sorted((job.id for job in closed), reverse=True))
+
+    def test_ranks_once_when_every_match_was_looked_up(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(len(JobService.search('services', limit=5)), 2)
+        self.assertEqual(sum('job_postings_fts' in query['sql'] for query in queries), 1)
+
+    def test_ranks_again_when_matches_were_left_out(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(JobService.search('python', limit=2), self.active[::-1])
+        self.assertEqual(sum('job_postings_fts' in query['sql'] for query in queries), 2)
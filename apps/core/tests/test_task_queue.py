@@ -0,0 +1,125 @@
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from apps.core.task_queue import TaskQueue
+
+BASE_DIR = Path(__file__).resolve().parents[3]
+
+# Nothing listens on port 1, so any Redis I/O fails fast instead of hanging
+UNREACHABLE_REDIS = 'redis://127.0.0.1:1/0'
+
+
+def run_with_redis(code: str) -> subprocess.CompletedProcess:
+    """Run `code` in a fresh interpreter whose settings see REDIS_URL set."""
+    env = dict(os.environ, REDIS_URL=UNREACHABLE_REDIS, DJANGO_SETTINGS_MODULE='recruiting_agent.settings.base')
+    script = "import django\ndjango.setup()\n" + textwrap.dedent(code)
+    return subprocess.run(
+        [sys.executable, '-c', script], cwd=BASE_DIR, env=env, capture_output=True, text=True, timeout=120
+    )
+
+
+class BlockingTask:
+    """Stands in for a Celery task; each run waits until `finish` is set."""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.finish = threading.Event()
+        self.runs = []
+
+    def apply(self, args, task_id, throw, headers):
+        self.started.set()
+        self.finish.wait(10)
+        self.runs.append(args)
+
+
+class LocalTaskQueueTests(SimpleTestCase):
+    """Without a broker, tasks run on in-process threads and keys live in LocalKeys."""
+
+    def setUp(self):
+        self.queue = TaskQueue()
+        self.addCleanup(self.queue.shutdown)
+        self.task = BlockingTask()
+        self.addCleanup(self.task.finish.set)
+
+    def wait_idle(self):
+        deadline = time.monotonic() + 10
+        while self.queue.stats()['local_pending'] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.queue.stats()['local_pending'], 0)
+
+    def test_duplicate_is_suppressed_while_the_first_runs(self):
+        self.assertTrue(self.queue.local)
+        self.assertIsNotNone(self.queue.enqueue(self.task, 1, key='refresh:1'))
+        self.assertTrue(self.task.started.wait(10))
+
+        self.assertIsNone(self.queue.enqueue(self.task, 2, key='refresh:1'))
+        # Other keys are independent
+        self.assertIsNotNone(self.queue.enqueue(self.task, 3, key='refresh:2'))
+
+        self.task.finish.set()
+        self.wait_idle()
+        self.assertIsNotNone(self.queue.enqueue(self.task, 4, key='refresh:1'))
+        self.wait_idle()
+        self.assertCountEqual(self.task.runs, [(1,), (3,), (4,)])
+        self.assertEqual(self.queue.stats()['deduplicated'], 1)
+
+    def test_key_is_released_when_the_task_fails(self):
+        class FailingTask:
+            def apply(self, args, task_id, throw, headers):
+                raise RuntimeError('boom')
+
+        self.assertIsNotNone(self.queue.enqueue(FailingTask(), key='parse:1'))
+        self.wait_idle()
+        self.assertEqual(self.queue.stats()['local_failed'], 1)
+        self.assertIsNotNone(self.queue.enqueue(FailingTask(), key='parse:1'))
+
+
+class TaskQueueWithBrokerTests(SimpleTestCase):
+    """Settings are read once per process, so these run in a subprocess with REDIS_URL set."""
+
+    def assertSucceeds(self, code: str):
+        result = run_with_redis(code)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return result.stdout
+
+    def test_tasks_go_to_the_broker(self):
+        self.assertSucceeds("""
+            from apps.core.task_queue import task_queue
+
+            class Task:
+                sent = []
+
+                def apply_async(self, args, task_id, countdown):
+                    self.sent.append((args, countdown))
+
+            assert task_queue.local is False
+            assert task_queue.enqueue(Task(), 1, countdown=2)
+            assert Task.sent == [((1,), 2)], Task.sent
+        """)
+
+    def test_health(self):
+        self.assertSucceeds("""
+            from fastapi.testclient import TestClient
+            from api.main import app
+
+            response = TestClient(app).get('/health')
+            assert response.status_code == 200, response.text
+            assert response.json()['task_queue']['local'] is False
+        """)
+
+    def test_metrics_survive_unreachable_redis(self):
+        self.assertSucceeds("""
+            from fastapi.testclient import TestClient
+            from api.main import app
+
+            response = TestClient(app).get('/metrics')
+            assert response.status_code == 200, response.text
+            assert 'task_queue_local 0' in response.text, response.text
+        """)
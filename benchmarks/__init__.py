@@ -0,0 +1,12 @@
+"""
+Benchmarks for the API's hot paths.
+
+Each module is a script run from the repository root, for example:
+
+    python -m benchmarks.async_views --clients 50
+
+and prints its measurements. Benchmarks run against a scratch database
+(see benchmarks.common.scratch_database), never the configured one, so the
+settings (DB_HOST & co, REDIS_URL) only select the database engine and
+cache backends being measured.
+"""
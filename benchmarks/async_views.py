@@ -0,0 +1,68 @@
+"""
+Async vs threadpool request path.
+
+Serves GET /api/agent/jobs/my-jobs, which authenticates and pages through
+the async ORM, next to a sync twin of it that does the same work on
+AnyIO's worker threads, and loads both with concurrent clients.
+
+    python -m benchmarks.async_views [--jobs 200] [--clients 50] [--requests 40]
+"""
+import argparse
+import asyncio
+
+# Sets Django up, so it comes first
+from benchmarks.common import run_clients, scratch_database, serve, summary
+
+from fastapi import APIRouter, Depends, Header
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.db import DjangoRoute
+from api.dependencies import Pagination
+from api.main import app
+from api.rendering import render_response
+from api.schemas import JobResponse
+from api.token_verifier import token_verifier
+from apps.core.models import JobPosting
+from apps.core.services import CompanyService, JobService, UserService
+
+sync_router = APIRouter(prefix='/bench/sync', route_class=DjangoRoute)
+
+
+@sync_router.get('/my-jobs')
+def my_jobs_sync(authorization: str = Header(), pagination: Pagination = Depends()):
+    """GET /jobs/my-jobs as a sync endpoint, run on the threadpool."""
+    user = UserService.get_principal(token_verifier.get_user_id(authorization.partition(' ')[2]))
+    jobs, _ = JobService.paginate(
+        JobService.get_jobs_by_company(user.company_profile.id), pagination.cursor, pagination.limit
+    )
+    return render_response(JobResponse, jobs, many=True)
+
+
+app.include_router(sync_router)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--jobs', type=int, default=200)
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=40, help='requests per client')
+    args = parser.parse_args()
+
+    with scratch_database():
+        company = CompanyService.create_company_with_user('bench', 'bench@example.com', 'pw12345!', 'Bench')
+        JobPosting.objects.bulk_create(
+            JobPosting(company=company, title=f'Job {n}', description='Work', required_skills=['python'])
+            for n in range(args.jobs)
+        )
+        headers = {'Authorization': f'Bearer {RefreshToken.for_user(company.user).access_token}'}
+
+        with serve(app) as base_url:
+            for label, path in (('async', '/api/agent/jobs/my-jobs'), ('sync', '/bench/sync/my-jobs')):
+                requests = lambda n: [('GET', path, {})] * args.requests
+                asyncio.run(run_clients(base_url, lambda n: requests(n)[:2], 4, headers))  # warm up
+                latencies, wall = asyncio.run(run_clients(base_url, requests, args.clients, headers))
+                print(f"{label:>5} {path}: {summary(latencies, wall)}")
+
+
+if __name__ == '__main__':
+    main()
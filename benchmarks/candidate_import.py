@@ -0,0 +1,82 @@
+"""
+Bulk candidate import throughput.
+
+Imports a generated CSV of candidates with CandidateService.bulk_import,
+and compares it with the per-row path it replaced (one
+create_candidate_with_user call per candidate) and with the pool's raw
+hashing rate. PBKDF2 is deliberately slow, so the hashing rate per worker
+bounds the import: the point of the bulk path is that nothing else does.
+
+    python -m benchmarks.candidate_import [--rows 1000] [--workers N] [--per-row 50]
+"""
+import argparse
+import io
+import os
+import time
+
+# Sets Django up, so it comes first
+from benchmarks.common import scratch_database
+
+from django.conf import settings
+
+from apps.core.hashing import PasswordHasherPool
+from apps.core.services import CandidateService
+
+SKILLS = ['python', 'django', 'react', 'postgresql', 'kubernetes', 'go']
+
+
+def candidates_csv(rows: int, prefix: str) -> io.BytesIO:
+    lines = ['username,email,password,full_name,skills,experience_years']
+    lines += [
+        f'{prefix}{n},{prefix}{n}@example.com,pw{n}-secret,Candidate {n},'
+        f'{SKILLS[n % 6]};{SKILLS[(n + 1) % 6]},{n % 15}'
+        for n in range(rows)
+    ]
+    return io.BytesIO('\n'.join(lines).encode())
+
+
+def rate(count: int, seconds: float, unit: str) -> str:
+    return f"{count} {unit} in {seconds:.1f}s, {count / seconds:,.1f} {unit}/s"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=settings.CANDIDATE_IMPORT_WORKERS,
+                        help='password hashing processes (default: CANDIDATE_IMPORT_WORKERS)')
+    parser.add_argument('--per-row', type=int, default=50, help='candidates created one by one, for comparison')
+    args = parser.parse_args()
+    print(f"{args.workers} hashing worker(s) on {os.cpu_count()} CPU(s)")
+
+    with scratch_database():
+        started = time.perf_counter()
+        for n in range(args.per_row):
+            CandidateService.create_candidate_with_user(
+                f'single{n}', f'single{n}@example.com', f'pw{n}-secret', f'Single {n}',
+                skills=[SKILLS[n % 6]], experience_years=n % 15
+            )
+        per_row = time.perf_counter() - started
+        print(f"create_candidate_with_user: {rate(args.per_row, per_row, 'rows')}")
+
+        pool = PasswordHasherPool(workers=args.workers)
+        try:
+            list(pool.hash_many(['warm-up'] * args.workers, chunk_size=1))
+            started = time.perf_counter()
+            list(pool.hash_many([f'pw{n}-secret' for n in range(args.rows)]))
+            hashing = time.perf_counter() - started
+            print(f"hashing only:               {rate(args.rows, hashing, 'hashes')}")
+        finally:
+            pool.shutdown()
+
+        started = time.perf_counter()
+        result = CandidateService.bulk_import(candidates_csv(args.rows, 'bulk'), fmt='csv', workers=args.workers)
+        bulk = time.perf_counter() - started
+        assert result['created'] == args.rows, result
+        print(f"bulk_import:                {rate(args.rows, bulk, 'rows')} "
+              f"(hashing alone would take {hashing / bulk:.0%} of that)")
+        print(f"100k candidates at this rate: {100_000 / (args.rows / bulk) / 60:.0f} min "
+              f"with {args.workers} worker(s)")
+
+
+if __name__ == '__main__':
+    main()
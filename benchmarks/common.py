@@ -0,0 +1,113 @@
+"""Shared helpers for the benchmarks: scratch database, in-process server, load generation."""
+import asyncio
+import os
+import socket
+import statistics
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'recruiting_agent.settings.base')
+django.setup()
+
+from django.db import connections  # noqa: E402
+from django.test.utils import setup_databases, teardown_databases  # noqa: E402
+
+
+@contextmanager
+def scratch_database() -> Iterator[None]:
+    """
+    Create the test database the way the test runner does (test_<NAME> on
+    PostgreSQL), migrate it, and drop it afterwards. SQLite gets a temporary
+    file rather than the test runner's in-memory database, so that server
+    threads and worker processes all see the same data.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        if connections['default'].vendor == 'sqlite':
+            connections['default'].settings_dict['TEST']['NAME'] = os.path.join(directory, 'bench.sqlite3')
+        old_config = setup_databases(verbosity=0, interactive=False, aliases={'default'})
+        try:
+            yield
+        finally:
+            connections.close_all()
+            teardown_databases(old_config, verbosity=0)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def serve(app) -> Iterator[str]:
+    """Run `app` under uvicorn on a background thread; yields its base URL."""
+    import uvicorn
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host='127.0.0.1', port=port, log_level='error'))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    try:
+        yield f'http://127.0.0.1:{port}'
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+async def run_clients(base_url: str, requests: Callable[[int], Sequence[Tuple[str, str, dict]]],
+                      clients: int, headers: Optional[dict] = None) -> Tuple[List[float], float]:
+    """
+    Run `clients` concurrent clients; client n sends the (method, path,
+    kwargs) requests of `requests(n)` one after the other. Returns every
+    request's latency in seconds and the wall time.
+    """
+    import httpx
+
+    latencies: List[float] = []
+
+    async def client(http, n: int) -> None:
+        for method, path, kwargs in requests(n):
+            started = time.perf_counter()
+            response = await http.request(method, path, **kwargs)
+            latencies.append(time.perf_counter() - started)
+            if response.is_error:
+                response.raise_for_status()
+
+    limits = httpx.Limits(max_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=120) as http:
+        started = time.perf_counter()
+        await asyncio.gather(*(client(http, n) for n in range(clients)))
+        return latencies, time.perf_counter() - started
+
+
+def percentile(samples: Sequence[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+def summary(samples: Sequence[float], wall: Optional[float] = None) -> str:
+    """One-line latency summary of `samples` (seconds), in milliseconds."""
+    line = (
+        f"n={len(samples)} mean={statistics.fmean(samples) * 1000:.1f}ms "
+        f"p50={percentile(samples, 50) * 1000:.1f}ms p99={percentile(samples, 99) * 1000:.1f}ms"
+    )
+    if wall is not None:
+        line += f" rps={len(samples) / wall:.0f}"
+    return line
+
+
+def timed(func: Callable, repeat: int = 1) -> List[float]:
+    """Latencies in seconds of `repeat` calls of `func`."""
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - started)
+    return latencies
@@ -0,0 +1,174 @@
+"""
+CV parsing throughput and memory.
+
+Writes a corpus of synthetic CVs (plain text, DOCX and PDF) to a temporary
+directory, parses each format with apps.core.cv_parser against a skill
+dictionary the size of a real one, and reports CVs/s. Then parses one very
+large file per format: its peak heap should stay small whatever the file
+size, since the parser streams.
+
+    python -m benchmarks.cv_parsing [--cvs 300] [--skills 3000] [--large-mb 50]
+"""
+import argparse
+import itertools
+import os
+import random
+import resource
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from xml.sax.saxutils import escape
+
+# Sets Django up, so it comes first
+from benchmarks.common import timed
+
+from apps.core.cv_parser import SkillMatcher, parse_cv
+
+SECTIONS = [
+    'Senior software engineer with {years} years of experience building web platforms.',
+    'Skills: {skills}.',
+    'Worked on {skill} services and migrated legacy systems to {skill}.',
+    'Master of Science in Computer Science, University of Lima.',
+    'AWS Certified Solutions Architect; certified Scrum master.',
+    'Languages: Spanish (native), English (fluent), Portuguese.',
+    'Led a team of engineers; mentored juniors; owned on-call for {skill}.',
+]
+
+
+def cv_lines(rng: random.Random, skills, count: int):
+    for _ in range(count):
+        yield rng.choice(SECTIONS).format(
+            years=rng.randint(1, 20),
+            skill=rng.choice(skills),
+            skills=', '.join(rng.sample(skills, 8)),
+        )
+
+
+class TextSize:
+    """Passes lines through, counting their text."""
+
+    def __init__(self, lines):
+        self.lines = lines
+        self.bytes = 0
+
+    def __iter__(self):
+        for line in self.lines:
+            self.bytes += len(line) + 1
+            yield line
+
+
+def write_text(path: str, lines) -> None:
+    with open(path, 'w') as file:
+        for line in lines:
+            file.write(line + '\n')
+
+
+def write_docx(path: str, lines) -> None:
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive, \
+            archive.open('word/document.xml', 'w') as document:
+        document.write(b'<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>')
+        for line in lines:
+            document.write(f'<w:p><w:r><w:t>{escape(line)}</w:t></w:r></w:p>'.encode())
+        document.write(b'</w:body></w:document>')
+
+
+def write_pdf(path: str, lines, lines_per_page: int = 60) -> None:
+    """Minimal PDF, one Helvetica text object per page, written as it goes."""
+    offsets = {}
+
+    def write_object(number: int, body: bytes) -> None:
+        offsets[number] = file.tell()
+        file.write(b'%d 0 obj\n%s\nendobj\n' % (number, body))
+
+    with open(path, 'wb') as file:
+        file.write(b'%PDF-1.4\n')
+        write_object(1, b'<< /Type /Catalog /Pages 2 0 R >>')
+        write_object(3, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>')
+        lines = iter(lines)
+        page_ids = []
+        while page := list(itertools.islice(lines, lines_per_page)):
+            text = ' T* '.join('(%s) Tj' % line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+                               for line in page)
+            stream = f'BT /F1 9 Tf 11 TL 40 800 Td {text} ET'.encode('latin-1', 'replace')
+            contents = max(offsets) + 1
+            write_object(contents, b'<< /Length %d >>\nstream\n%s\nendstream' % (len(stream), stream))
+            write_object(contents + 1, (
+                b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] '
+                b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % contents
+            ))
+            page_ids.append(contents + 1)
+        write_object(2, b'<< /Type /Pages /Kids [%s] /Count %d >>' % (
+            b' '.join(b'%d 0 R' % n for n in page_ids), len(page_ids)
+        ))
+        xref = file.tell()
+        file.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(offsets) + 1))
+        file.writelines(b'%010d 00000 n \n' % offsets[number] for number in sorted(offsets))
+        file.write(b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(offsets) + 1, xref))
+
+
+WRITERS = {'txt': write_text, 'docx': write_docx, 'pdf': write_pdf}
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def traced_peak_mb(func) -> float:
+    """Peak Python heap allocated while running func (untimed: tracing is slow)."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def parse_file(path: str, matcher: SkillMatcher) -> dict:
+    with open(path, 'rb') as file:
+        return parse_cv(file, matcher, filename=path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--cvs', type=int, default=300, help='CVs per format')
+    parser.add_argument('--skills', type=int, default=3000, help='skill dictionary size')
+    parser.add_argument('--large-mb', type=int, default=50, help='approximate size of the large CVs')
+    args = parser.parse_args()
+    rng = random.Random(0)
+    skills = ['python', 'django', 'react', 'kubernetes', 'postgresql'] + [f'tool {n}' for n in range(args.skills - 5)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        corpus = {kind: [] for kind in WRITERS}
+        for kind, write in WRITERS.items():
+            for n in range(args.cvs):
+                path = os.path.join(directory, f'cv{n}.{kind}')
+                write(path, cv_lines(rng, skills, rng.randint(30, 120)))
+                corpus[kind].append(path)
+        large_lines = args.large_mb * 1024 * 1024 // 80
+        large = {}
+        for kind, write in WRITERS.items():
+            path = os.path.join(directory, f'large.{kind}')
+            lines = TextSize(cv_lines(rng, skills, large_lines if kind != 'pdf' else large_lines // 4))
+            write(path, lines)
+            large[kind] = path, lines.bytes
+
+        started = time.perf_counter()
+        matcher = SkillMatcher(skills)
+        print(f"skill matcher over {len(skills)} skills built in {(time.perf_counter() - started) * 1000:.0f}ms")
+        print(f"peak RSS before parsing: {peak_rss_mb():.0f}MB")
+
+        for kind, paths in corpus.items():
+            seconds = sum(timed(lambda: [parse_file(path, matcher) for path in paths]))
+            print(f"{kind:>4}: {len(paths) / seconds:,.0f} CVs/s, peak RSS {peak_rss_mb():.0f}MB")
+
+        for kind, (path, text_bytes) in large.items():
+            size = text_bytes / 1024 / 1024
+            seconds = sum(timed(lambda: parse_file(path, matcher)))
+            print(f"{kind:>4} file with {size:.0f}MB of text: {size / seconds:.1f}MB/s, "
+                  f"peak heap {traced_peak_mb(lambda: parse_file(path, matcher)):.1f}MB")
+        print(f"peak RSS after parsing: {peak_rss_mb():.0f}MB")
+
+
+if __name__ == '__main__':
+    main()
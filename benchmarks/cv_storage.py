@@ -0,0 +1,88 @@
+"""
+CV uploads of content that is already stored.
+
+Writes a few distinct CVs (PDF, DOCX and plain text) and has many
+candidates upload them, as POST /users/me/cv does: store the file
+(CandidateService.update_cv), which queues parse_cv_async. The first
+upload of each file is stored and parsed; every later one only bumps the
+blob's upload count and reads the cached parse result. Reports both
+steps' latency for each, the parsing that a cache hit skips, and bytes
+uploaded against bytes written to storage. The rest of the task, storing
+the parsed skills on the candidate, runs on every upload.
+
+    python -m benchmarks.cv_storage [--files 10] [--uploads 200] [--pages 5]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+# Sets Django up, so it comes first
+from benchmarks.common import scratch_database, summary, timed
+from benchmarks.cv_parsing import WRITERS, cv_lines, parse_file
+
+from django.test import override_settings
+
+from apps.core.models import Skill
+from apps.core.services import CandidateService, CVStorageService, SkillService
+from apps.core.task_queue import task_queue
+
+SKILLS = ['python', 'django', 'react', 'kubernetes', 'postgresql'] + [f'tool {n}' for n in range(2995)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--files', type=int, default=10, help='distinct CVs')
+    parser.add_argument('--uploads', type=int, default=200, help='uploads, each by a different candidate')
+    parser.add_argument('--pages', type=int, default=5, help='approximate length of each CV in pages')
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    with tempfile.TemporaryDirectory() as directory, \
+            override_settings(MEDIA_ROOT=os.path.join(directory, 'media')), scratch_database():
+        Skill.objects.bulk_create(Skill(name=name) for name in SKILLS)
+        kinds = list(WRITERS)
+        files = []
+        for n in range(args.files):
+            kind = kinds[n % len(kinds)]
+            path = os.path.join(directory, f'cv{n}.{kind}')
+            WRITERS[kind](path, cv_lines(rng, SKILLS, args.pages * 60))
+            files.append(path)
+        candidates = [
+            CandidateService.create_candidate_with_user(f'cand{n}', f'cand{n}@example.com', 'pw12345!', f'Candidate {n}')
+            for n in range(args.uploads)
+        ]
+
+        SkillService.get_matcher()  # built once per process; not what is measured
+        while task_queue.stats()['local_pending']:  # match refreshes of the new candidates
+            time.sleep(0.01)
+        latencies = {(upload, step): [] for upload in ('first upload', 're-upload') for step in ('store', 'task')}
+        uploaded = 0
+        for n, candidate in enumerate(candidates):
+            path = files[n % len(files)]
+            label = 'first upload' if n < len(files) else 're-upload'
+            with open(path, 'rb') as cv_file:
+                started = time.perf_counter()
+                CandidateService.update_cv(candidate.id, cv_file)
+                stored = time.perf_counter()
+            while task_queue.stats()['local_pending']:
+                time.sleep(0.001)
+            latencies[label, 'store'].append(stored - started)
+            latencies[label, 'task'].append(time.perf_counter() - stored)
+            uploaded += os.path.getsize(path)
+
+        for (label, step), samples in latencies.items():
+            print(f"{label:>12} {step:>5}: {summary(samples)}")
+        matcher = SkillService.get_matcher()
+        parsing = [min(timed(lambda: parse_file(path, matcher), 5)) for path in files]
+        print(f"parsing alone, skipped on a cache hit: {summary(parsing)}")
+        stats = CVStorageService.get_stats()
+        print(f"{stats['uploads']} uploads of {stats['files']} files: {uploaded / 1024:,.0f}KB uploaded, "
+              f"{stats['bytes_stored'] / 1024:,.0f}KB stored, {stats['bytes_saved'] / 1024:,.0f}KB saved")
+        print(f"parse cache: {stats['parse_cache_hits']} hits, {stats['parse_cache_misses']} misses "
+              f"({stats['parse_cache_hit_rate']:.0%})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Database connections under many concurrent clients.
+
+Serves the API in process and has many concurrent clients alternate
+between GET /jobs/my-jobs (async ORM, on the database threads) and
+GET /jobs/search (a sync endpoint, on AnyIO's worker threads), neither of
+which is cached. Reports latency, the database connections opened during
+the run, and how many are still open afterwards: at most
+DB_THREAD_POOL_SIZE + API_SYNC_THREADS, however many requests were served.
+
+    python -m benchmarks.db_connections [--clients 200] [--requests 20]
+    API_SYNC_THREADS=8 python -m benchmarks.db_connections
+"""
+import argparse
+import asyncio
+import logging
+import threading
+
+# Sets Django up, so it comes first
+from benchmarks.common import run_clients, scratch_database, serve, summary
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from api.main import app
+from apps.core.models import JobPosting
+from apps.core.services import CompanyService
+
+
+class ConnectionTracker:
+    """Records every database connection opened, and by which thread."""
+
+    def __init__(self):
+        self.opened = []
+        self.wrappers = {}
+
+    def __call__(self, sender, connection, **kwargs):
+        self.opened.append(threading.get_ident())
+        self.wrappers[id(connection)] = connection
+
+    def still_open(self) -> int:
+        return sum(1 for wrapper in self.wrappers.values() if wrapper.connection is not None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--clients', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=20, help='requests per client')
+    args = parser.parse_args()
+    # Queued requests go over the request budget; those warnings are not the point here
+    logging.getLogger('api.profiling').setLevel(logging.ERROR)
+
+    with scratch_database():
+        company = CompanyService.create_company_with_user('acme', 'acme@example.com', 'pw12345!', 'Acme')
+        JobPosting.objects.bulk_create(
+            JobPosting(company=company, title=f'Python developer {n}', description='python django',
+                       required_skills=['python'], status='active')
+            for n in range(30)
+        )
+        headers = {'Authorization': f'Bearer {RefreshToken.for_user(company.user).access_token}'}
+        paths = ['/api/agent/jobs/my-jobs?limit=10', '/api/agent/jobs/search?q=python']
+        requests = lambda n: [('GET', paths[i % 2], {}) for i in range(n % 2, n % 2 + args.requests)]
+        connections.close_all()
+
+        tracker = ConnectionTracker()
+        connection_created.connect(tracker)
+        try:
+            with serve(app) as base_url:
+                latencies, wall = asyncio.run(run_clients(base_url, requests, args.clients, headers))
+                still_open = tracker.still_open()
+        finally:
+            connection_created.disconnect(tracker)
+
+        print(f"DB_THREAD_POOL_SIZE={settings.DB_THREAD_POOL_SIZE} API_SYNC_THREADS={settings.API_SYNC_THREADS}, "
+              f"{args.clients} clients")
+        print(f"  {summary(latencies, wall)}")
+        print(f"  connections opened: {len(tracker.opened)} by {len(set(tracker.opened))} threads, "
+              f"still open after the run: {still_open}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Interview detail loading.
+
+Builds interviews with 5, 50 and 500 questions (every other one answered)
+and times the company view of GET /interviews/{id}: loading, permission
+check and rendering. InterviewService.get_interview_detail is compared
+with the lazy path it replaced, which fetched the interview by ID and let
+the candidate, company, questions and each question's answer load on
+access.
+
+    python -m benchmarks.interview_detail [--questions 5 50 500] [--repeat 50]
+"""
+import argparse
+
+# Sets Django up, so it comes first
+from benchmarks.common import scratch_database, summary, timed
+
+from django.db import connection, reset_queries
+from django.test.utils import CaptureQueriesContext
+
+from api.rendering import render
+from api.schemas import InterviewDetailWithAnswersResponse
+from apps.core.models import Answer, Interview, JobPosting, Question
+from apps.core.services import CandidateService, CompanyService, InterviewService
+
+
+def lazy_detail(interview_id: int, user_id: int) -> bytes:
+    interview = InterviewService.get_by_id(interview_id)
+    assert interview.candidate is not None and interview.job_posting.company.user_id == user_id
+    return render(InterviewDetailWithAnswersResponse, interview)
+
+
+def joined_detail(interview_id: int, user_id: int) -> bytes:
+    interview = InterviewService.get_interview_detail(interview_id, with_answers=True)
+    assert interview.candidate is not None and interview.job_posting.company.user_id == user_id
+    return render(InterviewDetailWithAnswersResponse, interview)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--questions', type=int, nargs='+', default=[5, 50, 500])
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    with scratch_database():
+        company = CompanyService.create_company_with_user('acme', 'acme@example.com', 'pw12345!', 'Acme')
+        candidate = CandidateService.create_candidate_with_user('bob', 'bob@example.com', 'pw12345!', 'Bob')
+        job = JobPosting.objects.create(company=company, title='Backend', description='APIs', required_skills=['python'])
+
+        for count in args.questions:
+            interview = Interview.objects.create(job_posting=job, candidate=candidate)
+            questions = Question.objects.bulk_create(
+                Question(interview=interview, question_text=f'Question {n}?', skill_evaluated='python', order=n)
+                for n in range(count)
+            )
+            Answer.objects.bulk_create(
+                Answer(question=question, answer_text='An answer.', score=7.5) for question in questions[::2]
+            )
+
+            print(f"{count} questions:")
+            for label, detail in (('lazy', lazy_detail), ('joined', joined_detail)):
+                # The query log is capped, so a full one would count nothing
+                reset_queries()
+                with CaptureQueriesContext(connection) as queries:
+                    body = detail(interview.id, company.user_id)
+                latencies = timed(lambda: detail(interview.id, company.user_id), args.repeat)
+                print(f"  {label:>6}: {len(queries)} queries, {len(body) / 1024:.0f}KB, {summary(latencies)}")
+
+
+if __name__ == '__main__':
+    main()
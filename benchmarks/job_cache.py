@@ -0,0 +1,71 @@
+"""
+Public job responses with and without the response cache.
+
+Serves the API in process and loads GET /jobs (first page) and
+GET /jobs/{id} with concurrent clients three times: with the job cache
+disabled (every request queries and renders), with it enabled (hits are
+written out as cached bytes), and with clients revalidating through
+If-None-Match (hits answered with a bodiless 304).
+
+    python -m benchmarks.job_cache [--jobs 200] [--clients 20] [--requests 50]
+"""
+import argparse
+import asyncio
+import logging
+
+# Sets Django up, so it comes first
+from benchmarks.common import run_clients, scratch_database, serve, summary
+
+import httpx
+from django.test import override_settings
+
+from api.main import app
+from apps.core.cache import job_cache
+from apps.core.metrics import cache_requests
+from apps.core.models import JobPosting
+from apps.core.services import CompanyService
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--jobs', type=int, default=200)
+    parser.add_argument('--clients', type=int, default=20)
+    parser.add_argument('--requests', type=int, default=50, help='requests per client')
+    args = parser.parse_args()
+    # Uncached requests under load go over the request budget; not the point here
+    logging.getLogger('api.profiling').setLevel(logging.ERROR)
+
+    with scratch_database():
+        company = CompanyService.create_company_with_user('acme', 'acme@example.com', 'pw12345!', 'Acme')
+        jobs = JobPosting.objects.bulk_create(
+            JobPosting(company=company, title=f'Backend developer {n}', description='APIs ' * 50,
+                       location='Remote', required_skills=['python', 'django'], status='active')
+            for n in range(args.jobs)
+        )
+        paths = ['/api/agent/jobs?limit=50'] + [f'/api/agent/jobs/{job.id}' for job in jobs[:10]]
+
+        # One process, so the cache is safe without Redis
+        with override_settings(JOB_CACHE_ENABLED=True), serve(app) as base_url:
+            etags = {path: httpx.get(base_url + path).headers['etag'] for path in paths}
+            plain = lambda n: [('GET', paths[i % len(paths)], {}) for i in range(n, n + args.requests)]
+            revalidating = lambda n: [
+                ('GET', path, {'headers': {'If-None-Match': etags[path]}}) for _, path, _ in plain(n)
+            ]
+
+            ttl = job_cache.ttl
+            for label, requests, cache_ttl in (
+                ('uncached', plain, 0.0), ('cached', plain, ttl), ('304', revalidating, ttl)
+            ):
+                # Entries stored under the old TTL would otherwise still hit
+                job_cache.ttl = cache_ttl
+                job_cache.local.clear()
+                asyncio.run(run_clients(base_url, lambda n: requests(n)[:len(paths)], 1))  # warm up
+                hits = cache_requests.value('jobs', 'local_hit')
+                latencies, wall = asyncio.run(run_clients(base_url, requests, args.clients))
+                hits = cache_requests.value('jobs', 'local_hit') - hits
+                print(f"{label:>8}: {summary(latencies, wall)}, {hits / len(latencies):.0%} cache hits")
+            job_cache.ttl = ttl
+
+
+if __name__ == '__main__':
+    main()
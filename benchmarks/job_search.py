@@ -0,0 +1,96 @@
+"""
+Full-text job search at scale.
+
+Loads synthetic job postings (1M by default) through the ORM, so the
+search index is maintained by the same triggers or generated column as in
+production, then times JobService.search on common, rare, multi-word and
+prefix queries against the icontains scan it replaced, plus the cost the
+index adds to a single-row update.
+
+    python -m benchmarks.job_search [--jobs 1000000] [--queries 50]
+"""
+import argparse
+import itertools
+import random
+import time
+
+# Sets Django up, so it comes first
+from benchmarks.common import scratch_database, summary, timed
+
+from django.db.models import Q
+
+from apps.core.models import JobPosting
+from apps.core.services import CompanyService, JobService
+
+SKILLS = ['python', 'django', 'postgres', 'react', 'kubernetes', 'golang', 'rust', 'terraform', 'kotlin', 'swift']
+ROLES = ['backend', 'frontend', 'platform', 'data', 'mobile', 'security', 'site reliability', 'machine learning']
+LEVELS = ['junior', 'senior', 'staff', 'lead', 'principal']
+CITIES = ['lima', 'bogota', 'madrid', 'mexico city', 'santiago', 'remote']
+# Filler vocabulary for descriptions; a Zipf-like draw makes a few words very common
+FILLER = [f'word{n}' for n in range(20000)]
+FILLER_WEIGHTS = list(itertools.accumulate(1 / (n + 1) for n in range(len(FILLER))))
+
+QUERIES = {
+    'common': lambda rng: rng.choice(ROLES).split()[0],
+    'rare': lambda rng: f'word{rng.randint(15000, 19999)}',
+    'two words': lambda rng: f'{rng.choice(LEVELS)} {rng.choice(SKILLS)}',
+    'prefix': lambda rng: rng.choice(SKILLS)[:4],
+}
+
+
+def postings(company, count: int, rng: random.Random):
+    for _ in range(count):
+        skills = rng.sample(SKILLS, 3)
+        yield JobPosting(
+            company=company,
+            title=f'{rng.choice(LEVELS)} {rng.choice(ROLES)} engineer',
+            description=' '.join(rng.choices(FILLER, cum_weights=FILLER_WEIGHTS, k=40)),
+            required_skills=skills,
+            location=rng.choice(CITIES),
+            status='active' if rng.random() < 0.9 else 'closed',
+        )
+
+
+def icontains(text: str, limit: int):
+    return list(JobPosting.objects.filter(
+        Q(title__icontains=text) | Q(description__icontains=text), status='active'
+    )[:limit])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--jobs', type=int, default=1_000_000)
+    parser.add_argument('--queries', type=int, default=50, help='queries per kind')
+    parser.add_argument('--scans', type=int, default=5, help='icontains queries per kind (slow)')
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    with scratch_database():
+        company = CompanyService.create_company_with_user('acme', 'acme@example.com', 'pw12345!', 'Acme')
+        started = time.perf_counter()
+        generator = postings(company, args.jobs, rng)
+        while batch := [job for _, job in zip(range(10000), generator)]:
+            JobPosting.objects.bulk_create(batch)
+        loaded = time.perf_counter() - started
+        print(f"loaded {args.jobs} postings in {loaded:.0f}s ({args.jobs / loaded:,.0f} rows/s, index included)")
+
+        for kind, make_query in QUERIES.items():
+            queries = [make_query(rng) for _ in range(args.queries)]
+            hits = sum(len(JobService.search(text, limit=args.limit)) for text in queries[:10])
+            indexed = [timed(lambda: JobService.search(text, limit=args.limit))[0] for text in queries]
+            scanned = [timed(lambda: icontains(text, args.limit))[0] for text in queries[:args.scans]]
+            print(f"{kind:>9} (e.g. {queries[0]!r}, {hits / 10:.0f} hits/query):")
+            print(f"    index:     {summary(indexed)}")
+            print(f"    icontains: {summary(scanned)}")
+
+        ids = list(JobPosting.objects.values_list('id', flat=True)[:args.queries])
+        updates = [
+            timed(lambda: JobService.update(job_id, title=f'{rng.choice(LEVELS)} rust engineer'))[0]
+            for job_id in ids
+        ]
+        print(f"update with reindex: {summary(updates)}")
+
+
+if __name__ == '__main__':
+    main()
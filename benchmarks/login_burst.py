@@ -0,0 +1,88 @@
+"""
+Login bursts vs everything else.
+
+Measures the latency of GET /api/agent/jobs with no other load, then while
+concurrent clients keep logging in: once through /auth/login, which checks
+passwords on the hasher process pool, and once through a twin endpoint
+that checks them inline on the request thread, as logins used to.
+
+    python -m benchmarks.login_burst [--jobs 50] [--logins 16] [--requests 100]
+"""
+import argparse
+import asyncio
+import itertools
+import logging
+from contextlib import suppress
+
+# Sets Django up, so it comes first
+from benchmarks.common import run_clients, scratch_database, serve, summary
+
+from django.conf import settings
+from fastapi import APIRouter, HTTPException
+
+from api.db import DjangoRoute
+from api.main import app
+from api.schemas import LoginRequest
+from apps.core.models import JobPosting
+from apps.core.services import CompanyService, UserService
+
+inline_router = APIRouter(prefix='/bench/inline', route_class=DjangoRoute)
+
+
+@inline_router.post('/login')
+def login_inline(credentials: LoginRequest):
+    """Password check only, with Django's authenticate on the request thread."""
+    if UserService.authenticate(credentials.username, credentials.password) is None:
+        raise HTTPException(status_code=401)
+    return {}
+
+
+app.include_router(inline_router)
+
+
+async def under_load(base_url: str, jobs, login_path, login_clients: int):
+    """Latencies of the GET /jobs requests, sent while clients log in at `login_path` (if any)."""
+    credentials = {'json': {'username': 'bench', 'password': 'pw12345!'}}
+    burst = None
+    if login_path:
+        logins = lambda n: itertools.repeat(('POST', login_path, credentials))
+        burst = asyncio.ensure_future(run_clients(base_url, logins, login_clients))
+    try:
+        return await run_clients(base_url, jobs, 4)
+    finally:
+        if burst is not None:
+            burst.cancel()
+            with suppress(asyncio.CancelledError):
+                await burst
+            # Let the server finish the logins already sent
+            await asyncio.sleep(2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--jobs', type=int, default=50, help='job postings listed by GET /jobs')
+    parser.add_argument('--logins', type=int, default=16, help='concurrent login clients')
+    parser.add_argument('--requests', type=int, default=100, help='GET /jobs requests per client (4 clients)')
+    args = parser.parse_args()
+    # Every login is over the request budget; those warnings are not the point here
+    logging.getLogger('api.profiling').setLevel(logging.ERROR)
+
+    with scratch_database():
+        company = CompanyService.create_company_with_user('bench', 'bench@example.com', 'pw12345!', 'Bench')
+        JobPosting.objects.bulk_create(
+            JobPosting(company=company, title=f'Job {n}', description='Work', required_skills=['python'],
+                       status='active')
+            for n in range(args.jobs)
+        )
+        jobs = lambda n: [('GET', '/api/agent/jobs', {})] * args.requests
+        print(f"{settings.PASSWORD_HASHER_WORKERS} hasher process(es), {args.logins} login clients")
+
+        with serve(app) as base_url:
+            asyncio.run(under_load(base_url, jobs, None, 0))  # warm up
+            for label, path in (('idle', None), ('pool', '/api/agent/auth/login'), ('inline', '/bench/inline/login')):
+                latencies, wall = asyncio.run(under_load(base_url, jobs, path, args.logins))
+                print(f"{label:>6}: GET /jobs {summary(latencies, wall)}")
+
+
+if __name__ == '__main__':
+    main()
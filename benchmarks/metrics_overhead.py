@@ -0,0 +1,125 @@
+"""
+Cost of recording metrics.
+
+Times Counter.inc and Histogram.observe against the obvious alternative,
+one dict behind a lock, on one thread and then from several threads at
+once, where the locked version has every update contend for the same
+lock. Also times what the execute wrapper adds to each database query,
+and a /metrics scrape of this process's registry.
+
+    python -m benchmarks.metrics_overhead [--ops 200000] [--threads 1 4 16] [--queries 5000]
+"""
+import argparse
+import threading
+import time
+from bisect import bisect_left
+
+# Sets Django up, so it comes first
+from benchmarks.common import scratch_database, timed
+
+from django.db import connection
+
+from apps.core import metrics
+from apps.core.metrics import LATENCY_BUCKETS, Counter, Histogram, Registry
+
+
+class LockedCounter:
+    def __init__(self):
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0.0) + amount
+
+
+class LockedHistogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self.lock:
+            counts = self.values.get(labels)
+            if counts is None:
+                counts = self.values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            counts[bisect_left(self.buckets, value)] += 1
+            counts[-1] += value
+
+
+def sharded_counter():
+    return Counter('bench_total', 'Benchmark counter', ('route',), registry=Registry())
+
+
+def sharded_histogram():
+    return Histogram('bench_seconds', 'Benchmark histogram', ('route',), registry=Registry())
+
+
+def recorded(metric) -> float:
+    """Updates recorded so far, to check that none were lost."""
+    values = metric._totals() if hasattr(metric, '_totals') else metric.values
+    return sum(sum(value[:-1]) if isinstance(value, list) else value for value in values.values())
+
+
+def hammer(metric, threads: int, ops: int) -> float:
+    """Wall time for `threads` threads to record `ops` updates between them."""
+    record = metric.inc if hasattr(metric, 'inc') else (lambda route: metric.observe(0.02, route))
+    per_thread = ops // threads
+    start = threading.Barrier(threads + 1)
+
+    def work():
+        start.wait()
+        for n in range(per_thread):
+            record('/api/agent/jobs' if n % 2 else '/api/agent/jobs/{job_id}')
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    start.wait()
+    started = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    wall = time.perf_counter() - started
+    assert recorded(metric) == per_thread * threads
+    return wall
+
+
+def per_query_us(queries: int) -> float:
+    with connection.cursor() as cursor:
+        return min(timed(lambda: [cursor.execute('SELECT 1') for _ in range(queries)], 5)) / queries * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--ops', type=int, default=200_000)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--queries', type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{'':<30} {'sharded':>10} {'locked':>10}   ns per update")
+    for name, sharded, locked in (
+        ('Counter.inc', sharded_counter, LockedCounter),
+        ('Histogram.observe', sharded_histogram, LockedHistogram),
+    ):
+        for threads in args.threads:
+            sharded_ns = hammer(sharded(), threads, args.ops) / args.ops * 1e9
+            locked_ns = hammer(locked(), threads, args.ops) / args.ops * 1e9
+            print(f"{f'{name}, {threads} thread(s)':<30} {sharded_ns:>10.0f} {locked_ns:>10.0f}")
+
+    with scratch_database():
+        per_query_us(args.queries)  # warm up
+        with_wrapper = per_query_us(args.queries)
+        connection.execute_wrappers.remove(metrics.record_query)
+        try:
+            without_wrapper = per_query_us(args.queries)
+        finally:
+            connection.execute_wrappers.append(metrics.record_query)
+        print(f"SELECT 1: {without_wrapper:.1f}us without the execute wrapper, {with_wrapper:.1f}us with it")
+
+        scrape = min(timed(lambda: metrics.render(metrics.REGISTRY.collect()), 20))
+        print(f"scrape: {scrape * 1000:.2f}ms for {len(metrics.REGISTRY.collect())} families")
+
+
+if __name__ == '__main__':
+    main()
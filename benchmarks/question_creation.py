@@ -0,0 +1,92 @@
+"""
+Interview start and question upload latency: one bulk INSERT per
+interview against the previous one INSERT (and commit) per question.
+
+The per-question variants below are the code start_interview and
+upload_questions ran before questions were batched.
+
+    python -m benchmarks.question_creation [--interviews 50] [--sizes 5,50,200]
+"""
+import argparse
+from datetime import datetime
+
+# Sets Django up, so it comes first
+from benchmarks.common import scratch_database, summary, timed
+
+from apps.core.models import Interview, Question
+from apps.core.services import CandidateService, CompanyService, InterviewService, JobService
+
+
+def start_per_question(interview_id: int) -> None:
+    interview = InterviewService.get_by_id(interview_id)
+    interview.status = 'in_progress'
+    interview.started_at = datetime.now()
+    interview.save()
+    job, candidate = interview.job_posting, interview.candidate
+    for idx, skill in enumerate(job.required_skills[:5], 1):
+        Question.objects.create(
+            interview=interview,
+            question_text=f"Can you describe your experience with {skill}?",
+            difficulty=InterviewService._determine_difficulty(skill, candidate),
+            skill_evaluated=skill,
+            expected_answer_keywords=[skill.lower(), 'experience', 'project'],
+            order=idx,
+        )
+
+
+def upload_per_question(interview_id: int, questions_data) -> None:
+    interview = InterviewService.get_by_id(interview_id)
+    if interview.questions.count() > 0:
+        raise ValueError("Questions already uploaded for this interview")
+    for q_data in questions_data:
+        Question.objects.create(
+            interview=interview,
+            question_text=q_data['question_text'],
+            difficulty=q_data['difficulty'].lower(),
+            skill_evaluated=q_data['skill_evaluated'],
+            order=q_data['order'],
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--interviews', type=int, default=50, help='interviews per measurement')
+    parser.add_argument('--sizes', default='5,50,200', help='uploaded question counts')
+    args = parser.parse_args()
+
+    with scratch_database():
+        company = CompanyService.create_company_with_user('acme', 'acme@example.com', 'pw12345!', 'Acme')
+        job = JobService.create_job(
+            company.id, 'Backend', 'APIs', ['python', 'django', 'sql', 'redis', 'docker'], status='active'
+        )
+        candidate = CandidateService.create_candidate_with_user(
+            'ann', 'ann@example.com', 'pw12345!', 'Ann', skills=['python'], experience_years=4
+        )
+
+        def interviews():
+            return [
+                interview.id for interview in Interview.objects.bulk_create(
+                    Interview(job_posting=job, candidate=candidate) for _ in range(args.interviews)
+                )
+            ]
+
+        print("start_interview (5 generated questions):")
+        per_question = [timed(lambda: start_per_question(i))[0] for i in interviews()]
+        bulk = [timed(lambda: InterviewService.start_interview(i))[0] for i in interviews()]
+        print(f"  per question: {summary(per_question)}")
+        print(f"  bulk:         {summary(bulk)}")
+
+        for size in map(int, args.sizes.split(',')):
+            questions = [
+                {'question_text': f'Q{n}', 'difficulty': 'Medium', 'skill_evaluated': 'python', 'order': n}
+                for n in range(size)
+            ]
+            print(f"upload_questions ({size} questions):")
+            per_question = [timed(lambda: upload_per_question(i, questions))[0] for i in interviews()]
+            bulk = [timed(lambda: InterviewService.upload_questions(i, questions))[0] for i in interviews()]
+            print(f"  per question: {summary(per_question)}")
+            print(f"  bulk:         {summary(bulk)}")
+
+
+if __name__ == '__main__':
+    main()
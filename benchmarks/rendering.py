@@ -0,0 +1,101 @@
+"""
+Response serialization cost per row, per schema.
+
+For every response schema in api.schemas, renders the same rows two ways:
+the Pydantic chain endpoints used to run (model_validate, then
+model_dump_json; FastAPI's second validation of the returned model is not
+counted, so "before" is on the cheap side), and api.rendering.render,
+which reads the ORM rows or dicts straight into orjson.
+
+    python -m benchmarks.rendering [--rows 100] [--repeat 50]
+"""
+import argparse
+
+# Sets Django up, so it comes first
+from benchmarks.common import scratch_database, timed
+
+from api import schemas
+from api.rendering import render
+from apps.core.models import Answer, Interview, JobPosting, Question
+from apps.core.services import CandidateService, CompanyService, InterviewService
+
+
+def pydantic_row(schema, row) -> str:
+    if schema is schemas.InterviewDetailWithAnswersResponse:
+        # As GET /interviews/{id} did: each question validated and dumped,
+        # then the whole interview validated again
+        data = schemas.InterviewResponse.model_validate(row).model_dump()
+        data['questions'] = [
+            schemas.QuestionWithAnswerResponse.model_validate(question).model_dump()
+            for question in row.questions.all()
+        ]
+        row = data
+    return schema.model_validate(row).model_dump_json()
+
+
+def pydantic_chain(schema, rows) -> bytes:
+    return b'[' + b','.join(pydantic_row(schema, row).encode() for row in rows) + b']'
+
+
+def fixtures(count: int) -> dict:
+    """Rows to render for each response schema, `count` of each."""
+    company = CompanyService.create_company_with_user('acme', 'acme@example.com', 'pw12345!', 'Acme')
+    candidates = [
+        CandidateService.create_candidate_with_user(
+            f'cand{n}', f'cand{n}@example.com', 'pw12345!', f'Candidate {n}',
+            skills=['python', 'django', 'react'], experience_years=n % 10, education='MSc'
+        )
+        for n in range(count)
+    ]
+    jobs = JobPosting.objects.bulk_create(
+        JobPosting(company=company, title=f'Backend {n}', description='APIs and services', location='Remote',
+                   salary_range='100k', required_skills=['python', 'django'], experience_required=3)
+        for n in range(count)
+    )
+    interviews = Interview.objects.bulk_create(
+        Interview(job_posting=jobs[n], candidate=candidates[n]) for n in range(count)
+    )
+    questions = Question.objects.bulk_create(
+        Question(interview=interviews[0], question_text=f'Question {n}?', skill_evaluated='python', order=n)
+        for n in range(count)
+    )
+    answers = Answer.objects.bulk_create(
+        Answer(question=question, answer_text='An answer.', score=7.5) for question in questions
+    )
+    detail = InterviewService.get_interview_detail(interviews[0].id, with_answers=True)
+    matches = [
+        {'candidate_id': candidate.id, 'full_name': candidate.full_name, 'experience_years': 3,
+         'skill_match_score': 66.7, 'matched_skills': ['django', 'python'], 'experience_delta': 0}
+        for candidate in candidates
+    ]
+    return {
+        schemas.UserResponse: [candidate.user for candidate in candidates],
+        schemas.CompanyResponse: [company] * count,
+        schemas.CandidateResponse: candidates,
+        schemas.JobResponse: jobs,
+        schemas.CandidateMatchResponse: matches,
+        schemas.InterviewResponse: interviews,
+        schemas.QuestionResponse: list(detail.questions.all()),
+        schemas.AnswerResponse: answers,
+        schemas.QuestionWithAnswerResponse: list(detail.questions.all()),
+        # One interview with `count` questions, rendered `count` times
+        schemas.InterviewDetailWithAnswersResponse: [detail] * count,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    with scratch_database():
+        print(f"{'schema':<36} {'pydantic':>10} {'render':>10}   per row")
+        for schema, rows in fixtures(args.rows).items():
+            before = min(timed(lambda: pydantic_chain(schema, rows), args.repeat)) / len(rows)
+            after = min(timed(lambda: render(schema, rows, many=True), args.repeat)) / len(rows)
+            print(f"{schema.__name__:<36} {before * 1e6:>8.1f}us {after * 1e6:>8.1f}us   {before / after:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Bulk skill matching: the bitset index against the per-pair Python loop.
+
+Ranks every candidate against a set of jobs' required skills, once with
+SkillMatchIndex and once by scoring each (job, candidate) pair with
+InterviewService._calculate_skill_match, the way rankings were computed
+before the index.
+
+    python -m benchmarks.skill_matching [--candidates 100000] [--jobs 20] [--skills 500]
+"""
+import argparse
+import random
+
+# Sets Django up, so it comes first
+from benchmarks.common import scratch_database, summary, timed
+
+from apps.core.models import Candidate, JobPosting, User
+from apps.core.services import InterviewService
+from apps.core.services.match_service import SkillMatchIndex
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--candidates', type=int, default=100000)
+    parser.add_argument('--jobs', type=int, default=20, help='jobs ranked against every candidate')
+    parser.add_argument('--skills', type=int, default=500, help='size of the skill vocabulary')
+    parser.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocabulary = [f'skill-{n}' for n in range(args.skills)]
+
+    with scratch_database():
+        users = User.objects.bulk_create(
+            User(username=f'c{n}', email=f'c{n}@example.com', password='!') for n in range(args.candidates)
+        )
+        Candidate.objects.bulk_create(
+            (Candidate(user=user, full_name=user.username, skills=rng.sample(vocabulary, rng.randint(3, 15)))
+             for user in users),
+            batch_size=5000,
+        )
+        jobs = [
+            JobPosting(title=f'Job {n}', required_skills=rng.sample(vocabulary, rng.randint(2, 8)))
+            for n in range(args.jobs)
+        ]
+        candidates = list(Candidate.objects.only('id', 'skills'))
+
+        index = None
+
+        def build():
+            nonlocal index
+            index = SkillMatchIndex()
+
+        def loop(job):
+            scores = [(c.id, InterviewService._calculate_skill_match(job, c)) for c in candidates]
+            scores.sort(key=lambda pair: (-pair[1], pair[0]))
+            return [pair for pair in scores[:args.limit] if pair[1] > 0]
+
+        print(f"{args.candidates} candidates, {args.skills} skills, top {args.limit} for {args.jobs} jobs")
+        print(f"index build:       {summary(timed(build))}")
+        indexed = [timed(lambda: index.rank_candidates(job.required_skills, args.limit))[0] for job in jobs]
+        looped = [timed(lambda: loop(job))[0] for job in jobs]
+        print(f"index, per job:    {summary(indexed)}")
+        print(f"per-pair, per job: {summary(looped)}")
+        for job in jobs:
+            assert index.rank_candidates(job.required_skills, args.limit) == loop(job), job.title
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Task enqueue latency and duplicate suppression.
+
+Completes interviews with answered questions by scheduling
+calculate_final_score, as POST /interviews/{id}/complete does:
+once with Celery's delay(), which without a broker runs the task inside
+the caller, and once with task_queue.enqueue. Then repeats the "double
+click" case: many enqueues for the same interview at once, from several
+threads, of which only one may get through.
+
+    python -m benchmarks.task_enqueue [--interviews 100] [--clicks 20]
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Completion notifications would otherwise be printed
+os.environ.setdefault('NOTIFICATION_TRANSPORT', 'apps.core.notifications.MemoryTransport')
+
+# Sets Django up, so it comes first
+from benchmarks.common import scratch_database, summary
+
+from django.conf import settings
+
+from apps.core.models import Answer, Interview, JobPosting, Question
+from apps.core.services import CandidateService, CompanyService
+from apps.core.task_queue import task_queue
+from apps.core.tasks import calculate_final_score
+
+
+def answered_interviews(job, candidate, count: int):
+    interviews = Interview.objects.bulk_create(
+        Interview(job_posting=job, candidate=candidate, status='in_progress') for _ in range(count)
+    )
+    questions = Question.objects.bulk_create(
+        Question(interview=interview, question_text=f'Question {n}?', skill_evaluated='python', order=n)
+        for interview in interviews for n in range(10)
+    )
+    Answer.objects.bulk_create(Answer(question=question, answer_text='An answer.', score=7.0) for question in questions)
+    return interviews
+
+
+def drain() -> None:
+    while task_queue.stats()['local_pending']:
+        time.sleep(0.01)
+
+
+def key(interview: Interview) -> str:
+    return f"calculate_final_score:{interview.id}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--interviews', type=int, default=100)
+    parser.add_argument('--clicks', type=int, default=20, help='concurrent enqueues per interview')
+    args = parser.parse_args()
+    print(f"broker: {'none, tasks run in process' if settings.CELERY_TASK_ALWAYS_EAGER else settings.REDIS_URL}")
+
+    with scratch_database():
+        company = CompanyService.create_company_with_user('acme', 'acme@example.com', 'pw12345!', 'Acme')
+        candidate = CandidateService.create_candidate_with_user('bob', 'bob@example.com', 'pw12345!', 'Bob')
+        job = JobPosting.objects.create(company=company, title='Backend', description='APIs', required_skills=['python'])
+
+        latencies = []
+        for interview in answered_interviews(job, candidate, args.interviews):
+            started = time.perf_counter()
+            calculate_final_score.delay(interview.id)
+            latencies.append(time.perf_counter() - started)
+        print(f"delay():             {summary(latencies)}")
+
+        latencies = []
+        for interview in answered_interviews(job, candidate, args.interviews):
+            started = time.perf_counter()
+            task_queue.enqueue(calculate_final_score, interview.id, key=key(interview))
+            latencies.append(time.perf_counter() - started)
+        drain()
+        print(f"task_queue.enqueue: {summary(latencies)}")
+
+        task_ids = []
+        interviews = answered_interviews(job, candidate, args.interviews)
+        with ThreadPoolExecutor(max_workers=8) as clicks:
+            for interview in interviews:
+                task_ids += clicks.map(
+                    lambda _: task_queue.enqueue(calculate_final_score, interview.id, key=key(interview)),
+                    range(args.clicks)
+                )
+        drain()
+        enqueued = sum(1 for task_id in task_ids if task_id)
+        suppressed = len(task_ids) - enqueued
+        completed = Interview.objects.filter(id__in=[i.id for i in interviews], status='completed').count()
+        print(f"{args.clicks} concurrent clicks x {args.interviews} interviews: {enqueued} enqueued, "
+              f"{suppressed} suppressed, {completed} interviews scored")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Access token verification throughput.
+
+Compares simplejwt's AccessToken, which the auth dependency used to build
+per request, with TokenVerifier on first sight of a token (a signature
+check) and on reuse (a claims cache hit).
+
+    python -m benchmarks.token_verification [--tokens 2000] [--rounds 50]
+"""
+import argparse
+import time
+
+# Sets Django up, so it comes first
+from benchmarks.common import timed
+
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.token_verifier import TokenVerifier
+
+
+def rate(count: int, seconds: float) -> str:
+    return f"{count / seconds:>10,.0f} verifications/s"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--tokens', type=int, default=2000, help='distinct tokens')
+    parser.add_argument('--rounds', type=int, default=50, help='times each token is reused')
+    args = parser.parse_args()
+
+    tokens = []
+    for user_id in range(args.tokens):
+        token = AccessToken()
+        token['user_id'] = user_id
+        tokens.append(str(token))
+
+    def simplejwt():
+        for token in tokens:
+            AccessToken(token)['user_id']
+
+    verifier = TokenVerifier(cache_size=args.tokens)
+
+    def verify():
+        for token in tokens:
+            verifier.get_user_id(token)
+
+    print(f"simplejwt AccessToken:   {rate(args.tokens, sum(timed(simplejwt, repeat=3)) / 3)}")
+    print(f"TokenVerifier, new:      {rate(args.tokens, sum(timed(verify)))}")
+    started = time.perf_counter()
+    for _ in range(args.rounds):
+        verify()
+    print(f"TokenVerifier, reused:   {rate(args.tokens * args.rounds, time.perf_counter() - started)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -64,17 +64,49 @@ if os.getenv('DB_HOST'):
             'PASSWORD': os.getenv('DB_PASSWORD', 'postgres'),
             'HOST': os.getenv('DB_HOST'),
             'PORT': os.getenv('DB_PORT', '5432'),
+            # Required behind PgBouncer in transaction pooling mode
+            'DISABLE_SERVER_SIDE_CURSORS': os.getenv('DB_DISABLE_SERVER_SIDE_CURSORS', 'False') == 'True',
+            'OPTIONS': {
+                'connect_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', '10')),
+            },
         }
     }
 else:
     # SQLite for local development (not recommended for production)
     DATABASES = {
         'default': {
-            'ENGINE': 'django.db.backends.sqlite3',
+            # Transactions take the write lock up front (see the backend)
+            'ENGINE': 'apps.core.backends.sqlite3',
             'NAME': BASE_DIR / 'db.sqlite3',
+            'OPTIONS': {
+                'timeout': int(os.getenv('SQLITE_TIMEOUT', '20')),
+            },
         }
     }
 
+# Keep connections open between requests; check them before reuse
+DATABASES['default']['CONN_MAX_AGE'] = int(os.getenv('DB_CONN_MAX_AGE', '60'))
+DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
+# Read replicas: comma-separated host[:port] entries (PostgreSQL) or database
+# files (SQLite, for trying replica routing locally). Each becomes a
+# `replica_<n>` database that opted-in API reads are spread over.
+DB_REPLICAS = [replica.strip() for replica in os.getenv('DB_REPLICAS', '').split(',') if replica.strip()]
+DB_REPLICA_RETRY_SECONDS = float(os.getenv('DB_REPLICA_RETRY_SECONDS', '30'))
+# How far replicas may lag behind the primary: for this long after a cache
+# version bump, reads that refill the cache go to the primary
+DB_REPLICA_MAX_LAG_SECONDS = float(os.getenv('DB_REPLICA_MAX_LAG_SECONDS', '5'))
+for index, replica in enumerate(DB_REPLICAS):
+    replica_config = dict(DATABASES['default'], TEST={'MIRROR': 'default'})
+    if os.getenv('DB_HOST'):
+        host, _, port = replica.partition(':')
+        replica_config.update(HOST=host, PORT=port or replica_config['PORT'])
+    else:
+        replica_config['NAME'] = replica
+    DATABASES[f'replica_{index}'] = replica_config
+if DB_REPLICAS:
+    DATABASE_ROUTERS = ['apps.core.db_router.ReplicaRouter']
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -109,6 +141,9 @@ SIMPLE_JWT = {
     'BLACKLIST_AFTER_ROTATION': True,
 }
 
+# Maximum number of verified access-token claims kept in memory per process
+JWT_CLAIMS_CACHE_SIZE = int(os.getenv('JWT_CLAIMS_CACHE_SIZE', '50000'))
+
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:8000",
     "http://127.0.0.1:8000",
@@ -124,7 +159,99 @@ if REDIS_URL:
     CELERY_TASK_SERIALIZER = 'json'
     CELERY_RESULT_SERIALIZER = 'json'
     CELERY_TIMEZONE = TIME_ZONE
+    CELERY_TASK_ALWAYS_EAGER = False
 else:
     # Run tasks synchronously if Redis is not available
     CELERY_TASK_ALWAYS_EAGER = True
     CELERY_TASK_EAGER_PROPAGATES = True
+
+# Seconds an in-memory skill match index is reused before being rebuilt
+SKILL_MATCH_INDEX_TTL = float(os.getenv('SKILL_MATCH_INDEX_TTL', '60'))
+
+# Principal cache: authenticated user + profile, keyed by user ID.
+# The shared (Redis) tier is only used when REDIS_URL is set as well.
+# Every process also keeps its own copy, and an invalidation only clears the
+# copy of the process that made the change: other processes keep accepting a
+# changed or deactivated user for up to PRINCIPAL_CACHE_TTL seconds. Without
+# Redis this is the only bound, so keep the TTL short for multi-process setups.
+PRINCIPAL_CACHE_TTL = float(os.getenv('PRINCIPAL_CACHE_TTL', '30'))
+PRINCIPAL_CACHE_SIZE = int(os.getenv('PRINCIPAL_CACHE_SIZE', '10000'))
+PRINCIPAL_CACHE_SHARED = os.getenv('PRINCIPAL_CACHE_SHARED', 'False') == 'True'
+
+# Bulk candidate import: rows per INSERT transaction, and password hashing
+# processes of the import_candidates command. Imports through the API hash on
+# the shared password hasher pool instead, at most
+# CANDIDATE_IMPORT_MAX_CONCURRENT at a time per process (more get a 429).
+CANDIDATE_IMPORT_BATCH_SIZE = int(os.getenv('CANDIDATE_IMPORT_BATCH_SIZE', '1000'))
+CANDIDATE_IMPORT_WORKERS = int(os.getenv('CANDIDATE_IMPORT_WORKERS', str(os.cpu_count() or 1)))
+CANDIDATE_IMPORT_MAX_CONCURRENT = int(os.getenv('CANDIDATE_IMPORT_MAX_CONCURRENT', '1'))
+
+# Password hashing for login/register runs on a process pool; requests beyond
+# PASSWORD_HASHER_MAX_PENDING queued or running hashes are rejected with 429
+PASSWORD_HASHER_WORKERS = int(os.getenv('PASSWORD_HASHER_WORKERS', str(max((os.cpu_count() or 2) // 2, 1))))
+PASSWORD_HASHER_MAX_PENDING = int(os.getenv('PASSWORD_HASHER_MAX_PENDING', '64'))
+
+# Rendered responses of the public job endpoints; shared through Redis when REDIS_URL is set.
+# Without Redis the cache version lives in each process, so a job written
+# through one process stays stale in the others for up to JOB_CACHE_TTL: the
+# cache is off then, unless JOB_CACHE_ENABLED turns it on for a single process.
+JOB_CACHE_ENABLED = os.getenv('JOB_CACHE_ENABLED', str(bool(REDIS_URL))) == 'True'
+JOB_CACHE_TTL = float(os.getenv('JOB_CACHE_TTL', '60'))
+JOB_CACHE_SIZE = int(os.getenv('JOB_CACHE_SIZE', '2048'))
+
+# FastAPI database threads: async ORM calls share DB_THREAD_POOL_SIZE long-lived
+# threads, sync endpoints run on up to API_SYNC_THREADS worker threads. Each
+# thread holds at most one connection, so a worker process opens at most
+# DB_THREAD_POOL_SIZE + API_SYNC_THREADS connections.
+DB_THREAD_POOL_SIZE = int(os.getenv('DB_THREAD_POOL_SIZE', '8'))
+API_SYNC_THREADS = int(os.getenv('API_SYNC_THREADS', '40'))
+
+# Notifications: messages to the same user and channel within NOTIFICATION_WINDOW
+# seconds are coalesced and delivered in batches of NOTIFICATION_BATCH_SIZE
+# through NOTIFICATION_TRANSPORT (Console, File or Memory transport in apps.core.notifications)
+NOTIFICATION_TRANSPORT = os.getenv('NOTIFICATION_TRANSPORT', 'apps.core.notifications.ConsoleTransport')
+NOTIFICATION_FILE_PATH = os.getenv('NOTIFICATION_FILE_PATH', str(BASE_DIR / 'notifications.log'))
+NOTIFICATION_WINDOW = float(os.getenv('NOTIFICATION_WINDOW', '2'))
+NOTIFICATION_BATCH_SIZE = int(os.getenv('NOTIFICATION_BATCH_SIZE', '200'))
+
+# Task enqueueing (apps.core.task_queue): idempotency keys expire after
+# TASK_IDEMPOTENCY_TTL seconds at the latest; without a broker, tasks run on
+# TASK_QUEUE_LOCAL_WORKERS threads of the enqueueing process
+TASK_IDEMPOTENCY_TTL = float(os.getenv('TASK_IDEMPOTENCY_TTL', '600'))
+TASK_QUEUE_LOCAL_WORKERS = int(os.getenv('TASK_QUEUE_LOCAL_WORKERS', '4'))
+
+# Metrics (apps.core.metrics): how often each Celery worker process publishes
+# its metrics to Redis for the API's /metrics endpoint, in seconds
+METRICS_PUSH_INTERVAL = float(os.getenv('METRICS_PUSH_INTERVAL', '10'))
+
+# Query profiling (api.profiling), off unless enabled explicitly: 'header'
+# profiles requests from staff users sent with an X-Profile header
+# (`queries` or `cprofile`), 'always' profiles every request
+QUERY_PROFILER_MODE = os.getenv('QUERY_PROFILER_MODE', 'off')
+QUERY_PROFILE_CPROFILE = os.getenv('QUERY_PROFILE_CPROFILE', 'False') == 'True'
+QUERY_PROFILE_DIR = os.getenv('QUERY_PROFILE_DIR', str(BASE_DIR / 'profiles'))
+# Statements repeated this many times in one request are flagged as likely N+1
+QUERY_PROFILE_DUPLICATES = int(os.getenv('QUERY_PROFILE_DUPLICATES', '2'))
+# Requests over any of these budgets are logged, profiled or not
+QUERY_BUDGET_COUNT = int(os.getenv('QUERY_BUDGET_COUNT', '50'))
+QUERY_BUDGET_MS = float(os.getenv('QUERY_BUDGET_MS', '500'))
+REQUEST_BUDGET_MS = float(os.getenv('REQUEST_BUDGET_MS', '2000'))
+
+# Logging: query profiles and over-budget requests (api.profiling) go to the
+# console; everything else keeps Django's defaults
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'api.profiling': {
+            'handlers': ['console'],
+            'level': os.getenv('QUERY_PROFILER_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
+}